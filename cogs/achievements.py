@@ -1,14 +1,32 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 from typing import Dict, List, Set
+from collections import OrderedDict
 import json
 import os
-from datetime import datetime
-import sqlite3
+from datetime import datetime, date, timedelta
 import asyncio
 import os
 from utils.badge_generator import AchievementBadgeGenerator
+from utils.ranking import RankedScores
+from utils.ttl_cache import TTLCache
+
+LEGACY_ACHIEVEMENTS_FILE = 'data/achievements.json'  # migrated into user_achievements once
+
+# XP is accumulated in memory and written in one transaction per flush
+# instead of a commit per message; at most XP_FLUSH_SECONDS of gains are
+# lost if the process is killed outright
+XP_FLUSH_SECONDS = int(os.getenv('XP_FLUSH_SECONDS', '30'))
+XP_FLUSH_THRESHOLD = 100  # users with unsaved XP that trigger an early flush
+XP_CACHE_SIZE = int(os.getenv('XP_CACHE_SIZE', '5000'))  # saved totals kept in memory (LRU)
+
+# Per-guild rankings are built once from the guild's members' rows; XP gains
+# are applied to them in batches, at each flush and before ranks are shown.
+# The rendered top-N embed is reused for a short while
+LEADERBOARD_SIZE = 10
+LEADERBOARD_CACHE_SECONDS = 30
+RANKING_LOAD_CHUNK = 500  # member ids per query, below SQLite's variable limit
 
 class Achievement:
     def __init__(self, id: str, name: str, description: str, emoji: str, points: int, role_name: str = None, secret: bool = False, required_count: int = None):
@@ -21,12 +39,55 @@ class Achievement:
         self.secret = secret
         self.required_count = required_count  # Number required to complete achievement
 
+class StudyStreak:
+    """Consecutive study days and current-weekend activity for one user"""
+
+    __slots__ = ('current', 'longest', 'last_day', 'weekend_of', 'weekend_days')
+
+    def __init__(self, current: int = 0, longest: int = 0, last_day: date = None, weekend_of: date = None, weekend_days: int = 0):
+        self.current = current
+        self.longest = longest
+        self.last_day = last_day
+        self.weekend_of = weekend_of  # Saturday of the weekend `weekend_days` refers to
+        self.weekend_days = weekend_days  # bit 0 = Saturday, bit 1 = Sunday
+
+    @property
+    def full_weekend(self) -> bool:
+        return self.weekend_days == 0b11
+
+    def record(self, day: date) -> bool:
+        """Count activity on a day; returns False if that day was already counted"""
+        if self.last_day and day <= self.last_day:
+            return False
+
+        self.current = self.current + 1 if self.last_day == day - timedelta(days=1) else 1
+        self.longest = max(self.longest, self.current)
+        self.last_day = day
+
+        if day.weekday() >= 5:
+            saturday = day - timedelta(days=day.weekday() - 5)
+            if self.weekend_of != saturday:
+                self.weekend_of, self.weekend_days = saturday, 0
+            self.weekend_days |= 1 << (day.weekday() - 5)
+        return True
+
 class Achievements(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('discord_bot')
         self.xp_cooldown = {}
-        self.setup_database()
+        # user_id -> current XP in least recently used order; authoritative for
+        # users with unsaved or unranked XP, which are never evicted
+        self.xp_totals: "OrderedDict[str, int]" = OrderedDict()
+        self.pending_xp: Set[str] = set()  # users whose XP has not been written yet
+        self.unranked_xp: Set[str] = set()  # users whose XP has not reached the rankings yet
+        # Streaks are read and written once per user per day, and not kept in
+        # memory; only who has already been counted today is remembered
+        self.streak_day: date = None
+        self.streak_counted: Set[str] = set()
+        self.guild_rankings: Dict[int, RankedScores] = {}  # guild_id -> members ranked by XP
+        self.leaderboard_embeds = TTLCache(max_entries=256, default_ttl=LEADERBOARD_CACHE_SECONDS)
+        self.db = bot.user_db  # shared async access to data/user_data.db
         # Ensure static directories exist
         os.makedirs('static/css', exist_ok=True)
         os.makedirs('static/badges', exist_ok=True)
@@ -249,31 +310,119 @@ class Achievements(commands.Cog):
                 required_count=3
             )
         }
-        self.user_achievements = {}
-        self.load_achievements()
         self.badge_generator = AchievementBadgeGenerator()
         self.setup_badges()
         self.logger.info("Achievements system initialized")
 
-    def setup_database(self):
+    async def cog_load(self):
+        """Create the tables, import legacy achievements and start the periodic XP flush"""
+        await self.setup_database()
+        await self.migrate_achievements_file()
+        self.flush_xp_loop.start()
+
+    async def cog_unload(self):
+        """Write any unsaved XP before the cog goes away"""
+        self.flush_xp_loop.cancel()
+        await self.flush_xp()
+
+    @tasks.loop(seconds=XP_FLUSH_SECONDS)
+    async def flush_xp_loop(self):
+        """Periodically write accumulated XP"""
+        await self.flush_xp()
+
+    async def get_xp(self, user_id: str) -> int:
+        """Current XP for a user, read from the database only on first use"""
+        if user_id not in self.xp_totals:
+            result = await self.db.fetchone('SELECT xp FROM user_xp WHERE user_id = ?', (user_id,))
+            self.xp_totals.setdefault(user_id, result[0] if result else 0)
+        self.xp_totals.move_to_end(user_id)
+        return self.xp_totals[user_id]
+
+    async def flush_xp(self) -> int:
+        """Write all unsaved XP in one transaction and return how many users were written"""
+        if not self.pending_xp:
+            return 0
+
+        user_ids, self.pending_xp = self.pending_xp, set()
+        rows = [(user_id, self.xp_totals[user_id], self.calculate_level(self.xp_totals[user_id]))
+                for user_id in user_ids]
+        try:
+            await self.db.executemany('''
+                INSERT OR REPLACE INTO user_xp (user_id, xp, level, last_xp_gain)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ''', rows)
+        except Exception as e:
+            self.pending_xp |= user_ids  # retried on the next flush
+            self.logger.error(f"Error flushing XP: {str(e)}")
+            return 0
+        finally:
+            # Rankings and the XP cache are maintained at the flush interval too
+            self.update_rankings()
+            self.trim_xp_totals()
+
+        return len(rows)
+
+    def trim_xp_totals(self):
+        """Evict the least recently used saved totals beyond XP_CACHE_SIZE"""
+        excess = len(self.xp_totals) - XP_CACHE_SIZE
+        for user_id in list(self.xp_totals):
+            if excess <= 0:
+                break
+            if user_id not in self.pending_xp and user_id not in self.unranked_xp:
+                del self.xp_totals[user_id]
+                excess -= 1
+
+    async def get_guild_ranking(self, guild: discord.Guild) -> RankedScores:
+        """XP ranking of a guild's members, loaded from the database on first use
+
+        Only the guild's own members are read, by primary key in chunks, and
+        XP not yet flushed is taken from memory; afterwards gains are applied
+        in batches by update_rankings.
+        """
+        self.update_rankings()
+        ranking = self.guild_rankings.get(guild.id)
+        if ranking is None:
+            member_ids = [str(member.id) for member in guild.members if not member.bot]
+            scores = {}
+            for start in range(0, len(member_ids), RANKING_LOAD_CHUNK):
+                chunk = member_ids[start:start + RANKING_LOAD_CHUNK]
+                rows = await self.db.fetchall(
+                    f"SELECT user_id, xp FROM user_xp WHERE xp > 0 AND user_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                scores.update(rows)
+            for user_id in member_ids:  # may be newer than the database
+                if self.xp_totals.get(user_id):
+                    scores[user_id] = self.xp_totals[user_id]
+            ranking = self.guild_rankings.setdefault(guild.id, RankedScores(scores))
+        return ranking
+
+    def update_rankings(self):
+        """Apply XP gained since the last update to every guild ranking built so far"""
+        if not self.unranked_xp:
+            return
+        user_ids, self.unranked_xp = self.unranked_xp, set()
+        for guild_id, ranking in self.guild_rankings.items():
+            guild = self.bot.get_guild(guild_id)
+            if not guild:
+                continue
+            for user_id in user_ids:
+                if guild.get_member(int(user_id)):
+                    ranking.update(user_id, self.xp_totals[user_id])
+
+    async def setup_database(self):
         """Initialize SQLite database for XP and achievement progress"""
         try:
-            os.makedirs('data', exist_ok=True)
-            self.db = sqlite3.connect('data/user_data.db')
-            cursor = self.db.cursor()
-
-            # Create XP table
-            cursor.execute('''
+            await self.db.executescript('''
+                -- Create XP table
                 CREATE TABLE IF NOT EXISTS user_xp (
                     user_id TEXT PRIMARY KEY,
                     xp INTEGER DEFAULT 0,
                     level INTEGER DEFAULT 1,
                     last_xp_gain TIMESTAMP
-                )
-            ''')
+                );
 
-            # Create achievement progress table
-            cursor.execute('''
+                -- Create achievement progress table
                 CREATE TABLE IF NOT EXISTS achievement_progress (
                     user_id TEXT,
                     achievement_id TEXT,
@@ -281,22 +430,97 @@ class Achievements(commands.Cog):
                     completed BOOLEAN DEFAULT 0,
                     completion_date TIMESTAMP,
                     PRIMARY KEY (user_id, achievement_id)
-                )
+                );
+
+                -- Create study streak table
+                CREATE TABLE IF NOT EXISTS study_streaks (
+                    user_id TEXT PRIMARY KEY,
+                    current_streak INTEGER DEFAULT 0,
+                    longest_streak INTEGER DEFAULT 0,
+                    last_active DATE,
+                    weekend_of DATE,
+                    weekend_days INTEGER DEFAULT 0
+                );
+
+                -- Create unlocked achievements table
+                CREATE TABLE IF NOT EXISTS user_achievements (
+                    user_id TEXT,
+                    achievement_id TEXT,
+                    awarded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, achievement_id)
+                );
             ''')
 
-            self.db.commit()
             self.logger.info("Database initialized successfully")
         except Exception as e:
             self.logger.error(f"Error setting up database: {str(e)}")
 
+    async def migrate_achievements_file(self):
+        """One-time import of unlocked achievements from the old JSON file"""
+        if not os.path.exists(LEGACY_ACHIEVEMENTS_FILE):
+            return
+        try:
+            with open(LEGACY_ACHIEVEMENTS_FILE, 'r') as f:
+                legacy = json.load(f)
+
+            rows = [(user_id, achievement_id)
+                    for user_id, achievement_ids in legacy.items()
+                    for achievement_id in achievement_ids]
+            await self.db.executemany(
+                'INSERT OR IGNORE INTO user_achievements (user_id, achievement_id) VALUES (?, ?)',
+                rows
+            )
+            # Keep the file for reference, but never import it again
+            os.replace(LEGACY_ACHIEVEMENTS_FILE, f"{LEGACY_ACHIEVEMENTS_FILE}.migrated")
+            self.logger.info(f"Migrated {len(rows)} achievements for {len(legacy)} users from {LEGACY_ACHIEVEMENTS_FILE}")
+        except Exception as e:
+            self.logger.error(f"Error migrating achievements file: {str(e)}")
+
+    async def get_user_achievements(self, user_id: str) -> Set[str]:
+        """IDs of the achievements a user has unlocked"""
+        rows = await self.db.fetchall(
+            'SELECT achievement_id FROM user_achievements WHERE user_id = ?', (user_id,)
+        )
+        return {row[0] for row in rows}
+
+    async def get_streak(self, user_id: str) -> StudyStreak:
+        """Load a user's study streak from the database"""
+        row = await self.db.fetchone('''
+            SELECT current_streak, longest_streak, last_active, weekend_of, weekend_days
+            FROM study_streaks WHERE user_id = ?
+        ''', (user_id,))
+        if not row:
+            return StudyStreak()
+        current, longest, last_active, weekend_of, weekend_days = row
+        return StudyStreak(
+            current,
+            longest,
+            date.fromisoformat(last_active) if last_active else None,
+            date.fromisoformat(weekend_of) if weekend_of else None,
+            weekend_days
+        )
+
+    async def save_streak(self, user_id: str, streak: StudyStreak):
+        """Persist one user's streak record"""
+        await self.db.execute('''
+            INSERT OR REPLACE INTO study_streaks
+            (user_id, current_streak, longest_streak, last_active, weekend_of, weekend_days)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            user_id,
+            streak.current,
+            streak.longest,
+            streak.last_day.isoformat() if streak.last_day else None,
+            streak.weekend_of.isoformat() if streak.weekend_of else None,
+            streak.weekend_days
+        ))
+
     async def get_achievement_progress(self, user_id: str, achievement_id: str) -> tuple:
         """Get current progress for an achievement"""
-        cursor = self.db.cursor()
-        cursor.execute(
+        result = await self.db.fetchone(
             'SELECT current_count, completed FROM achievement_progress WHERE user_id = ? AND achievement_id = ?',
             (user_id, achievement_id)
         )
-        result = cursor.fetchone()
         if result:
             return result[0], bool(result[1])
         return 0, False
@@ -309,13 +533,11 @@ class Achievements(commands.Cog):
 
             if not completed:
                 new_count = current_count + count
-                cursor = self.db.cursor()
-                cursor.execute('''
+                await self.db.execute('''
                     INSERT OR REPLACE INTO achievement_progress 
                     (user_id, achievement_id, current_count, completed, completion_date)
                     VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
                 ''', (user_id, achievement_id, new_count, new_count >= achievement.required_count))
-                self.db.commit()
 
                 # Check if achievement is now completed
                 if new_count >= achievement.required_count and not completed:
@@ -366,8 +588,9 @@ class Achievements(commands.Cog):
                 "🌟 Community": []
             }
 
+            unlocked = await self.get_user_achievements(user_id)
             for achievement_id, achievement in self.achievements.items():
-                if achievement.secret and achievement_id not in self.user_achievements.get(user_id, []):
+                if achievement.secret and achievement_id not in unlocked:
                     continue
 
                 current_count, completed = await self.get_achievement_progress(user_id, achievement_id)
@@ -430,13 +653,14 @@ class Achievements(commands.Cog):
     async def award_achievement(self, user_id: str, achievement_id: str, guild: discord.Guild = None):
         """Award an achievement to a user in a specific guild"""
         try:
-            if user_id not in self.user_achievements:
-                self.user_achievements[user_id] = []
+            achievement = self.achievements[achievement_id]
+            # The primary key makes this a no-op if the user already has it
+            awarded = await self.db.execute(
+                'INSERT OR IGNORE INTO user_achievements (user_id, achievement_id) VALUES (?, ?)',
+                (user_id, achievement_id)
+            )
 
-            if achievement_id not in self.user_achievements[user_id]:
-                achievement = self.achievements[achievement_id]
-                self.user_achievements[user_id].append(achievement_id)
-                self.save_achievements()
+            if awarded:
 
                 # Create congratulatory message with sparkle effects
                 embed = discord.Embed(
@@ -488,26 +712,6 @@ class Achievements(commands.Cog):
             self.logger.error(f"Error awarding achievement role: {str(e)}")
 
 
-    def load_achievements(self):
-        """Load saved user achievements from file"""
-        try:
-            if os.path.exists('data/achievements.json'):
-                with open('data/achievements.json', 'r') as f:
-                    self.user_achievements = json.load(f)
-            self.logger.info("Successfully loaded user achievements")
-        except Exception as e:
-            self.logger.error(f"Error loading achievements: {str(e)}")
-
-    def save_achievements(self):
-        """Save user achievements to file"""
-        try:
-            os.makedirs('data', exist_ok=True)
-            with open('data/achievements.json', 'w') as f:
-                json.dump(self.user_achievements, f)
-            self.logger.info("Successfully saved user achievements")
-        except Exception as e:
-            self.logger.error(f"Error saving achievements: {str(e)}")
-
     async def setup_achievement_roles(self, guild: discord.Guild):
         """Create achievement roles if they don't exist"""
         try:
@@ -627,32 +831,19 @@ class Achievements(commands.Cog):
                     return
 
             self.xp_cooldown[user_id] = current_time
-            cursor = self.db.cursor()
-
-            # Get current XP and level
-            cursor.execute('SELECT xp, level FROM user_xp WHERE user_id = ?', (user_id,))
-            result = cursor.fetchone()
 
-            if result:
-                current_xp, current_level = result
-                new_xp = current_xp + xp_amount
-            else:
-                current_xp, current_level = 0, 1
-                new_xp = xp_amount
-                cursor.execute('INSERT INTO user_xp (user_id, xp, level) VALUES (?, ?, ?)',
-                             (user_id, new_xp, current_level))
+            # Levels are compared in memory; the database catches up on the next flush
+            current_xp = await self.get_xp(user_id)
+            new_xp = current_xp + xp_amount
+            self.xp_totals[user_id] = new_xp
+            self.pending_xp.add(user_id)
+            self.unranked_xp.add(user_id)
+            if len(self.pending_xp) >= XP_FLUSH_THRESHOLD:
+                await self.flush_xp()
 
+            current_level = self.calculate_level(current_xp)
             new_level = self.calculate_level(new_xp)
 
-            # Update database
-            cursor.execute('''
-                UPDATE user_xp 
-                SET xp = ?, level = ?, last_xp_gain = CURRENT_TIMESTAMP 
-                WHERE user_id = ?
-            ''', (new_xp, new_level, user_id))
-
-            self.db.commit()
-
             # Handle level up
             if new_level > current_level:
                 for guild in self.bot.guilds:
@@ -679,6 +870,29 @@ class Achievements(commands.Cog):
         """Create achievement roles when bot joins a new guild"""
         await self.setup_achievement_roles(guild)
 
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        """Drop the ranking of a guild the bot has left"""
+        self.guild_rankings.pop(guild.id, None)
+        self.leaderboard_embeds.pop(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        """Rank a returning member who already has XP"""
+        ranking = self.guild_rankings.get(member.guild.id)
+        if ranking is not None and not member.bot:
+            xp = await self.get_xp(str(member.id))
+            if xp:
+                ranking.update(str(member.id), xp)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        """Take a departed member out of the guild ranking"""
+        ranking = self.guild_rankings.get(member.guild.id)
+        if ranking is not None:
+            ranking.remove(str(member.id))
+            self.leaderboard_embeds.pop(member.guild.id)
+
     @commands.Cog.listener()
     async def on_message(self, message):
         """Listen for messages to track achievements and XP"""
@@ -732,33 +946,26 @@ class Achievements(commands.Cog):
                 elif current_hour >= 0 and current_hour < 6:
                     await self.update_achievement_progress(user_id, "night_owl", message.guild)
 
-            # Track study streaks
-            current_date = datetime.now().date()
-            if not hasattr(self, 'study_dates'):
-                self.study_dates = {}
-            if user_id not in self.study_dates:
-                self.study_dates[user_id] = set()
-
-            self.study_dates[user_id].add(current_date)
-
-            # Check for daily scholar
-            dates = sorted(self.study_dates[user_id])
-            if len(dates) >= 7:
-                consecutive_days = 1
-                for i in range(1, len(dates)):
-                    if (dates[i] - dates[i-1]).days == 1:
-                        consecutive_days += 1
-                        if consecutive_days >= 7:
-                            await self.update_achievement_progress(user_id, "daily_scholar", message.guild)
-                            break
-                    else:
-                        consecutive_days = 1
-
-            # Check for weekend warrior
-            if current_date.weekday() >= 5:  # Saturday or Sunday
-                weekend_dates = {d for d in self.study_dates[user_id] if d.weekday() >= 5}
-                if len(weekend_dates) >= 2:
-                    await self.update_achievement_progress(user_id, "weekend_warrior", message.guild)
+            # Track study streaks; only the first message of a day changes anything
+            today = datetime.now().date()
+            if today != self.streak_day:
+                self.streak_day, self.streak_counted = today, set()
+            if user_id in self.streak_counted:
+                return
+            self.streak_counted.add(user_id)
+
+            streak = await self.get_streak(user_id)
+            previous_longest = streak.longest
+            if streak.record(today):
+                await self.save_streak(user_id, streak)
+
+                # Daily scholar progress follows the user's best streak
+                if streak.longest > previous_longest:
+                    await self.update_achievement_progress(user_id, "daily_scholar", message.guild)
+
+                # Weekend warrior needs both days of the same weekend
+                if today.weekday() >= 5 and streak.full_weekend:
+                    await self.update_achievement_progress(user_id, "weekend_warrior", message.guild, count=2)
 
         except Exception as e:
             self.logger.error(f"Error in achievement/XP listener: {str(e)}")
@@ -768,12 +975,10 @@ class Achievements(commands.Cog):
         """Show user's current level and XP progress"""
         try:
             target = member or ctx.author
-            cursor = self.db.cursor()
-            cursor.execute('SELECT xp, level FROM user_xp WHERE user_id = ?', (str(target.id),))
-            result = cursor.fetchone()
+            xp = await self.get_xp(str(target.id))  # includes XP not yet written
 
-            if result:
-                xp, level = result
+            if xp:
+                level = self.calculate_level(xp)
                 next_level_xp = self.calculate_xp_for_level(level + 1)
                 current_level_xp = self.calculate_xp_for_level(level)
                 progress = ((xp - current_level_xp) / (next_level_xp - current_level_xp)) * 10
@@ -793,6 +998,15 @@ class Achievements(commands.Cog):
                     value=f"```{xp}/{next_level_xp} XP\n{progress_bar}```",
                     inline=False
                 )
+                if ctx.guild:
+                    ranking = await self.get_guild_ranking(ctx.guild)
+                    rank = ranking.rank(str(target.id))
+                    if rank:
+                        embed.add_field(
+                            name="Server Rank",
+                            value=f"```#{rank} of {len(ranking)}```",
+                            inline=False
+                        )
                 await ctx.send(embed=embed)
             else:
                 await ctx.send(f"{target.mention} hasn't earned any XP yet!")
@@ -802,32 +1016,34 @@ class Achievements(commands.Cog):
             await ctx.send("❌ An error occurred while fetching level information.")
 
     @commands.command(name='leaderboard')
+    @commands.guild_only()
     async def show_leaderboard(self, ctx):
-        """Show XP leaderboard"""
+        """Show this server's XP leaderboard and your rank"""
         try:
-            cursor = self.db.cursor()
-            cursor.execute('''
-                SELECT user_id, xp, level 
-                FROM user_xp 
-                ORDER BY xp DESC 
-                LIMIT 10
-            ''')
-            results = cursor.fetchall()
+            ranking = await self.get_guild_ranking(ctx.guild)  # includes unsaved XP
+
+            if ranking:
+                embed = self.leaderboard_embeds.get(ctx.guild.id)
+                if embed is None:
+                    embed = discord.Embed(
+                        title="🏆 XP Leaderboard",
+                        color=discord.Color.gold()
+                    )
 
-            if results:
-                embed = discord.Embed(
-                    title="🏆 XP Leaderboard",
-                    color=discord.Color.gold()
-                )
+                    leaderboard_text = ""
+                    for user_id, xp in ranking.top(LEADERBOARD_SIZE):
+                        member = ctx.guild.get_member(int(user_id))
+                        name = member.display_name if member else "Unknown User"
+                        leaderboard_text += f"{ranking.rank(user_id)}. {name} - Level {self.calculate_level(xp)} ({xp} XP)\n"
 
-                leaderboard_text = ""
-                for i, (user_id, xp, level) in enumerate(results, 1):
-                    member = ctx.guild.get_member(int(user_id))
-                    name = member.display_name if member else "Unknown User"
-                    leaderboard_text += f"{i}. {name} - Level {level} ({xp} XP)\n"
+                    embed.description = f"```\n{leaderboard_text}```"
+                    self.leaderboard_embeds.set(ctx.guild.id, embed)
 
-                embed.description = f"```\n{leaderboard_text}```"
-                await ctx.send(embed=embed)
+                # The embed is shared; the caller's own rank is added per request
+                user_id = str(ctx.author.id)
+                rank = ranking.rank(user_id)
+                content = f"📍 Your rank: **#{rank}** of {len(ranking)} ({ranking.scores[user_id]} XP)" if rank else None
+                await ctx.send(content=content, embed=embed)
             else:
                 await ctx.send("No XP data available yet!")
 
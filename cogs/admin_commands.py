@@ -90,5 +90,29 @@ class AdminCommands(commands.Cog):
             self.logger.error(f"Error refreshing bot: {str(e)}")
             await loading_msg.edit(content=f"❌ Error refreshing bot: {str(e)}")
 
+    @commands.command(name='dbstats')
+    @commands.has_permissions(administrator=True)
+    async def db_stats(self, ctx):
+        """Show the user database queries with the most total time"""
+        try:
+            stats = self.bot.user_db.get_stats(limit=8) if self.bot.user_db else []
+            if not stats:
+                await ctx.send("No database queries recorded yet.")
+                return
+
+            embed = discord.Embed(title="🗄️ Database Query Stats", color=discord.Color.blue())
+            for entry in stats:
+                embed.add_field(
+                    name=f"{entry['query'][:100]}",
+                    value=f"Calls: `{entry['calls']}` • Avg: `{entry['avg_ms']}ms` • "
+                          f"Max: `{entry['max_ms']}ms` • Total: `{entry['total_ms']}ms`",
+                    inline=False
+                )
+            await ctx.send(embed=embed)
+
+        except Exception as e:
+            self.logger.error(f"Error in dbstats command: {str(e)}")
+            await ctx.send("❌ An error occurred while fetching database stats.")
+
 async def setup(bot):
     await bot.add_cog(AdminCommands(bot))
\ No newline at end of file
@@ -2,21 +2,34 @@ import discord
 from discord.ext import commands
 import logging
 import os
+import asyncio
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI
 import json
-from typing import Optional
+from typing import Optional, Callable, List, Dict
+from utils.llm_cache import get_llm_cache
+from utils.pagination import paginate_text, PaginatorView
 
 # Initialize OpenAI client
 # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
 # do not change this unless explicitly requested by the user
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+AI_MODEL = "gpt-4o"
+AI_TEMPERATURE = 0.7
+AI_MAX_TOKENS = 2000
+# Minimum seconds between progressive edits of a streamed answer, which keeps
+# us well inside Discord's per-channel message edit rate limit
+STREAM_EDIT_INTERVAL = 1.5
+# Appended to an answer whose stream ended early; such answers are not cached
+INCOMPLETE_MARKER = "⚠️ *Response incomplete — please try again.*"
 
 class AIChatEnhanced(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('discord_bot')
         self.ai_channel_id = 1340150404775940210  # AI commands channel
+        self.llm_cache = get_llm_cache()
 
     async def _check_channel(self, ctx):
         """Check if command is used in the AI channel"""
@@ -25,24 +38,108 @@ class AIChatEnhanced(commands.Cog):
             return False
         return True
 
-    async def _get_ai_response(self, prompt: str, system_message: Optional[str] = None) -> str:
-        """Get response from OpenAI API"""
+    def _build_messages(self, prompt: str, system_message: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a prompt"""
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def _send_pages(self, ctx, text: str, render: Callable[[str, bool], discord.Embed], page_limit: int, message: Optional[discord.Message] = None):
+        """Show a finished answer, paginating it when it overflows one embed"""
+        pages = paginate_text(text, page_limit)
+        if len(pages) == 1:
+            embed, view = render(pages[0], True), None
+        else:
+            view = PaginatorView(pages, lambda page: render(page, True), author_id=ctx.author.id)
+            embed = view.build_embed()
+
+        if message:
+            await message.edit(embed=embed, view=view)
+        else:
+            message = await ctx.send(embed=embed, view=view)
+        if view:
+            view.message = message
+
+    async def _stream_ai_response(
+        self,
+        ctx,
+        prompt: str,
+        render: Callable[[str, bool], discord.Embed],
+        page_limit: int,
+        system_message: Optional[str] = None
+    ) -> Optional[str]:
+        """Stream an answer into a single message, editing it as tokens arrive
+
+        `render(page, done)` builds the embed for one page of text, which is
+        at most `page_limit` characters. While streaming, the newest page is
+        shown; the finished answer is paginated. Cached answers are posted
+        immediately without calling the API.
+        """
+        cached = await self.llm_cache.get(AI_MODEL, prompt, system_message, AI_TEMPERATURE)
+        if cached is not None:
+            await self._send_pages(ctx, cached, render, page_limit)
+            return cached
+
+        message = await ctx.send(embed=render("", False))
+        answer = ""
+        # Show the first tokens as soon as they arrive, then throttle edits
+        last_edit = float('-inf')
+        rendered = ""
+        finish_reason = None
+
         try:
-            messages = []
-            if system_message:
-                messages.append({"role": "system", "content": system_message})
-            messages.append({"role": "user", "content": prompt})
-
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=2000
+            stream = await client.chat.completions.create(
+                model=AI_MODEL,
+                messages=self._build_messages(prompt, system_message),
+                temperature=AI_TEMPERATURE,
+                max_tokens=AI_MAX_TOKENS,
+                stream=True
             )
-            return response.choices[0].message.content
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                delta = choice.delta.content
+                if not delta:
+                    continue
+                answer += delta
+
+                now = asyncio.get_running_loop().time()
+                if now - last_edit >= STREAM_EDIT_INTERVAL and answer != rendered:
+                    try:
+                        # Leave room for the typing cursor
+                        current_page = paginate_text(answer, page_limit - 1)[-1]
+                        await message.edit(embed=render(current_page, False))
+                        rendered = answer
+                    except discord.HTTPException as e:
+                        self.logger.warning(f"Error updating streamed answer: {e}")
+                    last_edit = now
+
         except Exception as e:
-            self.logger.error(f"Error getting AI response: {e}")
-            return "❌ An error occurred while processing your request."
+            self.logger.error(f"Error streaming AI response: {e}")
+
+        if not answer:
+            await message.edit(embed=render("❌ An error occurred while processing your request.", True))
+            return None
+
+        if finish_reason != "stop":
+            # Interrupted or cut off at the token limit: flag it and don't cache it
+            self.logger.warning(f"Streamed AI response incomplete (finish_reason={finish_reason})")
+            await self._send_pages(ctx, f"{answer}\n\n{INCOMPLETE_MARKER}", render, page_limit, message)
+            return answer
+
+        await self._send_pages(ctx, answer, render, page_limit, message)
+        await self.llm_cache.set(AI_MODEL, prompt, answer, system_message, AI_TEMPERATURE)
+        return answer
+
+    @staticmethod
+    def _truncate(text: str, limit: int) -> str:
+        """Fit text into an embed limit"""
+        return text if len(text) <= limit else text[:limit - 1] + "…"
 
     @commands.command(name='ask')
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -51,9 +148,7 @@ class AIChatEnhanced(commands.Cog):
         if not await self._check_channel(ctx):
             return
 
-        async with ctx.typing():
-            answer = await self._get_ai_response(question)
-
+        def render(answer: str, done: bool) -> discord.Embed:
             embed = discord.Embed(
                 title="❓ Question & Answer",
                 color=discord.Color.blue()
@@ -61,17 +156,19 @@ class AIChatEnhanced(commands.Cog):
 
             embed.add_field(
                 name="Question",
-                value=question,
+                value=self._truncate(question, 1024),
                 inline=False
             )
 
             embed.add_field(
                 name="Answer",
-                value=answer,
+                value=answer if done else f"{answer}▌",
                 inline=False
             )
+            return embed
 
-            await ctx.send(embed=embed)
+        # Embed field values are limited to 1024 characters
+        await self._stream_ai_response(ctx, question, render, 1024)
 
     @commands.command(name='explain')
     @commands.cooldown(1, 10, commands.BucketType.user)
@@ -80,21 +177,20 @@ class AIChatEnhanced(commands.Cog):
         if not await self._check_channel(ctx):
             return
 
-        async with ctx.typing():
-            system_prompt = (
-                "You are a knowledgeable teacher. Explain the concept clearly "
-                "with examples and analogies when appropriate."
-            )
+        system_prompt = (
+            "You are a knowledgeable teacher. Explain the concept clearly "
+            "with examples and analogies when appropriate."
+        )
 
-            explanation = await self._get_ai_response(concept, system_prompt)
-
-            embed = discord.Embed(
-                title=f"📚 Explaining: {concept}",
-                description=explanation,
+        def render(explanation: str, done: bool) -> discord.Embed:
+            return discord.Embed(
+                title=self._truncate(f"📚 Explaining: {concept}", 256),
+                description=explanation if done else f"{explanation}▌",
                 color=discord.Color.green()
             )
 
-            await ctx.send(embed=embed)
+        # Pages are kept shorter than the 4096 description limit for readability
+        await self._stream_ai_response(ctx, concept, render, 2000, system_prompt)
 
 async def setup(bot):
-    await bot.add_cog(AIChatEnhanced(bot))
\ No newline at end of file
+    await bot.add_cog(AIChatEnhanced(bot))
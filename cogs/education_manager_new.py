@@ -1,15 +1,20 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 from typing import Dict, Any, Tuple, Optional
 import asyncio
 from question_generator import QuestionGenerator
+from question_pool import QuestionPool
+from question_store import ensure_question_bank
+from question_index import get_question_index
+from utils.llm_cache import get_llm_cache
 
 class EducationManager(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('discord_bot')
         self.question_generator = QuestionGenerator()
+        self.question_pool = QuestionPool(self.question_generator)
         self.command_locks = {}
         self.user_questions = {}
         self.dm_gif_url = "https://i.imgur.com/v2ak2ph.gif"
@@ -20,6 +25,31 @@ class EducationManager(commands.Cog):
             'D': '📝'
         }
 
+    async def cog_load(self):
+        """Prepare the stored question bank and start keeping requested question pools warm"""
+        try:
+            # Compiling and indexing the bank is blocking; keep it off the event loop
+            await asyncio.to_thread(ensure_question_bank)
+            await asyncio.to_thread(get_question_index)
+        except Exception as e:
+            self.logger.error(f"Error preparing the question bank: {str(e)}")
+        self.refill_question_pool.start()
+
+    def cog_unload(self):
+        """Stop pool refills and release the question generator's worker pool"""
+        self.refill_question_pool.cancel()
+        self.question_generator.close()
+
+    @tasks.loop(seconds=15)
+    async def refill_question_pool(self):
+        """Background top-up of pre-generated questions"""
+        try:
+            generated = await self.question_pool.refill()
+            if generated:
+                self.logger.debug(f"Question pool refill generated {generated} questions")
+        except Exception as e:
+            self.logger.error(f"Error refilling question pool: {str(e)}")
+
     async def _handle_question_command(self, ctx, subject: str, topic: Optional[str], class_level: int):
         """Handle question generation for both class 11 and 12"""
         if ctx.author.id not in self.command_locks:
@@ -66,7 +96,7 @@ class EducationManager(commands.Cog):
 
                 # Generate question
                 try:
-                    question = await self.question_generator.generate_question(
+                    question = await self.question_pool.get_question(
                         subject=normalized_subject,
                         topic=topic,
                         class_level=class_level,
@@ -189,6 +219,60 @@ class EducationManager(commands.Cog):
         """Get a question for class 12"""
         await self._handle_question_command(ctx, subject, topic, 12)
 
+    @commands.command(name='genstats')
+    @commands.has_permissions(administrator=True)
+    async def generator_stats(self, ctx):
+        """Show question generator worker pool metrics"""
+        metrics = self.question_generator.get_metrics()
+        pool_stats = self.question_pool.get_stats()
+        cache_stats = await get_llm_cache().get_stats()
+        embed = discord.Embed(
+            title="⚙️ Question Generator Stats",
+            color=discord.Color.blue()
+        )
+        embed.add_field(
+            name="Worker Pool",
+            value=(
+                f"```Running: {metrics['running']}/{metrics['max_workers']}\n"
+                f"Queued: {metrics['queued']}\n"
+                f"Pending limit: {metrics['max_pending']}```"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Requests",
+            value=(
+                f"```Submitted: {metrics['submitted']}\n"
+                f"Completed: {metrics['completed']}\n"
+                f"Rejected: {metrics['rejected']}\n"
+                f"Timeouts: {metrics['timeouts']}\n"
+                f"Errors: {metrics['errors']}```"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="Question Pool",
+            value=(
+                f"```Topics tracked: {pool_stats['keys']}\n"
+                f"Ready questions: {pool_stats['ready']}\n"
+                f"Hits: {pool_stats['hits']}\n"
+                f"Misses: {pool_stats['misses']}```"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="LLM Response Cache",
+            value=(
+                f"```Entries: {cache_stats['entries']}\n"
+                f"Hits: {cache_stats['hits']} ({cache_stats['hit_rate']:.0%})\n"
+                f"Misses: {cache_stats['misses']}\n"
+                f"Bypassed: {cache_stats['bypassed']}\n"
+                f"Evictions: {cache_stats['evictions']}```"
+            ),
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
     @commands.command(name='help')
     async def help_command(self, ctx):
         """Show help information with fancy formatting"""
@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 import json
-import sqlite3
 import logging
 import asyncio
 import google.generativeai as genai
@@ -9,6 +8,7 @@ import os
 from typing import List, Dict, Optional
 from datetime import datetime
 from tenacity import retry, stop_after_attempt, wait_exponential
+from utils.llm_cache import get_llm_cache
 
 class Flashcard:
     """A class representing a flashcard with front and back content."""
@@ -24,6 +24,7 @@ class Flashcards(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('discord_bot')
+        self.llm_cache = get_llm_cache()
         # Configure Gemini
         if not os.getenv('GOOGLE_API_KEY'):
             self.logger.error("Google API key not found in environment variables")
@@ -36,16 +37,17 @@ class Flashcards(commands.Cog):
                 self.logger.info("Successfully initialized Gemini model")
             except Exception as e:
                 self.logger.error(f"Failed to configure Gemini: {str(e)}")
-        self.setup_database()
+        self.db = bot.user_db  # shared async access to data/user_data.db
 
-    def setup_database(self):
+    async def cog_load(self):
+        """Create the flashcards table"""
+        await self.setup_database()
+
+    async def setup_database(self):
         """Initialize SQLite database for flashcards"""
         try:
-            self.db = sqlite3.connect('data/user_data.db')
-            cursor = self.db.cursor()
-
             # Create flashcards table
-            cursor.execute('''
+            await self.db.executescript('''
                 CREATE TABLE IF NOT EXISTS flashcards (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id TEXT NOT NULL,
@@ -55,16 +57,23 @@ class Flashcards(commands.Cog):
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     last_reviewed TIMESTAMP,
                     review_count INTEGER DEFAULT 0
-                )
+                );
             ''')
 
-            self.db.commit()
             self.logger.info("Flashcards database initialized")
         except Exception as e:
             self.logger.error(f"Error setting up flashcards database: {str(e)}")
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def _generate_with_gemini(self, prompt: str) -> str:
+        """Get a Gemini response, reusing cached answers for identical prompts"""
+        return await self.llm_cache.get_or_fetch(
+            model='gemini-2.0-flash',
+            prompt=prompt,
+            fetch=lambda: self._request_gemini(prompt)
+        )
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    async def _request_gemini(self, prompt: str) -> str:
         """Make API call to Gemini with retry logic"""
         try:
             # List available models for debugging
@@ -182,14 +191,10 @@ Text: {text}"""
                     return
 
                 # Save flashcards to database
-                cursor = self.db.cursor()
-                for card in flashcards:
-                    cursor.execute('''
-                        INSERT INTO flashcards (user_id, subject, front, back, created_at)
-                        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ''', (card.user_id, card.subject, card.front, card.back))
-
-                self.db.commit()
+                await self.db.executemany('''
+                    INSERT INTO flashcards (user_id, subject, front, back, created_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', [(card.user_id, card.subject, card.front, card.back) for card in flashcards])
 
                 # Create embed to show the generated flashcards
                 embed = discord.Embed(
@@ -236,26 +241,22 @@ Text: {text}"""
     async def review_flashcards(self, ctx, subject: Optional[str] = None):
         """Review flashcards interactively"""
         try:
-            cursor = self.db.cursor()
-
             # Get flashcards for review
             if subject:
-                cursor.execute('''
+                cards = await self.db.fetchall('''
                     SELECT id, front, back FROM flashcards 
                     WHERE user_id = ? AND subject = ?
                     ORDER BY last_reviewed ASC NULLS FIRST
                     LIMIT 5
                 ''', (str(ctx.author.id), subject))
             else:
-                cursor.execute('''
+                cards = await self.db.fetchall('''
                     SELECT id, front, back FROM flashcards 
                     WHERE user_id = ?
                     ORDER BY last_reviewed ASC NULLS FIRST
                     LIMIT 5
                 ''', (str(ctx.author.id),))
 
-            cards = cursor.fetchall()
-
             if not cards:
                 await ctx.send("No flashcards found for review!" + (f" in {subject}" if subject else ""))
                 return
@@ -282,13 +283,12 @@ Text: {text}"""
                     await card_msg.edit(embed=embed)
 
                     # Update review count and timestamp
-                    cursor.execute('''
+                    await self.db.execute('''
                         UPDATE flashcards 
                         SET review_count = review_count + 1,
                             last_reviewed = CURRENT_TIMESTAMP 
                         WHERE id = ?
                     ''', (card_id,))
-                    self.db.commit()
 
                 except asyncio.TimeoutError:
                     await ctx.send("Review session timed out!")
@@ -305,10 +305,8 @@ Text: {text}"""
     async def flashcard_stats(self, ctx):
         """View flashcard statistics"""
         try:
-            cursor = self.db.cursor()
-
             # Get user's flashcard stats
-            cursor.execute('''
+            stats = await self.db.fetchone('''
                 SELECT 
                     COUNT(*) as total_cards,
                     COUNT(DISTINCT subject) as subjects,
@@ -318,8 +316,6 @@ Text: {text}"""
                 WHERE user_id = ?
             ''', (str(ctx.author.id),))
 
-            stats = cursor.fetchone()
-
             if not stats or stats[0] == 0:
                 await ctx.send("No flashcard statistics available!")
                 return
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import google.generativeai as genai
 import os
 from typing import List, Dict, Optional
+from utils.llm_cache import get_llm_cache
 
 class LearningAssistant(commands.Cog):
     """A cog for AI-powered learning assistance features"""
@@ -15,6 +16,7 @@ class LearningAssistant(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('discord_bot')
+        self.llm_cache = get_llm_cache()
         # Configure Gemini
         if not os.getenv('GOOGLE_API_KEY'):
             self.logger.error("Google API key not found in environment variables")
@@ -22,20 +24,22 @@ class LearningAssistant(commands.Cog):
             try:
                 genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
                 self.logger.info("Successfully configured Gemini API")
-                self.model = genai.GenerativeModel('gemini-2.0-flash')
+                self.model_name = 'gemini-2.0-flash'
+                self.model = genai.GenerativeModel(self.model_name)
                 self.logger.info("Successfully initialized Gemini model")
             except Exception as e:
                 self.logger.error(f"Failed to configure Gemini: {str(e)}")
-        self.setup_database()
+        self.db = bot.user_db  # shared async access to data/user_data.db
 
-    def setup_database(self):
+    async def cog_load(self):
+        """Create the learning assistant tables"""
+        await self.setup_database()
+
+    async def setup_database(self):
         """Initialize SQLite database for learning assistant features"""
         try:
-            self.db = sqlite3.connect('data/user_data.db')
-            cursor = self.db.cursor()
-
-            # Create study_progress table
-            cursor.execute('''
+            await self.db.executescript('''
+                -- Create study_progress table
                 CREATE TABLE IF NOT EXISTS study_progress (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id TEXT NOT NULL,
@@ -44,11 +48,9 @@ class LearningAssistant(commands.Cog):
                     correct_answers INTEGER DEFAULT 0,
                     total_attempts INTEGER DEFAULT 0,
                     last_study_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+                );
 
-            # Create study_schedule table
-            cursor.execute('''
+                -- Create study_schedule table
                 CREATE TABLE IF NOT EXISTS study_schedule (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id TEXT NOT NULL,
@@ -58,11 +60,9 @@ class LearningAssistant(commands.Cog):
                     daily_topics TEXT NOT NULL,
                     completed_topics TEXT DEFAULT '[]',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+                );
 
-            # Create study_tip_categories table
-            cursor.execute('''
+                -- Create study_tip_categories table
                 CREATE TABLE IF NOT EXISTS study_tip_categories (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id TEXT NOT NULL,
@@ -70,11 +70,9 @@ class LearningAssistant(commands.Cog):
                     description TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE(user_id, category_name)
-                )
-            ''')
+                );
 
-            # Create study_tips table
-            cursor.execute('''
+                -- Create study_tips table
                 CREATE TABLE IF NOT EXISTS study_tips (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     category_id INTEGER NOT NULL,
@@ -82,14 +80,26 @@ class LearningAssistant(commands.Cog):
                     tip_content TEXT NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY(category_id) REFERENCES study_tip_categories(id)
-                )
+                );
             ''')
 
-            self.db.commit()
             self.logger.info("Learning assistant database initialized")
         except Exception as e:
             self.logger.error(f"Error setting up learning assistant database: {str(e)}")
 
+    async def _generate(self, prompt: str, fresh: bool = False) -> str:
+        """Get a Gemini response through the shared response cache"""
+        async def fetch():
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            return response.text
+
+        return await self.llm_cache.get_or_fetch(
+            model=self.model_name,
+            prompt=prompt,
+            fetch=fetch,
+            fresh=fresh
+        )
+
     @commands.group(name='learn', invoke_without_command=True)
     async def learn(self, ctx):
         """Learning assistant command group"""
@@ -126,8 +136,7 @@ class LearningAssistant(commands.Cog):
         """Generate a personalized quiz based on user's weak areas"""
         try:
             # Get user's study progress
-            cursor = self.db.cursor()
-            cursor.execute('''
+            weak_topic = await self.db.fetchone('''
                 SELECT topic, correct_answers, total_attempts 
                 FROM study_progress 
                 WHERE user_id = ? AND subject = ?
@@ -135,8 +144,6 @@ class LearningAssistant(commands.Cog):
                 LIMIT 1
             ''', (str(ctx.author.id), subject))
 
-            weak_topic = cursor.fetchone()
-
             # Generate question prompt
             if weak_topic and weak_topic[1] > 0:
                 topic = weak_topic[0]
@@ -149,9 +156,10 @@ class LearningAssistant(commands.Cog):
             msg = await ctx.send("🤔 Generating your personalized question...")
 
             try:
-                response = await asyncio.to_thread(self.model.generate_content, prompt)
+                # Quiz questions should vary between attempts, so skip the cache
+                response_text = await self._generate(prompt, fresh=True)
 
-                question = response.text.strip()
+                question = response_text.strip()
 
                 embed = discord.Embed(
                     title=f"📝 {subject} Question",
@@ -187,27 +195,24 @@ class LearningAssistant(commands.Cog):
                 Each topic should be specific and achievable in one study session.
                 Example format: ["Introduction to {subject}", "Basic Concepts", ...]"""
 
-                response = await asyncio.to_thread(self.model.generate_content, prompt)
+                response_text = await self._generate(prompt)
 
                 # Parse the study plan
                 try:
-                    daily_topics = json.loads(response.text.strip())
+                    daily_topics = json.loads(response_text.strip())
                 except:
                     # If JSON parsing fails, split by newlines as fallback
-                    daily_topics = [topic.strip() for topic in response.text.split('\n') if topic.strip()]
+                    daily_topics = [topic.strip() for topic in response_text.split('\n') if topic.strip()]
 
                 # Save to database
-                cursor = self.db.cursor()
                 start_date = datetime.now().date()
                 end_date = start_date + timedelta(days=days)
 
-                cursor.execute('''
+                await self.db.execute('''
                     INSERT INTO study_schedule (user_id, subject, start_date, end_date, daily_topics)
                     VALUES (?, ?, ?, ?, ?)
                 ''', (str(ctx.author.id), subject, start_date, end_date, json.dumps(daily_topics)))
 
-                self.db.commit()
-
                 # Create embed with schedule
                 embed = discord.Embed(
                     title=f"📚 Your {subject} Study Schedule",
@@ -259,9 +264,9 @@ class LearningAssistant(commands.Cog):
                 4. Explain each step
                 5. Give the final answer"""
 
-                response = await asyncio.to_thread(self.model.generate_content, prompt)
+                response_text = await self._generate(prompt)
 
-                solution = response.text.strip()
+                solution = response_text.strip()
 
                 # Create embed with solution
                 embed = discord.Embed(
@@ -284,18 +289,14 @@ class LearningAssistant(commands.Cog):
     async def check_progress(self, ctx):
         """Check study progress and schedule"""
         try:
-            cursor = self.db.cursor()
-
             # Get active study schedules
-            cursor.execute('''
+            schedules = await self.db.fetchall('''
                 SELECT subject, start_date, end_date, daily_topics, completed_topics
                 FROM study_schedule
                 WHERE user_id = ? AND end_date >= date('now')
                 ORDER BY start_date ASC
             ''', (str(ctx.author.id),))
 
-            schedules = cursor.fetchall()
-
             if not schedules:
                 await ctx.send("You don't have any active study schedules. Use `!learn schedule` to create one!")
                 return
@@ -362,23 +363,23 @@ class LearningAssistant(commands.Cog):
             return
 
         try:
-            cursor = self.db.cursor()
             if action.lower() == 'add':
-                cursor.execute('''
+                await self.db.execute('''
                     INSERT INTO study_tip_categories (user_id, category_name, description)
                     VALUES (?, ?, ?)
                 ''', (str(ctx.author.id), name, description))
-                self.db.commit()
                 await ctx.send(f"✅ Created new category: **{name}**")
             else:  # delete
-                cursor.execute('''
-                    DELETE FROM study_tips WHERE category_id IN 
-                    (SELECT id FROM study_tip_categories WHERE user_id = ? AND category_name = ?)
-                ''', (str(ctx.author.id), name))
-                cursor.execute('''
-                    DELETE FROM study_tip_categories WHERE user_id = ? AND category_name = ?
-                ''', (str(ctx.author.id), name))
-                self.db.commit()
+                def delete_category(conn):
+                    conn.execute('''
+                        DELETE FROM study_tips WHERE category_id IN 
+                        (SELECT id FROM study_tip_categories WHERE user_id = ? AND category_name = ?)
+                    ''', (str(ctx.author.id), name))
+                    conn.execute('''
+                        DELETE FROM study_tip_categories WHERE user_id = ? AND category_name = ?
+                    ''', (str(ctx.author.id), name))
+
+                await self.db.transaction(delete_category)
                 await ctx.send(f"✅ Deleted category: **{name}** and all its tips")
         except sqlite3.IntegrityError:
             await ctx.send(f"❌ Category **{name}** already exists!")
@@ -390,8 +391,7 @@ class LearningAssistant(commands.Cog):
     async def list_categories(self, ctx):
         """List all study tip categories"""
         try:
-            cursor = self.db.cursor()
-            cursor.execute('''
+            categories = await self.db.fetchall('''
                 SELECT category_name, description, 
                        (SELECT COUNT(*) FROM study_tips WHERE category_id = c.id) as tip_count
                 FROM study_tip_categories c
@@ -399,8 +399,6 @@ class LearningAssistant(commands.Cog):
                 ORDER BY category_name
             ''', (str(ctx.author.id),))
 
-            categories = cursor.fetchall()
-
             if not categories:
                 await ctx.send("📝 You don't have any tip categories yet. Create one with `!tips category add <name>`!")
                 return
@@ -429,25 +427,17 @@ class LearningAssistant(commands.Cog):
     async def add_tip(self, ctx, category: str, *, tip: str):
         """Add a new study tip to a category"""
         try:
-            cursor = self.db.cursor()
-            # Get category ID
-            cursor.execute('''
-                SELECT id FROM study_tip_categories
+            # Look up the category and insert in one statement
+            added = await self.db.execute('''
+                INSERT INTO study_tips (category_id, user_id, tip_content)
+                SELECT id, user_id, ? FROM study_tip_categories
                 WHERE user_id = ? AND category_name = ?
-            ''', (str(ctx.author.id), category))
+            ''', (tip, str(ctx.author.id), category))
 
-            result = cursor.fetchone()
-            if not result:
+            if not added:
                 await ctx.send(f"❌ Category **{category}** not found!")
                 return
 
-            category_id = result[0]
-            cursor.execute('''
-                INSERT INTO study_tips (category_id, user_id, tip_content)
-                VALUES (?, ?, ?)
-            ''', (category_id, str(ctx.author.id), tip))
-
-            self.db.commit()
             await ctx.send(f"✅ Added tip to **{category}**!")
 
         except Exception as e:
@@ -458,16 +448,13 @@ class LearningAssistant(commands.Cog):
     async def view_tips(self, ctx, category: str):
         """View tips in a category"""
         try:
-            cursor = self.db.cursor()
-            cursor.execute('''
+            tips = await self.db.fetchall('''
                 SELECT t.id, t.tip_content, t.created_at
                 FROM study_tips t
                 JOIN study_tip_categories c ON t.category_id = c.id
                 WHERE t.user_id = ? AND c.category_name = ?
                 ORDER BY t.created_at DESC
             ''', (str(ctx.author.id), category))
-
-            tips = cursor.fetchall()
             if not tips:
                 await ctx.send(f"📝 No tips found in category **{category}**!")
                 return
@@ -497,15 +484,13 @@ class LearningAssistant(commands.Cog):
     async def delete_tip(self, ctx, category: str, tip_id: int):
         """Delete a specific tip from a category"""
         try:
-            cursor = self.db.cursor()
-            cursor.execute('''
+            deleted = await self.db.execute('''
                 DELETE FROM study_tips
                 WHERE id = ? AND user_id = ? AND category_id IN 
                     (SELECT id FROM study_tip_categories WHERE category_name = ? AND user_id = ?)
             ''', (tip_id, str(ctx.author.id), category, str(ctx.author.id)))
 
-            if cursor.rowcount > 0:
-                self.db.commit()
+            if deleted > 0:
                 await ctx.send(f"✅ Deleted tip #{tip_id} from **{category}**!")
             else:
                 await ctx.send(f"❌ Tip #{tip_id} not found in **{category}**!")
@@ -1,22 +1,100 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 import asyncio
-from typing import Optional, Dict, Any, Union, List
+import time
+from typing import Optional, Dict, Any, Union, List, Tuple
 import aiohttp
 from bs4 import BeautifulSoup
 import yt_dlp
 import re
 import random
+import queue
 from discord import SelectOption
 from discord.ui import Select, View
 import os
 import json
 from dotenv import load_dotenv
+from utils.lyrics_cache import LyricsCache
+from utils.rate_limit import TokenBucket
+from utils.ttl_cache import TTLCache
+from utils.music_queue import GuildQueue, PlayerState, LOOP_MODES
+from utils.message_editor import CoalescedEditor
+from utils.voice_sessions import VoiceSessionManager
+from utils.audio_cache import AudioCache
+from utils.audio_spool import AudioSpool, SpoolStalled, TrackedSource, BYTES_PER_SECOND, open_spool_source
 
 # Load environment variables
 load_dotenv()
 
+# Musixmatch quota pacing: spread the daily call allowance evenly, allow short
+# bursts, and back off for a while whenever the API reports the quota exceeded
+MUSIXMATCH_CALLS_PER_DAY = int(os.getenv('MUSIXMATCH_CALLS_PER_DAY', '2000'))
+MUSIXMATCH_BURST = 10
+MUSIXMATCH_PENALTY_SECONDS = 300
+
+# Flat search results carry no signed URLs and are cached for SEARCH_CACHE_TTL;
+# resolved streams are cached until shortly before their signed URL expires
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 3600
+STREAM_CACHE_SIZE = 256
+STREAM_EXPIRY_MARGIN = 600
+
+# Now-playing progress: every message is refreshed by one scheduler that
+# spends from a shared edit budget and stretches the interval under load
+NOW_PLAYING_INTERVAL = 5  # seconds between edits of one message when idle
+NOW_PLAYING_EDITS_PER_SECOND = float(os.getenv('NOW_PLAYING_EDITS_PER_SECOND', '2'))
+NOW_PLAYING_BURST = 5
+NOW_PLAYING_PENALTY_SECONDS = 10
+PROGRESS_BAR_LENGTH = 20
+
+# Each playing track is decoded once into a local ring spool so seeks and
+# effect changes replay local audio instead of reconnecting to YouTube.
+# AUDIO_SPOOL_SECONDS=0 disables spooling (192 KB of disk per second held)
+AUDIO_SPOOL_SECONDS = int(os.getenv('AUDIO_SPOOL_SECONDS', '600'))
+AUDIO_SPOOL_REWIND_SECONDS = 120  # always kept behind the playhead for seeking back
+AUDIO_SPOOL_PREBUFFER = BYTES_PER_SECOND // 2
+# A burst of !volume changes restarts the source once, after it settles
+VOLUME_RESTART_DELAY = 0.75
+FFMPEG_RECONNECT_OPTIONS = '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5'
+
+# Unfiltered tracks at 100% volume are sent as Opus without decoding: Opus
+# sources are remuxed by FFmpeg and nothing is re-encoded in Python. Set
+# OPUS_PASSTHROUGH=0 to force the PCM path, e.g. to compare !audiostats
+OPUS_PASSTHROUGH = os.getenv('OPUS_PASSTHROUGH', '1') != '0'
+
+# Seconds of track time covered by one second of filtered output, so that
+# positions stay accurate under tempo-changing effects
+FILTER_SPEEDS = {
+    'nightcore': 1.25,
+    'slowand_reverb': 0.90 * (44100 * 0.90) / 48000
+}
+
+# Mood playlists are resolved to concrete videos in the background so that
+# !moodplay skips the search step; the mapping is refreshed periodically
+MOOD_REFRESH_HOURS = int(os.getenv('MOOD_REFRESH_HOURS', '12'))
+
+# Phase one: list titles/durations only, without resolving any formats
+YTDL_SEARCH_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': 'in_playlist',
+    'default_search': 'ytsearch5',
+    'simulate': True,
+    'skip_download': True,
+    'force_generic_extractor': False
+}
+
+# Phase two: resolve the audio stream for the single chosen video
+YTDL_STREAM_OPTIONS = {
+    'format': 'bestaudio/best',
+    'quiet': True,
+    'no_warnings': True,
+    'noplaylist': True,
+    'simulate': True,
+    'skip_download': True
+}
+
 class SongSelect(discord.ui.Select):
     def __init__(self, options: List[Dict[str, Any]], callback_func):
         super().__init__(
@@ -41,16 +119,23 @@ class MusicCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('discord_bot')
-        self.voice_clients = {}
+        # Healthy voice connections per guild; stale ones are replaced, idle ones closed
+        self.voice_sessions = VoiceSessionManager()
+        self.voice_clients = self.voice_sessions.clients
         self.current_tracks = {}
-        self.volume = 1.0
         self.audio_filters = {
             'bassboost': 'bass=g=20:f=110:w=0.3',
             '8d': 'apulsator=hz=0.09',
             'nightcore': 'aresample=48000,asetrate=48000*1.25',
             'slowand_reverb': 'atempo=0.90,asetrate=44100*0.90,aecho=0.8:0.9:1000|1800:0.2|0.1,areverse,aecho=0.8:0.88:60|50:0.2|0.1,areverse'
         }
-        self.progress_update_tasks = {}
+        self.now_playing = {}  # message_id -> now-playing message state, see refresh_now_playing
+        self.progress_limiter = TokenBucket(rate=NOW_PLAYING_EDITS_PER_SECOND, capacity=NOW_PLAYING_BURST)
+        self.cpu_sample = (time.monotonic(), time.process_time())
+        self.queues: Dict[int, GuildQueue] = {}
+        self.players: Dict[int, PlayerState] = {}
+        self.play_tokens = {}  # guild_id -> token of the source whose end should advance the queue
+        self.volume_restarts: Dict[int, asyncio.Task] = {}  # guild_id -> pending debounced restart
         self.mood_playlists = {
             "happy": [
                 "Don't Stop Believin' - Journey",
@@ -88,6 +173,7 @@ class MusicCommands(commands.Cog):
                 "Clocks - Coldplay"
             ]
         }
+        self.mood_songs: Dict[str, List[Optional[Dict[str, Any]]]] = {}  # mood -> resolved entry per title
 
         # Load and verify Musixmatch API key
         self.musixmatch_api_key = os.getenv('MUSIXMATCH_API_KEY')
@@ -96,12 +182,181 @@ class MusicCommands(commands.Cog):
         else:
             self.logger.info(f"Musixmatch API key loaded successfully (length: {len(self.musixmatch_api_key)})")
 
+        self.lyrics_cache = LyricsCache()
+        # Extractors are reused across calls instead of being rebuilt each time.
+        # A YoutubeDL instance is not thread-safe, so each worker thread checks
+        # one out of a pool, which grows to the number of concurrent calls
+        self.ytdl_pools = {'search': queue.SimpleQueue(), 'stream': queue.SimpleQueue()}
+        self.search_cache = TTLCache(max_entries=SEARCH_CACHE_SIZE, default_ttl=SEARCH_CACHE_TTL)
+        self.stream_cache = TTLCache(max_entries=STREAM_CACHE_SIZE, default_ttl=SEARCH_CACHE_TTL)
+        self.pending_resolutions = {}
+        # Frequently played tracks are kept as local Opus files (AUDIO_CACHE_MAX_MB=0 disables)
+        self.audio_cache = AudioCache()
+        self.musixmatch_limiter = TokenBucket(
+            rate=MUSIXMATCH_CALLS_PER_DAY / 86400,
+            capacity=MUSIXMATCH_BURST
+        )
+
+    async def cog_load(self):
+        """Start the now-playing progress scheduler, voice health checks and mood resolution"""
+        self.refresh_now_playing.start()
+        self.check_voice_sessions.start()
+        self.refresh_mood_playlists.start()
+
+    def cog_unload(self):
+        """Stop background loops and release audio spools"""
+        self.refresh_now_playing.cancel()
+        self.check_voice_sessions.cancel()
+        self.refresh_mood_playlists.cancel()
+        for task in self.volume_restarts.values():
+            task.cancel()
+        self.audio_cache.close()
+        for track in self.current_tracks.values():
+            if track.get('spool'):
+                track.pop('spool').close()
+
+    async def end_session(self, guild_id: int, disconnect: bool = True):
+        """Tear down a guild's playback: queue, track, spool, progress and voice"""
+        self.get_queue(guild_id).clear()
+        self.play_tokens.pop(guild_id, None)
+        self.drop_now_playing(guild_id)
+        await self._close_spool(self.current_tracks.pop(guild_id, None))
+        if disconnect:
+            await self.voice_sessions.disconnect(guild_id)
+        else:
+            self.voice_sessions.forget(guild_id)
+
+    @tasks.loop(seconds=30)
+    async def check_voice_sessions(self):
+        """Leave idle channels and repair dropped voice connections"""
+        try:
+            idle, broken = self.voice_sessions.check_health()
+            for guild_id in idle:
+                self.logger.info(f"Leaving idle voice channel in guild {guild_id}")
+                self.voice_sessions.stats['idle_disconnects'] += 1
+                await self.end_session(guild_id)
+
+            for guild_id in broken:
+                self.logger.warning(f"Voice connection lost in guild {guild_id}, reconnecting")
+                track = self.current_tracks.get(guild_id)
+                position = self.exact_position(track) if track else 0.0
+                # Dropping the old client stops its player; that end must not advance the queue
+                self.play_tokens.pop(guild_id, None)
+                if not await self.voice_sessions.reconnect(guild_id):
+                    await self.end_session(guild_id, disconnect=False)
+                    continue
+
+                # Pick the track up where the connection dropped
+                if track and track.get('source') and self.current_tracks.get(guild_id) is track:
+                    try:
+                        await self._restart_at(guild_id, position, paused=bool(track.get('paused_at')))
+                    except Exception as e:
+                        self.logger.error(f"Error resuming track after reconnect: {e}")
+                        await self.play_next(guild_id)
+
+        except Exception as e:
+            self.logger.error(f"Error in voice session check: {str(e)}")
+
+    @check_voice_sessions.before_loop
+    async def before_check_voice_sessions(self):
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(hours=MOOD_REFRESH_HOURS)
+    async def refresh_mood_playlists(self):
+        """Resolve every mood title to its top search result"""
+        resolved = failed = 0
+        for mood, titles in self.mood_playlists.items():
+            previous = self.mood_songs.get(mood, [])
+            songs = []
+            for i, title in enumerate(titles):
+                song = await self._search_mood_title(title)
+                if song:
+                    resolved += 1
+                else:
+                    failed += 1
+                    song = previous[i] if i < len(previous) else None  # keep the last good result
+                songs.append(song)
+            self.mood_songs[mood] = songs
+        self.logger.info(f"Resolved mood playlists: {resolved} songs, {failed} failed")
+
+    @refresh_mood_playlists.before_loop
+    async def before_refresh_mood_playlists(self):
+        await self.bot.wait_until_ready()
+
+    async def _search_mood_title(self, title: str) -> Optional[Dict[str, Any]]:
+        """Top flat search result for a mood playlist title"""
+        results = await self.get_song_results(title)
+        return results[0] if results else None
+
+    async def get_mood_song(self, mood: str, index: int) -> Optional[Dict[str, Any]]:
+        """Resolved song for a mood title, searching on demand if not resolved yet"""
+        songs = self.mood_songs.setdefault(mood, [None] * len(self.mood_playlists[mood]))
+        if songs[index] is None:
+            songs[index] = await self._search_mood_title(self.mood_playlists[mood][index])
+        return songs[index]
+
+    def queued_mood_song(self, mood: str, index: int) -> Dict[str, Any]:
+        """Song to queue for a mood title: the resolved one, or a placeholder
+        that resolve_stream searches for when the entry comes up"""
+        songs = self.mood_songs.get(mood)
+        if songs and index < len(songs) and songs[index]:
+            return songs[index]
+        return {
+            'title': self.mood_playlists[mood][index],
+            'duration_string': '--:--',
+            'mood': mood,
+            'mood_index': index
+        }
+
+    @commands.Cog.listener()
+    async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+        """Clean up when the bot is kicked or disconnected from voice"""
+        if member.id != self.bot.user.id or after.channel is not None:
+            return
+        guild_id = member.guild.id
+        if guild_id in self.voice_sessions.reconnecting:
+            return  # our own reconnect drops the old connection first
+        voice_client = self.voice_clients.get(guild_id)
+        if voice_client and voice_client.is_connected():
+            return
+        if guild_id in self.voice_clients or guild_id in self.current_tracks:
+            self.logger.info(f"Bot left voice in guild {guild_id}, ending session")
+            self.voice_sessions.stats['dropped'] += 1
+            await self.end_session(guild_id, disconnect=False)
+
     async def get_lyrics(self, song_title: str, artist: str) -> Optional[Dict[str, Any]]:
-        """Get lyrics using Musixmatch API with enhanced error handling"""
+        """Get lyrics, serving from cache and pacing Musixmatch calls"""
+        cached = await self.lyrics_cache.get(song_title, artist)
+        if cached and cached.fresh:
+            self.logger.debug(f"Lyrics cache {'hit' if cached.result else 'negative hit'}: {song_title} - {artist}")
+            return cached.result
+
+        if not self.musixmatch_limiter.try_acquire():
+            self.logger.warning("Musixmatch quota budget exhausted, skipping API call")
+            return cached.result if cached else None
+
+        outcome, result = await self._fetch_lyrics(song_title, artist)
+        if outcome == 'found':
+            await self.lyrics_cache.set_found(song_title, artist, result)
+            return result
+        if outcome == 'not_found':
+            await self.lyrics_cache.set_not_found(song_title, artist)
+            return None
+        if outcome == 'rate_limited':
+            self.musixmatch_limiter.penalize(MUSIXMATCH_PENALTY_SECONDS)
+
+        # Rate limited or failed: a stale answer beats no answer
+        if cached:
+            self.logger.info(f"Serving stale lyrics for {song_title} - {artist}")
+            return cached.result
+        return None
+
+    async def _fetch_lyrics(self, song_title: str, artist: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Call Musixmatch, returning ('found' | 'not_found' | 'rate_limited' | 'error', result)"""
         try:
             if not self.musixmatch_api_key:
                 self.logger.error("Musixmatch API key not found")
-                return None
+                return 'error', None
 
             # Prepare request parameters
             params = {
@@ -119,60 +374,67 @@ class MusicCommands(commands.Cog):
 
             lyrics_url = "https://api.musixmatch.com/ws/1.1/matcher.lyrics.get"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(lyrics_url, params=params, headers=headers) as response:
-                    # Log response headers for debugging
-                    self.logger.debug(f"Response headers: {response.headers}")
+            session = self.bot.http_session
+            async with session.get(lyrics_url, params=params, headers=headers) as response:
+                # Log response headers for debugging
+                self.logger.debug(f"Response headers: {response.headers}")
 
-                    # Get raw response content
-                    content = await response.text()
-                    self.logger.debug(f"Raw response content: {content[:200]}...")
+                # Get raw response content
+                content = await response.text()
+                self.logger.debug(f"Raw response content: {content[:200]}...")
 
-                    if response.status == 429:
-                        self.logger.warning("Rate limit reached, please wait before trying again")
-                        return None
+                if response.status == 429:
+                    self.logger.warning("Rate limit reached, please wait before trying again")
+                    return 'rate_limited', None
 
-                    if response.status != 200:
-                        self.logger.error(f"HTTP Error {response.status}: {content}")
-                        return None
+                if response.status != 200:
+                    self.logger.error(f"HTTP Error {response.status}: {content}")
+                    return 'error', None
 
-                    try:
-                        # First try parsing as JSON
-                        data = json.loads(content)
-
-                        # Check API response status
-                        status_code = data['message']['header']['status_code']
-                        if status_code != 200:
-                            self.logger.error(f"API Error {status_code}: {data['message']['header'].get('message', 'Unknown error')}")
-                            return None
-
-                        # Extract lyrics
-                        lyrics = data['message']['body']['lyrics']['lyrics_body']
-                        # Remove Musixmatch disclaimer
-                        lyrics = lyrics.split("******* This Lyrics is NOT")[0].strip()
-
-                        return {
-                            'title': song_title,
-                            'artist': artist,
-                            'lyrics': lyrics,
-                            'status': 'success'
-                        }
-
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"JSON Parse Error: {str(e)}")
-                        self.logger.debug(f"Failed response content: {content}")
-                        return None
-                    except KeyError as e:
-                        self.logger.error(f"Unexpected API Response Format: {str(e)}")
-                        self.logger.debug(f"Response structure: {json.dumps(data, indent=2)}")
-                        return None
+                try:
+                    # First try parsing as JSON
+                    data = json.loads(content)
+
+                    # Check API response status
+                    status_code = data['message']['header']['status_code']
+                    if status_code == 404:
+                        return 'not_found', None
+                    if status_code in (402, 429):  # Musixmatch usage limit reached
+                        self.logger.warning(f"Musixmatch quota exceeded (status {status_code})")
+                        return 'rate_limited', None
+                    if status_code != 200:
+                        self.logger.error(f"API Error {status_code}: {data['message']['header'].get('message', 'Unknown error')}")
+                        return 'error', None
+
+                    # Extract lyrics
+                    lyrics = data['message']['body']['lyrics']['lyrics_body']
+                    # Remove Musixmatch disclaimer
+                    lyrics = lyrics.split("******* This Lyrics is NOT")[0].strip()
+                    if not lyrics:
+                        return 'not_found', None
+
+                    return 'found', {
+                        'title': song_title,
+                        'artist': artist,
+                        'lyrics': lyrics,
+                        'status': 'success'
+                    }
+
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"JSON Parse Error: {str(e)}")
+                    self.logger.debug(f"Failed response content: {content}")
+                    return 'error', None
+                except KeyError as e:
+                    self.logger.error(f"Unexpected API Response Format: {str(e)}")
+                    self.logger.debug(f"Response structure: {json.dumps(data, indent=2)}")
+                    return 'error', None
 
         except aiohttp.ClientError as e:
             self.logger.error(f"Network error while fetching lyrics: {str(e)}")
-            return None
+            return 'error', None
         except Exception as e:
             self.logger.error(f"Unexpected error in get_lyrics: {str(e)}")
-            return None
+            return 'error', None
 
     @commands.command(name='getlyrics')
     async def get_lyrics_command(self, ctx, song_title: str, *, artist: str):
@@ -231,118 +493,271 @@ class MusicCommands(commands.Cog):
         seconds = seconds % 60
         return f"{minutes:02d}:{seconds:02d}"
 
-    def create_progress_bar(self, current: int, total: int, length: int = 20) -> str:
-        """Create a progress bar with specified length"""
-        filled = int((current / total) * length)
-        return f"▰{'▰' * filled}{'▱' * (length - filled)}"
+    def exact_position(self, track: Dict[str, Any]) -> float:
+        """Seconds of the track played so far, frozen while paused"""
+        source = track.get('source')
+        if source is not None:
+            # Counted from frames actually sent, so seeks and tempo effects cannot drift
+            position = source.position
+        else:
+            position = (track.get('paused_at') or asyncio.get_event_loop().time()) - track['start_time']
+        return max(0.0, min(position, float(track['duration'])))
+
+    def track_position(self, track: Dict[str, Any]) -> int:
+        """Whole seconds played so far, for display"""
+        return int(self.exact_position(track))
+
+    def render_progress(self, position: int, duration: int) -> Tuple[str, str]:
+        """Return the progress bar and the full Progress field value"""
+        progress = min(position / duration, 1.0) if duration else 0.0
+        filled_segments = int(PROGRESS_BAR_LENGTH * progress)
+        progress_bar = '▰' * filled_segments + '▱' * (PROGRESS_BAR_LENGTH - filled_segments)
+
+        duration_timestamp = self.format_duration(duration)
+        value = (f"{progress_bar}\n"
+                 f"Time: `{self.format_duration(position)} / {duration_timestamp}`\n"
+                 f"Duration: `{duration_timestamp}`")
+        return progress_bar, value
+
+    def track_now_playing(self, guild_id: int, message: discord.Message, embed: discord.Embed):
+        """Hand a Now Playing message to the progress scheduler"""
+        track = self.current_tracks[guild_id]
+        self.now_playing[message.id] = {
+            'guild_id': guild_id,
+            'message': message,
+            'embed': embed,
+            'track': track,
+            'last_bar': self.render_progress(0, track['duration'])[0],
+            'next_update': time.monotonic() + NOW_PLAYING_INTERVAL,
+            'final': False
+        }
+
+    def finish_now_playing(self, guild_id: int):
+        """Give the guild's Now Playing messages one last full-bar update"""
+        for entry in self.now_playing.values():
+            if entry['guild_id'] == guild_id:
+                entry['final'] = True
+
+    def drop_now_playing(self, guild_id: int):
+        """Stop updating the guild's live Now Playing messages
 
-    async def update_progress(self, ctx, message_id: int, track_info: Dict[str, Any]):
-        """Update the progress bar for the currently playing song"""
+        Finished ones are kept until they get their last full-bar update.
+        """
+        for message_id in [m for m, e in self.now_playing.items() if e['guild_id'] == guild_id and not e['final']]:
+            del self.now_playing[message_id]
+
+    @tasks.loop(seconds=1)
+    async def refresh_now_playing(self):
+        """Refresh due Now Playing messages in one batch, within the edit budget"""
         try:
-            message = await ctx.channel.fetch_message(message_id)
-            start_time = track_info['start_time']
-            duration = track_info['duration']
-
-            while ctx.voice_client and ctx.voice_client.is_playing():
-                current_time = int(asyncio.get_event_loop().time() - start_time)
-                if current_time >= duration:
-                    break
-
-                # Format timestamps
-                current_timestamp = self.format_duration(current_time)
-                duration_timestamp = self.format_duration(duration)
-
-                # Calculate progress bar segments (20 segments total)
-                progress = min(current_time / duration, 1.0)
-                filled_segments = int(20 * progress)
-                progress_bar = '▰' * filled_segments + '▱' * (20 - filled_segments)
-
-                embed = message.embeds[0]
-                embed.set_field_at(
-                    0,  # Progress field is the first field
-                    name="Progress",
-                    value=f"{progress_bar}\n"
-                          f"Time: `{current_timestamp} / {duration_timestamp}`\n"
-                          f"Duration: `{duration_timestamp}`",
-                    inline=False
-                )
+            now = time.monotonic()
+            # Edits this tick may spend; 0 while penalized after a 429
+            budget = int(self.progress_limiter.available)
+            # Spread the sustained edit rate over all active messages, and
+            # stretch the cadence further while the bucket is running low
+            interval = max(NOW_PLAYING_INTERVAL, len(self.now_playing) / NOW_PLAYING_EDITS_PER_SECOND)
+            if budget < NOW_PLAYING_BURST:
+                interval *= NOW_PLAYING_BURST / max(budget, 1)
+            due = sorted(
+                (item for item in self.now_playing.items() if item[1]['final'] or item[1]['next_update'] <= now),
+                key=lambda item: item[1]['next_update']
+            )
 
-                try:
-                    await message.edit(embed=embed)
-                except discord.HTTPException as e:
-                    self.logger.error(f"Error updating progress message: {e}")
-                    break
-
-                await asyncio.sleep(5)  # Update every 5 seconds
-
-            # Final update to show completion
-            if ctx.voice_client and not ctx.voice_client.is_playing():
-                duration_timestamp = self.format_duration(duration)
-                embed = message.embeds[0]
-                embed.set_field_at(
-                    0,
-                    name="Progress",
-                    value=f"{'▰' * 20}\n"
-                          f"Time: `{duration_timestamp} / {duration_timestamp}`\n"
-                          f"Duration: `{duration_timestamp}`",
-                    inline=False
-                )
-                await message.edit(embed=embed)
+            batch = []
+            for message_id, entry in due:
+                track = entry['track']
+                if entry['final']:
+                    position = track['duration']
+                elif track.get('paused_at'):
+                    entry['next_update'] = now + interval
+                    continue
+                else:
+                    position = self.track_position(track)
+
+                progress_bar, value = self.render_progress(position, track['duration'])
+                if progress_bar == entry['last_bar']:
+                    # Nothing visible changed; skip the edit
+                    if entry['final']:
+                        del self.now_playing[message_id]
+                    else:
+                        entry['next_update'] = now + interval
+                    continue
+
+                if len(batch) >= budget or not self.progress_limiter.try_acquire():
+                    continue  # out of budget; it stays due and the oldest go first next tick
+                entry['last_bar'] = progress_bar
+                entry['next_update'] = now + interval
+                batch.append((message_id, entry, value))
+
+            if batch:
+                await asyncio.gather(*(self._edit_now_playing(*item) for item in batch))
 
         except Exception as e:
-            self.logger.error(f"Error in progress update task: {str(e)}")
+            self.logger.error(f"Error in now playing scheduler: {str(e)}")
 
-    async def get_song_results(self, query: str) -> List[Dict[str, Any]]:
-        """Search for songs using yt-dlp"""
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': False,
-            'default_search': 'ytsearch5',
-            'simulate': True,
-            'skip_download': True,
-            'force_generic_extractor': False
+    @refresh_now_playing.before_loop
+    async def before_refresh_now_playing(self):
+        await self.bot.wait_until_ready()
+
+    async def _edit_now_playing(self, message_id: int, entry: Dict[str, Any], value: str):
+        """Apply one progress update, dropping messages that can no longer be edited"""
+        embed = entry['embed']
+        embed.set_field_at(0, name="Progress", value=value, inline=False)
+        try:
+            await entry['message'].edit(embed=embed)
+        except discord.NotFound:
+            self.now_playing.pop(message_id, None)
+            return
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self.progress_limiter.penalize(NOW_PLAYING_PENALTY_SECONDS)
+            self.logger.error(f"Error updating progress message: {e}")
+
+        if entry['final']:
+            self.now_playing.pop(message_id, None)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a search query for cache lookups"""
+        return ' '.join(query.lower().split())
+
+    @staticmethod
+    def stream_expiry(url: str) -> Optional[float]:
+        """Read the signed expiry timestamp from a stream URL, if it has one"""
+        match = re.search(r'[?&/]expire[=/](\d+)', url or '')
+        return float(match.group(1)) if match else None
+
+    def _song_from_entry(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build a song dict from a (flat or fully extracted) yt-dlp entry"""
+        video_id = entry.get('id')
+        webpage_url = entry.get('webpage_url') or entry.get('url') or ''
+        if video_id and 'watch?v=' not in webpage_url:
+            webpage_url = f"https://www.youtube.com/watch?v={video_id}"
+        if not webpage_url:
+            return None
+
+        thumbnail = entry.get('thumbnail', '')
+        if not thumbnail and entry.get('thumbnails'):
+            thumbnail = entry['thumbnails'][-1].get('url', '')
+
+        duration = int(entry.get('duration') or 0)
+        return {
+            'id': video_id,
+            'title': entry.get('title', 'Unknown Title'),
+            'url': None,  # Stream URL, filled in by resolve_stream
+            'webpage_url': webpage_url,
+            'thumbnail': thumbnail,
+            'duration': duration,
+            'duration_string': self.format_duration(duration),
+            'uploader': entry.get('uploader') or entry.get('channel') or 'Unknown Artist'
         }
 
+    def _extract_info(self, kind: str, url: str) -> Optional[Dict[str, Any]]:
+        """Run a yt-dlp extraction on a pooled extractor; called from worker threads"""
+        pool = self.ytdl_pools[kind]
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                self.logger.info(f"Searching for query: {query}")
-                info = await asyncio.to_thread(ydl.extract_info, f"ytsearch5:{query}", download=False)
-                if not info or 'entries' not in info:
-                    self.logger.error("No search results found or invalid response format")
-                    return []
-
-                results = []
-                for entry in info['entries'][:5]:
-                    try:
-                        # Store URL in track info for effect switching
-                        url = entry.get('url', '') or entry.get('webpage_url', '')
-                        if not url:
-                            continue
+            ytdl = pool.get_nowait()
+        except queue.Empty:
+            ytdl = yt_dlp.YoutubeDL(YTDL_SEARCH_OPTIONS if kind == 'search' else YTDL_STREAM_OPTIONS)
+        try:
+            return ytdl.extract_info(url, download=False)
+        finally:
+            pool.put(ytdl)
 
-                        result = {
-                            'title': entry.get('title', 'Unknown Title'),
-                            'url': url,
-                            'webpage_url': entry.get('webpage_url', url),
-                            'thumbnail': entry.get('thumbnail', ''),
-                            'duration': int(entry.get('duration', 0)),
-                            'duration_string': self.format_duration(int(entry.get('duration', 0))),
-                            'uploader': entry.get('uploader', 'Unknown Artist')
-                        }
+    async def get_song_results(self, query: str) -> List[Dict[str, Any]]:
+        """Fast flat search for songs; stream URLs are resolved later with resolve_stream"""
+        cache_key = self.normalize_query(query)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            self.logger.info(f"Search cache hit for query: {query}")
+            return cached
 
+        try:
+            self.logger.info(f"Searching for query: {query}")
+            info = await asyncio.to_thread(self._extract_info, 'search', f"ytsearch5:{query}")
+            if not info or 'entries' not in info:
+                self.logger.error("No search results found or invalid response format")
+                return []
+
+            results = []
+            for entry in list(info['entries'])[:5]:
+                try:
+                    result = self._song_from_entry(entry)
+                    if result:
                         results.append(result)
 
-                    except Exception as e:
-                        self.logger.error(f"Error processing search result: {str(e)}")
-                        continue
+                except Exception as e:
+                    self.logger.error(f"Error processing search result: {str(e)}")
+                    continue
 
-                return results
+            if results:
+                self.search_cache.set(cache_key, results)
+            return results
 
         except Exception as e:
             self.logger.error(f"Error in song search: {str(e)}")
             return []
 
+    async def resolve_stream(self, song: Dict[str, Any], count: bool = True) -> Optional[Dict[str, Any]]:
+        """Resolve the playable stream URL for a search result
+
+        Results are cached per video until shortly before the signed URL
+        expires, and concurrent resolutions of the same video share one
+        extraction (so a speculative prefetch is reused by the real play).
+        Prefetches pass count=False to stay out of the audio cache stats.
+        """
+        # Mood titles may be queued before their search has run
+        if 'mood' in song:
+            song = await self.get_mood_song(song['mood'], song['mood_index'])
+            if not song:
+                return None
+
+        # A locally cached copy needs neither yt-dlp nor a remote stream
+        local_path = self.audio_cache.get(song.get('id'), count=count)
+        if local_path:
+            return {**song, 'url': local_path, 'acodec': 'opus', 'local': True}
+
+        key = song.get('id') or song['webpage_url']
+        cached = self.stream_cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self.pending_resolutions.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._extract_stream(song))
+            self.pending_resolutions[key] = pending
+            pending.add_done_callback(lambda _: self.pending_resolutions.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _extract_stream(self, song: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run the full yt-dlp extraction for a single video"""
+        try:
+            info = await asyncio.to_thread(self._extract_info, 'stream', song['webpage_url'])
+            if not info or not info.get('url'):
+                self.logger.error(f"No stream URL found for {song['webpage_url']}")
+                return None
+
+            resolved = {**song, **{k: v for k, v in (self._song_from_entry(info) or {}).items() if v}}
+            resolved['url'] = info['url']
+            resolved['acodec'] = info.get('acodec')
+
+            key = song.get('id') or song['webpage_url']
+            expiry = self.stream_expiry(info['url'])
+            if expiry:
+                self.stream_cache.set(key, resolved, expires_at=expiry - STREAM_EXPIRY_MARGIN)
+            else:
+                self.stream_cache.set(key, resolved)
+            return resolved
+
+        except Exception as e:
+            self.logger.error(f"Error resolving stream for {song.get('title')}: {str(e)}")
+            return None
+
+    def prefetch_stream(self, song: Dict[str, Any]):
+        """Speculatively resolve a likely pick in the background"""
+        task = asyncio.create_task(self.resolve_stream(song, count=False))
+        task.add_done_callback(lambda t: t.exception() if not t.cancelled() else None)
+
     @commands.command(name='play')
     async def play(self, ctx, *, query: str):
         """Play a song with selection menu"""
@@ -350,66 +765,34 @@ class MusicCommands(commands.Cog):
             await ctx.send("❌ You need to be in a voice channel first!")
             return
 
-        # Join voice channel if not already joined
-        if ctx.guild.id not in self.voice_clients:
+        # Start searching right away; joining the channel happens in parallel
+        search_task = asyncio.create_task(self.get_song_results(query))
+        loading_msg = await ctx.send(f"🔍 **Searching for:** `{query}`")
+        status = CoalescedEditor(loading_msg)
+
+        # Join voice channel unless a healthy connection already exists
+        voice_client = self.voice_clients.get(ctx.guild.id)
+        if not (voice_client and voice_client.is_connected()):
+            status.update(content=f"🔍 **Searching for:** `{query}`\n🔊 Joining your voice channel...")
             channel = ctx.author.voice.channel
             try:
-                voice_client = await channel.connect()
-                self.voice_clients[ctx.guild.id] = voice_client
+                await self.voice_sessions.connect(channel)
             except Exception as e:
                 self.logger.error(f"Error joining voice channel: {e}")
-                await ctx.send("❌ Could not join the voice channel.")
+                search_task.cancel()
+                await status.finish(content="❌ Could not join the voice channel.")
                 return
 
-        # Create initial search message with loading animation
-        search_time = round(3.0 + random.uniform(0.1, 1.5), 1)  # Random time between 3-4.5s
-        loading_msg = await ctx.send(
-            f"🔍 **Finding the perfect match for:** `{query}`\n"
-            f"⏳ Estimated Time: `{search_time}s`\n"
-            "⬜⬜⬜⬜⬜⬜⬜⬜⬜⬜  0%"
-        )
-
-        # Loading bar segments and their corresponding percentages
-        loading_segments = [
-            ("🟦⬜⬜⬜⬜⬜⬜⬜⬜⬜", "10%"),
-            ("🟦🟦⬜⬜⬜⬜⬜⬜⬜⬜", "20%"),
-            ("🟦🟦🟦⬜⬜⬜⬜⬜⬜⬜", "30%"),
-            ("🟦🟦🟦🟦⬜⬜⬜⬜⬜⬜", "40%"),
-            ("🟦🟦🟦🟦🟦⬜⬜⬜⬜⬜", "50%"),
-            ("🟦🟦🟦🟦🟦🟦⬜⬜⬜⬜", "60%"),
-            ("🟦🟦🟦🟦🟦🟦🟦⬜⬜⬜", "70%"),
-            ("🟦🟦🟦🟦🟦🟦🟦🟦⬜⬜", "80%"),
-            ("🟦🟦🟦🟦🟦🟦🟦🟦🟦⬜", "90%")
-        ]
-
-        # Animate loading bar while searching
-        search_task = asyncio.create_task(self.get_song_results(query))
-
-        for bar, percentage in loading_segments:
-            try:
-                await loading_msg.edit(
-                    content=f"🔍 **Finding the perfect match for:** `{query}`\n"
-                           f"⏳ Estimated Time: `{search_time}s`\n"
-                           f"{bar}  {percentage}"
-                )
-                await asyncio.sleep(search_time / 10)  # Divide total time into 10 segments
-            except discord.errors.NotFound:
-                break  # Message was deleted
+            if not search_task.done():
+                status.update(content=f"🔍 **Searching for:** `{query}`\n✅ Joined {channel.mention}")
 
         # Get search results
         results = await search_task
 
         if not results:
-            await loading_msg.edit(content="❌ No songs found!")
+            await status.finish(content="❌ No songs found!")
             return
 
-        # Show completion message
-        await loading_msg.edit(
-            content=f"✅ **Match Found! Loading songs...** `100%`\n"
-                   f"🟦🟦🟦🟦🟦🟦🟦🟦🟦🟦  100%"
-        )
-        await asyncio.sleep(0.5)  # Brief pause to show completion
-
         # Create selection menu
         async def select_callback(interaction: discord.Interaction, song: Dict[str, Any]):
             if interaction.user.id != ctx.author.id:
@@ -419,6 +802,43 @@ class MusicCommands(commands.Cog):
             await interaction.response.defer()
 
             try:
+                # Add audio filter if specified in the query
+                filter_keywords = ['bassboost', '8d', 'nightcore', 'slowand_reverb']
+                applied_filter = next((f for f in filter_keywords if f in query.lower()), None)
+
+                # Something is already playing: queue the flat result, it is resolved when next up
+                if self.is_busy(ctx.guild.id):
+                    position = self.enqueue(ctx, song, applied_filter)
+                    if not position:
+                        await loading_msg.edit(content="❌ The queue is full!", embed=None, view=None)
+                        return
+
+                    queue_embed = discord.Embed(
+                        title="✅ Song Added to Queue",
+                        description=f"**{song['title']}**\nBy: {song['uploader']}",
+                        color=discord.Color.green()
+                    )
+                    queue_embed.add_field(name="Position", value=f"`#{position}`", inline=True)
+                    if song['thumbnail']:
+                        queue_embed.set_thumbnail(url=song['thumbnail'])
+                    await loading_msg.edit(content=None, embed=queue_embed, view=None)
+                    return
+
+                # Search results are flat; resolve the stream for the chosen song only
+                song = await self.resolve_stream(song)
+                if not song:
+                    await loading_msg.edit(content="❌ Could not load that song. Please try another.", embed=None, view=None)
+                    return
+
+                # Another request may have started playing while we were resolving
+                if self.is_busy(ctx.guild.id):
+                    position = self.enqueue(ctx, song, applied_filter)
+                    if not position:
+                        await loading_msg.edit(content="❌ The queue is full!", embed=None, view=None)
+                        return
+                    await loading_msg.edit(content=f"✅ Added **{song['title']}** to the queue at position {position}", embed=None, view=None)
+                    return
+
                 # Create embedded message for queue addition
                 queue_embed = discord.Embed(
                     title="✅ Song Added to Queue",
@@ -429,106 +849,337 @@ class MusicCommands(commands.Cog):
                     queue_embed.set_thumbnail(url=song['thumbnail'])
                 await loading_msg.edit(content=None, embed=queue_embed, view=None)
 
-                # Play the song
-                voice_client = self.voice_clients[ctx.guild.id]
+                await self.start_track(ctx, song, applied_filter)
 
-                # Setup FFmpeg options with filter if specified
-                ffmpeg_options = {
-                    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-                    'options': '-vn'
-                }
+            except Exception as e:
+                self.logger.error(f"Error playing song: {e}")
+                await ctx.send("❌ An error occurred while playing the song.")
 
-                # Add audio filter if specified in the query
-                filter_keywords = ['bassboost', '8d', 'nightcore', 'slowand_reverb']
-                applied_filter = next((f for f in filter_keywords if f in query.lower()), None)
-                if applied_filter and applied_filter in self.audio_filters:
-                    ffmpeg_options['options'] = f'-vn -af {self.audio_filters[applied_filter]}'
-                    self.logger.info(f"Applying audio filter: {applied_filter} with options: {ffmpeg_options['options']}")
+        # The top result is the most likely pick, so start resolving it now
+        self.prefetch_stream(results[0])
 
-                # Create audio source
-                try:
-                    self.logger.info(f"Creating audio source with URL: {song['url']}")
-                    audio_source = discord.FFmpegPCMAudio(song['url'], **ffmpeg_options)
-                    voice_client.play(
-                        discord.PCMVolumeTransformer(audio_source, volume=self.volume),
-                        after=lambda e: asyncio.run_coroutine_threadsafe(
-                            self.song_finished(ctx.guild.id, e), self.bot.loop
-                        ) if e else None
-                    )
-                    self.logger.info("Successfully started playing audio")
-                except Exception as e:
-                    self.logger.error(f"Error creating audio source: {e}")
-                    raise
-
-                # Save current track info
-                start_time = asyncio.get_event_loop().time()
-                self.current_tracks[ctx.guild.id] = {
-                    'title': song['title'],
-                    'duration': song['duration'],
-                    'thumbnail': song['thumbnail'],
-                    'uploader': song['uploader'],
-                    'requester': ctx.author,
-                    'start_time': start_time,
-                    'url': song['url']
-                }
+        # Create and send selection menu as soon as results are in
+        select_view = View()
+        select_view.add_item(SongSelect(results, select_callback))
+        await status.finish(content="Please select a song to play:", view=select_view)
+
+    def get_queue(self, guild_id: int) -> GuildQueue:
+        """Return the guild's queue, creating it on first use"""
+        if guild_id not in self.queues:
+            self.queues[guild_id] = GuildQueue()
+        return self.queues[guild_id]
+
+    def get_player(self, guild_id: int) -> PlayerState:
+        """Return the guild's volume/filter/loop settings, creating them on first use"""
+        if guild_id not in self.players:
+            self.players[guild_id] = PlayerState()
+        return self.players[guild_id]
+
+    def is_busy(self, guild_id: int) -> bool:
+        """Whether a track is playing, paused or about to start in this guild"""
+        voice_client = self.voice_clients.get(guild_id)
+        if guild_id in self.current_tracks:
+            return True
+        return bool(voice_client and (voice_client.is_playing() or voice_client.is_paused()))
+
+    def enqueue(self, ctx, song: Dict[str, Any], applied_filter: Optional[str] = None) -> int:
+        """Queue a song behind the current one and return its position (0 if full)"""
+        position = self.get_queue(ctx.guild.id).add({'song': song, 'ctx': ctx, 'filter': applied_filter})
+        if position == 1:
+            # It plays next, so resolve its stream while the current track runs
+            self.prefetch_stream(song)
+        return position
+
+    def enqueue_mood(self, ctx, mood: str, indexes: List[int]) -> int:
+        """Queue mood titles without searching for them and return how many were added"""
+        guild_queue = self.get_queue(ctx.guild.id)
+        plays_next = not guild_queue
+        queued = guild_queue.extend(
+            {'song': self.queued_mood_song(mood, index), 'ctx': ctx, 'filter': None}
+            for index in indexes
+        )
+        if plays_next and queued:
+            self.prefetch_stream(guild_queue.peek()['song'])
+        return queued
+
+    @staticmethod
+    def _input_options(track: Dict[str, Any]) -> str:
+        """FFmpeg input options for a track; reconnect flags only apply to remote streams"""
+        return '' if track.get('local') else FFMPEG_RECONNECT_OPTIONS
+
+    def _open_spool(self, track: Dict[str, Any], start: float = 0.0) -> Optional[AudioSpool]:
+        """Start decoding a track into a local spool, or None to stream directly"""
+        if AUDIO_SPOOL_SECONDS <= 0:
+            return None
+        try:
+            return AudioSpool(track['url'], self._input_options(track), AUDIO_SPOOL_SECONDS, AUDIO_SPOOL_REWIND_SECONDS, start)
+        except Exception as e:
+            self.logger.error(f"Could not start audio spool, streaming directly: {str(e)}")
+            return None
 
-                # Create Now Playing embed
-                playing_embed = discord.Embed(
-                    title="🎵 Now Playing",
-                    description=f"**{song['title']}**\nArtist: **{song['uploader']}**",
-                    color=discord.Color.blue()
-                )
+    async def _close_spool(self, track: Optional[Dict[str, Any]]):
+        """Release a track's spool once it can no longer be played"""
+        spool = track.pop('spool', None) if track else None
+        if spool:
+            await asyncio.to_thread(spool.close)
+
+    def _filter_chain(self, player: PlayerState) -> Optional[str]:
+        """FFmpeg filter graph for the guild's effect and volume, or None if untouched"""
+        parts = []
+        if player.filter in self.audio_filters:
+            parts.append(self.audio_filters[player.filter])
+        if player.volume != 1.0:
+            # Applied by FFmpeg instead of multiplying every frame in Python
+            parts.append(f'volume={player.volume:.2f}')
+        return ','.join(parts) or None
+
+    async def _open_track_source(
+        self, guild_id: int, track: Dict[str, Any], position: float
+    ) -> Tuple[TrackedSource, Optional[AudioSpool]]:
+        """Build a source for the track at a position using the guild's player settings
+
+        Spooled audio is preferred when it covers the position, since it needs
+        no network round trip. Otherwise an unfiltered track at full volume is
+        streamed as Opus while a new spool fills in the background for later
+        restarts, and anything needing PCM plays from a new spool directly.
+        Returns the source and the spool the track should keep; the track
+        itself is left untouched because its playing source may still be
+        reading the current spool (see _install_source).
+        """
+        player = self.get_player(guild_id)
+        audio_filter = self._filter_chain(player)
+        speed = FILTER_SPEEDS.get(player.filter, 1.0)
+        spool = track.get('spool')
+        if spool and spool.has(int(position * BYTES_PER_SECOND)):
+            return TrackedSource(open_spool_source(spool, position, audio_filter), position, speed), spool
+
+        before_options = self._input_options(track)
+        if position:
+            before_options = f'{before_options} -ss {position:.2f}'.strip()
+        if OPUS_PASSTHROUGH and not audio_filter:
+            # Copy Opus packets as-is; other codecs are encoded by FFmpeg, not in Python
+            source = discord.FFmpegOpusAudio(
+                track['url'],
+                codec='opus' if track.get('acodec') == 'opus' else None,
+                before_options=before_options,
+                options='-vn'
+            )
+            # Nothing waits on this spool; it follows the playhead so later
+            # seeks, volume and effect changes are served locally
+            new_spool = self._open_spool(track, position)
+            return TrackedSource(source, position, follow=new_spool), new_spool
+
+        # PCM is needed: spool from here so later seeks and switches stay local
+        new_spool = self._open_spool(track, position)
+        if new_spool:
+            try:
+                ready = await asyncio.to_thread(new_spool.wait_for, new_spool.base + AUDIO_SPOOL_PREBUFFER)
+                if ready and new_spool.written > new_spool.base:
+                    return TrackedSource(open_spool_source(new_spool, position, audio_filter), position, speed), new_spool
+            except Exception:
+                await asyncio.to_thread(new_spool.close)
+                raise
+            # The decoder produced nothing in time; stream directly instead
+            self.logger.warning(f"Audio spool did not prebuffer, streaming directly: {track['title']}")
+            await asyncio.to_thread(new_spool.close)
 
-                if song['thumbnail']:
-                    playing_embed.set_thumbnail(url=song['thumbnail'])
+        ffmpeg_options = {
+            'before_options': before_options,
+            'options': f'-vn -af {audio_filter}' if audio_filter else '-vn'
+        }
+        return TrackedSource(discord.FFmpegPCMAudio(track['url'], **ffmpeg_options), position, speed), None
 
-                progress_bar = self.create_progress_bar(0, song['duration'])
-                playing_embed.add_field(
-                    name="Progress",
-                    value=f"{progress_bar}\nTime: `00:00 / {song['duration_string']}`\nDuration: `{song['duration_string']}`",
-                    inline=False
-                )
+    async def _install_source(self, guild_id: int, track: Dict[str, Any], source: TrackedSource, spool: Optional[AudioSpool]):
+        """Swap in a new source, then release the spool the old one was reading"""
+        old_spool = track.get('spool')
+        if spool:
+            track['spool'] = spool
+        else:
+            track.pop('spool', None)
+
+        # The replaced source's end must not advance the queue
+        self.play_tokens.pop(guild_id, None)
+        self.voice_clients[guild_id].stop()
+        self._play_source(guild_id, source)
+
+        if old_spool and old_spool is not spool:
+            await asyncio.to_thread(old_spool.close)
+
+    def _play_source(self, guild_id: int, source: TrackedSource):
+        """Play a source; when it ends the queue advances unless it was replaced"""
+        token = object()
+        self.play_tokens[guild_id] = token
+        self.current_tracks[guild_id]['source'] = source
+        self.voice_clients[guild_id].play(
+            source,
+            after=lambda e: asyncio.run_coroutine_threadsafe(
+                self.song_finished(guild_id, e, token), self.bot.loop
+            )
+        )
 
-                playing_embed.add_field(
-                    name="Requested by",
-                    value=ctx.author.mention,
-                    inline=False
-                )
+    async def _restart_at(self, guild_id: int, position: float, paused: Optional[bool] = None):
+        """Replace the playing source at a position, e.g. after a settings change"""
+        track = self.current_tracks[guild_id]
+        if paused is None:
+            paused = self.voice_clients[guild_id].is_paused()
+
+        source, spool = await self._open_track_source(guild_id, track, position)
+        if self.current_tracks.get(guild_id) is not track or guild_id not in self.voice_clients:
+            # The track ended or the session closed while the new source was prepared
+            source.cleanup()
+            if spool and spool is not track.get('spool'):
+                await asyncio.to_thread(spool.close)
+            return
 
-                # Send and start progress updates
-                now_playing_msg = await ctx.send(embed=playing_embed)
+        await self._install_source(guild_id, track, source, spool)
+        if paused:
+            self.voice_clients[guild_id].pause()
+
+        # Keep the clock-based fallback position in step
+        track['start_time'] = asyncio.get_event_loop().time() - position
+
+    async def start_track(
+        self,
+        ctx,
+        song: Dict[str, Any],
+        applied_filter: Optional[str] = None,
+        title: str = "🎵 Now Playing",
+        description: Optional[str] = None
+    ) -> discord.Message:
+        """Play a resolved song now, announce it and prefetch the next queued track"""
+        guild_id = ctx.guild.id
 
-                # Cancel existing progress update task if any
-                if ctx.guild.id in self.progress_update_tasks:
-                    self.progress_update_tasks[ctx.guild.id].cancel()
+        # A filter named in the request becomes the guild's active effect
+        if applied_filter and applied_filter in self.audio_filters:
+            self.get_player(guild_id).filter = applied_filter
+            self.logger.info(f"Applying audio filter: {applied_filter}")
+
+        # Save current track info
+        track = {
+            'title': song['title'],
+            'duration': song['duration'],
+            'thumbnail': song['thumbnail'],
+            'uploader': song['uploader'],
+            'requester': ctx.author,
+            'start_time': asyncio.get_event_loop().time(),
+            'url': song['url'],
+            'acodec': song.get('acodec'),
+            'local': song.get('local', False),
+            'song': song,
+            'ctx': ctx
+        }
+        await self._close_spool(self.current_tracks.get(guild_id))
+        self.current_tracks[guild_id] = track
 
-                # Start new progress update task
-                update_task = asyncio.create_task(
-                    self.update_progress(ctx, now_playing_msg.id, self.current_tracks[ctx.guild.id])
-                )
-                self.progress_update_tasks[ctx.guild.id] = update_task
+        try:
+            self.logger.info(f"Creating audio source with URL: {song['url']}")
+            source, spool = await self._open_track_source(guild_id, track, 0)
+            await self._install_source(guild_id, track, source, spool)
+        except Exception:
+            self.current_tracks.pop(guild_id, None)
+            await self._close_spool(track)
+            raise
+        track['start_time'] = asyncio.get_event_loop().time()
+        self.logger.info("Successfully started playing audio")
+
+        # Create Now Playing embed
+        playing_embed = discord.Embed(
+            title=title,
+            description=description or f"**{song['title']}**\nArtist: **{song['uploader']}**",
+            color=discord.Color.blue()
+        )
 
-            except Exception as e:
-                self.logger.error(f"Error playing song: {e}")
-                await ctx.send("❌ An error occurred while playing the song.")
+        if song['thumbnail']:
+            playing_embed.set_thumbnail(url=song['thumbnail'])
 
-        # Create and send selection menu
-        select_view = View()
-        select_view.add_item(SongSelect(results, select_callback))
-        await loading_msg.edit(content="Please select a song to play:", view=select_view)
+        playing_embed.add_field(
+            name="Progress",
+            value=self.render_progress(0, song['duration'])[1],
+            inline=False
+        )
 
-    async def song_finished(self, guild_id: int, error):
-        """Handle song finish event"""
+        playing_embed.add_field(
+            name="Requested by",
+            value=ctx.author.mention,
+            inline=False
+        )
+
+        # Send and hand the message to the progress scheduler
+        now_playing_msg = await ctx.send(embed=playing_embed)
+        self.drop_now_playing(guild_id)
+        self.track_now_playing(guild_id, now_playing_msg, playing_embed)
+
+        # Resolve the next track now so the transition does not wait on yt-dlp
+        next_entry = self.get_queue(guild_id).peek()
+        if next_entry:
+            self.prefetch_stream(next_entry['song'])
+
+        return now_playing_msg
+
+    async def song_finished(self, guild_id: int, error, token=None):
+        """Handle song finish event and advance the queue"""
         if error:
             self.logger.error(f"Error playing song: {error}")
 
-        # Cancel progress update task
-        if guild_id in self.progress_update_tasks:
-            self.progress_update_tasks[guild_id].cancel()
-            del self.progress_update_tasks[guild_id]
+        # Seeking, effects and !stop replace or drop the source; only the live one advances
+        if token is None or self.play_tokens.get(guild_id) is not token:
+            return
+        del self.play_tokens[guild_id]
 
-        if guild_id in self.current_tracks:
-            del self.current_tracks[guild_id]
+        track = self.current_tracks.get(guild_id)
+        if isinstance(error, SpoolStalled) and track:
+            # A stalled decoder is not the end of the track: reconnect where it stopped
+            position = self.exact_position(track)
+            await self._close_spool(track)
+            try:
+                await self._restart_at(guild_id, position, paused=bool(track.get('paused_at')))
+                return
+            except Exception as e:
+                self.logger.error(f"Error resuming stalled track: {e}")
+
+        self.finish_now_playing(guild_id)
+        await self._close_spool(track)
+
+        # Keep a local copy of tracks played to the end so a replay skips
+        # yt-dlp and the remote stream; downloading only now keeps the copy
+        # from competing with the first play for bandwidth
+        if track and not error and not track.get('skipped') and not track['local']:
+            song = track['song']
+            self.audio_cache.schedule(
+                song.get('id'), song['url'], song.get('acodec'), song['duration'], FFMPEG_RECONNECT_OPTIONS
+            )
+
+        # Loop modes put the finished track back: first in line, or at the end
+        loop_mode = self.get_player(guild_id).loop_mode
+        if track and not error and not track.get('skipped') and loop_mode != 'off':
+            entry = {'song': track['song'], 'ctx': track['ctx'], 'filter': None}
+            if loop_mode == 'track':
+                self.get_queue(guild_id).push_front(entry)
+            else:
+                self.get_queue(guild_id).add(entry)
+
+        await self.play_next(guild_id)
+
+    async def play_next(self, guild_id: int):
+        """Start the next queued track, skipping any that fail to load"""
+        queue = self.get_queue(guild_id)
+        while queue and guild_id in self.voice_clients:
+            entry = queue.pop_next()
+            ctx = entry['ctx']
+            song = await self.resolve_stream(entry['song'])
+            if not song:
+                await ctx.send(f"❌ Could not load **{entry['song']['title']}**, skipping.")
+                continue
+
+            try:
+                await self.start_track(ctx, song, entry['filter'])
+                return
+            except Exception as e:
+                self.logger.error(f"Error starting queued track: {e}")
+                await ctx.send(f"❌ Error playing **{song['title']}**, skipping.")
+
+        # current_tracks is kept until here so new requests queue up while we advance
+        await self._close_spool(self.current_tracks.pop(guild_id, None))
 
     @commands.command(name='pause')
     async def pause(self, ctx):
@@ -537,6 +1188,9 @@ class MusicCommands(commands.Cog):
             vc = self.voice_clients[ctx.guild.id]
             if vc.is_playing():
                 vc.pause()
+                track = self.current_tracks.get(ctx.guild.id)
+                if track:
+                    track['paused_at'] = asyncio.get_event_loop().time()
                 await ctx.send("⏸️ Paused the current song")
             else:
                 await ctx.send("❌ Nothing is playing!")
@@ -550,6 +1204,9 @@ class MusicCommands(commands.Cog):
             vc = self.voice_clients[ctx.guild.id]
             if vc.is_paused():
                 vc.resume()
+                track = self.current_tracks.get(ctx.guild.id)
+                if track and track.get('paused_at'):
+                    track['start_time'] += asyncio.get_event_loop().time() - track.pop('paused_at')
                 await ctx.send("▶️ Resumed the song")
             else:
                 await ctx.send("❌ Nothing is paused!")
@@ -561,7 +1218,12 @@ class MusicCommands(commands.Cog):
         """Stop playing and clear the queue"""
         if ctx.guild.id in self.voice_clients:
             vc = self.voice_clients[ctx.guild.id]
+            self.get_queue(ctx.guild.id).clear()
             if vc.is_playing() or vc.is_paused():
+                # Drop the live token first so stopping does not advance the queue
+                self.play_tokens.pop(ctx.guild.id, None)
+                await self._close_spool(self.current_tracks.pop(ctx.guild.id, None))
+                self.drop_now_playing(ctx.guild.id)
                 vc.stop()
                 await ctx.send("⏹️ Stopped playing")
             else:
@@ -569,6 +1231,75 @@ class MusicCommands(commands.Cog):
         else:
             await ctx.send("❌ I'm not in a voice channel!")
 
+    @commands.command(name='skip')
+    async def skip(self, ctx):
+        """Skip to the next song in the queue"""
+        vc = self.voice_clients.get(ctx.guild.id)
+        if not vc or not (vc.is_playing() or vc.is_paused()):
+            await ctx.send("❌ Nothing is playing!")
+            return
+
+        # Stopping the source fires song_finished, which starts the next track
+        track = self.current_tracks.get(ctx.guild.id)
+        if track:
+            track['skipped'] = True  # a skipped track is not repeated by !loop
+        vc.stop()
+        if self.get_queue(ctx.guild.id):
+            await ctx.send("⏭️ Skipped to the next song")
+        else:
+            await ctx.send("⏭️ Skipped. The queue is now empty")
+
+    @commands.command(name='queue')
+    async def show_queue(self, ctx):
+        """Show the current song and the upcoming queue"""
+        queue = self.get_queue(ctx.guild.id)
+        current = self.current_tracks.get(ctx.guild.id)
+        if not current and not queue:
+            await ctx.send("📭 The queue is empty!")
+            return
+
+        embed = discord.Embed(title="🎶 Music Queue", color=discord.Color.blue())
+        if current:
+            embed.add_field(
+                name="Now Playing",
+                value=f"**{current['title']}** - {current['uploader']}",
+                inline=False
+            )
+
+        if queue:
+            lines = [
+                f"`{i}.` {entry['song']['title'][:60]} `{entry['song']['duration_string']}` - {entry['ctx'].author.display_name}"
+                for i, entry in enumerate(queue, start=1)
+            ]
+            shown = lines[:10]
+            if len(lines) > len(shown):
+                shown.append(f"...and {len(lines) - len(shown)} more")
+            embed.add_field(name=f"Up Next ({len(queue)})", value="\n".join(shown), inline=False)
+
+        await ctx.send(embed=embed)
+
+    @commands.command(name='remove')
+    async def remove_from_queue(self, ctx, position: int):
+        """Remove a song from the queue by position"""
+        entry = self.get_queue(ctx.guild.id).remove(position)
+        if not entry:
+            await ctx.send("❌ There is no song at that position in the queue!")
+            return
+        await ctx.send(f"🗑️ Removed **{entry['song']['title']}** from the queue")
+
+    @commands.command(name='move')
+    async def move_in_queue(self, ctx, source: int, target: int):
+        """Move a song to a different position in the queue"""
+        queue = self.get_queue(ctx.guild.id)
+        entry = queue.move(source, target)
+        if not entry:
+            await ctx.send("❌ Please use positions shown in `!queue`!")
+            return
+
+        if target == 1:
+            self.prefetch_stream(entry['song'])
+        await ctx.send(f"↕️ Moved **{entry['song']['title']}** to position {target}")
+
     @commands.command(name='musichelp')
     async def music_help(self, ctx):
         """Show all music-related commands"""
@@ -588,8 +1319,13 @@ class MusicCommands(commands.Cog):
         `!play <song> slowand_reverb` - Play with slow + reverb effect
         `!pause` - Pause current song
         `!resume` - Resume paused song
-        `!stop` - Stop playing
+        `!stop` - Stop playing and clear the queue
+        `!skip` - Skip to the next queued song
+        `!queue` - Show the queue
+        `!remove <position>` - Remove a song from the queue
+        `!move <from> <to>` - Reorder the queue
         `!volume <0-200>` - Adjust volume
+        `!loop <off/track/queue>` - Repeat the song or the whole queue
         `!seek <forward/back> <seconds>` - Skip forward/backward in song
         `!normal` - Remove all audio effects
         """
@@ -737,51 +1473,51 @@ class MusicCommands(commands.Cog):
                 'Accept-Language': 'en-US,en;q=0.5'
             }
 
-            async with aiohttp.ClientSession() as session:
-                for url in urls:
-                    try:
-                        async with session.get(url, headers=headers, timeout=10) as response:
-                            if response.status != 200:
-                                self.logger.warning(f"Search failed for URL {url}: {response.status}")
-                                continue
-
-                            html = await response.text()
-                            if "Please enable cookies" in html or "Access denied" in html:
-                                self.logger.warning(f"Access restricted for {url}")
-                                continue
-
-                            soup = BeautifulSoup(html, 'html.parser')
-                    except Exception as e:
-                        self.logger.error(f"Error accessing URL {url}: {e}")
-                        continue
-
-                    # Search for song results
-                    results = soup.find_all('td', class_='text-left visitedlyr')
-
-                    if not results:
-                        self.logger.info(f"No results found for query: {query}")
-                        return None
-
-                    # Get the first result
-                    result = results[0]
-                    song_link = result.find('a')
-                    if not song_link:
-                        return None
-
-                    # Extract song info
-                    title = song_link.get_text(strip=True)
-                    artist = result.find_all('b')[-1].get_text(strip=True) if result.find_all('b') else "Unknown Artist"
-                    url = song_link.get('href', '')
+            session = self.bot.http_session
+            for url in urls:
+                try:
+                    async with session.get(url, headers=headers, timeout=10) as response:
+                        if response.status != 200:
+                            self.logger.warning(f"Search failed for URL {url}: {response.status}")
+                            continue
 
-                    self.logger.info(f"Found song: {title} by {artist}")
+                        html = await response.text()
+                        if "Please enable cookies" in html or "Access denied" in html:
+                            self.logger.warning(f"Access restricted for {url}")
+                            continue
 
-                    return {
-                        'title': title,
-                        'artist': artist,
-                        'url': url,
-                        'source': 'AZLyrics',
-                        'query': query
-                    }
+                        soup = BeautifulSoup(html, 'html.parser')
+                except Exception as e:
+                    self.logger.error(f"Error accessing URL {url}: {e}")
+                    continue
+
+                # Search for song results
+                results = soup.find_all('td', class_='text-left visitedlyr')
+
+                if not results:
+                    self.logger.info(f"No results found for query: {query}")
+                    return None
+
+                # Get the first result
+                result = results[0]
+                song_link = result.find('a')
+                if not song_link:
+                    return None
+
+                # Extract song info
+                title = song_link.get_text(strip=True)
+                artist = result.find_all('b')[-1].get_text(strip=True) if result.find_all('b') else "Unknown Artist"
+                url = song_link.get('href', '')
+
+                self.logger.info(f"Found song: {title} by {artist}")
+
+                return {
+                    'title': title,
+                    'artist': artist,
+                    'url': url,
+                    'source': 'AZLyrics',
+                    'query': query
+                }
 
         except aiohttp.ClientError as e:
             self.logger.error(f"Network error in song search: {str(e)}")
@@ -801,12 +1537,112 @@ class MusicCommands(commands.Cog):
             await ctx.send("❌ Please provide a volume between 0 and 200!")
             return
 
-        self.volume = vol / 100
-        if ctx.voice_client.source:
-            ctx.voice_client.source.volume = self.volume
+        player = self.get_player(ctx.guild.id)
+        if player.volume == vol / 100:
+            await ctx.send(f"🔊 Volume is already {vol}%")
+            return
+        player.volume = vol / 100
+
+        # Volume lives in the FFmpeg filter graph, so the source is restarted in
+        # place; repeated changes push the restart back so only the last applies
+        track = self.current_tracks.get(ctx.guild.id)
+        if track and track.get('source') and (ctx.voice_client.is_playing() or ctx.voice_client.is_paused()):
+            pending = self.volume_restarts.pop(ctx.guild.id, None)
+            if pending:
+                pending.cancel()
+            self.volume_restarts[ctx.guild.id] = asyncio.create_task(self._apply_volume(ctx, track))
 
         await ctx.send(f"🔊 Volume set to {vol}%")
 
+    async def _apply_volume(self, ctx, track: Dict[str, Any]):
+        """Restart the track with the guild's volume once changes have settled"""
+        guild_id = ctx.guild.id
+        await asyncio.sleep(VOLUME_RESTART_DELAY)
+        # From here on a newer change schedules its own restart instead of cancelling this one
+        if self.volume_restarts.get(guild_id) is asyncio.current_task():
+            del self.volume_restarts[guild_id]
+        if self.current_tracks.get(guild_id) is not track or guild_id not in self.voice_clients:
+            return
+
+        try:
+            await self._restart_at(guild_id, self.exact_position(track))
+        except Exception as e:
+            self.logger.error(f"Error applying volume change: {e}")
+            await ctx.send("❌ An error occurred while changing the volume!")
+
+    @commands.command(name='loop')
+    async def loop(self, ctx, mode: Optional[str] = None):
+        """Set the loop mode: off, track or queue"""
+        player = self.get_player(ctx.guild.id)
+        if mode is None:
+            await ctx.send(f"🔁 Loop mode is `{player.loop_mode}`. Use `!loop off|track|queue` to change it.")
+            return
+
+        mode = mode.lower()
+        if mode not in LOOP_MODES:
+            await ctx.send("❌ Please choose `off`, `track` or `queue`!")
+            return
+
+        player.loop_mode = mode
+        await ctx.send(f"🔁 Loop mode set to `{mode}`")
+
+    @commands.command(name='audiostats')
+    @commands.has_permissions(administrator=True)
+    async def audio_stats(self, ctx):
+        """Show playback paths in use and bot CPU usage per stream"""
+        opus_streams = pcm_streams = spooled = 0
+        for track in self.current_tracks.values():
+            source = track.get('source')
+            if source is None:
+                continue
+            if source.is_opus():
+                opus_streams += 1
+            else:
+                pcm_streams += 1
+            if track.get('spool'):
+                spooled += 1
+
+        # CPU of the bot process since the previous call; Python-side Opus
+        # encoding for PCM streams is counted here, FFmpeg children are not
+        now, cpu = time.monotonic(), time.process_time()
+        last_wall, last_cpu = self.cpu_sample
+        self.cpu_sample = (now, cpu)
+        cpu_percent = 100 * (cpu - last_cpu) / max(now - last_wall, 1e-6)
+        streams = opus_streams + pcm_streams
+
+        embed = discord.Embed(title="🎛️ Audio Stats", color=discord.Color.blue())
+        embed.add_field(
+            name="Streams",
+            value=f"Opus passthrough: `{opus_streams}`\nPCM: `{pcm_streams}`\nSpooled: `{spooled}`",
+            inline=True
+        )
+        embed.add_field(
+            name="CPU (since last check)",
+            value=f"Total: `{cpu_percent:.1f}%`\n"
+                  f"Per stream: `{cpu_percent / streams:.2f}%`" if streams else f"Total: `{cpu_percent:.1f}%`",
+            inline=True
+        )
+        cache = self.audio_cache.get_stats()
+        embed.add_field(
+            name="Audio Cache",
+            value=f"Tracks: `{cache['entries']}` • `{cache['size_mb']}/{cache['max_mb']} MB`\n"
+                  f"Hits: `{cache['hits']}` • Misses: `{cache['misses']}`\n"
+                  f"Stored: `{cache['stored']}` • Evicted: `{cache['evicted']}` • Downloading: `{cache['downloading']}`",
+            inline=False
+        )
+
+        voice = self.voice_sessions.get_counts()
+        embed.add_field(
+            name="Voice Sessions",
+            value=f"Live: `{voice['live']}` (playing `{voice['playing']}`, idle `{voice['idle']}`)\n"
+                  f"Unhealthy: `{voice['unhealthy']}`\n"
+                  f"Connects: `{voice['connects']}` • Reconnects: `{voice['reconnects']}`\n"
+                  f"Idle disconnects: `{voice['idle_disconnects']}` • Dropped: `{voice['dropped']}`",
+            inline=False
+        )
+        embed.set_footer(text=f"Opus passthrough {'enabled' if OPUS_PASSTHROUGH else 'disabled'} • window {now - last_wall:.0f}s")
+        await ctx.send(embed=embed)
+
     @commands.command(name='seek')
     async def seek(self, ctx, direction: str, seconds: int):
         """Seek forward/backward in the current song"""
@@ -828,7 +1664,7 @@ class MusicCommands(commands.Cog):
             return
 
         current_track = self.current_tracks[guild_id]
-        current_position = int(asyncio.get_event_loop().time() - current_track['start_time'])
+        current_position = self.exact_position(current_track)
 
         if direction == 'forward':
             new_position = current_position + seconds
@@ -839,28 +1675,9 @@ class MusicCommands(commands.Cog):
             await ctx.send("❌ Cannot seek beyond the end of the track!")
             return
 
-        # Stop current playback
-        ctx.voice_client.stop()
-
-        # Setup FFmpeg options with timestamp
-        ffmpeg_options = {
-            'before_options': f'-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -ss {new_position}',
-            'options': '-vn'
-        }
-
-        # Create new audio source and play
+        # Serve from the local spool when it holds the target position
         try:
-            audio_source = discord.FFmpegPCMAudio(current_track['url'], **ffmpeg_options)
-            ctx.voice_client.play(
-                discord.PCMVolumeTransformer(audio_source, volume=self.volume),
-                after=lambda e: asyncio.run_coroutine_threadsafe(
-                    self.song_finished(ctx.guild.id, e), self.bot.loop
-                ) if e else None
-            )
-
-            # Update start time to account for seeking
-            self.current_tracks[guild_id]['start_time'] = asyncio.get_event_loop().time() - new_position
-
+            await self._restart_at(guild_id, new_position)
             await ctx.send(f"⏩ Seeked {direction} by {seconds} seconds!")
 
         except Exception as e:
@@ -904,32 +1721,17 @@ class MusicCommands(commands.Cog):
             return
 
         current_track = self.current_tracks[guild_id]
-        current_position = int(asyncio.get_event_loop().time() - current_track['start_time'])
-
-        # Stop current playback
-        ctx.voice_client.stop()
-
-        # Setup FFmpeg options with timestamp and effect
-        ffmpeg_options = {
-            'before_options': f'-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5 -ss {current_position}',
-            'options': '-vn'
-        }
+        current_position = self.exact_position(current_track)
 
-        if effect and effect in self.audio_filters:
-            ffmpeg_options['options'] = f"-vn -af {self.audio_filters[effect]}"
-
-        # Create new audio source and play
+        # Re-read the spooled audio through the new filter from the same position
         try:
-            audio_source = discord.FFmpegPCMAudio(current_track['url'], **ffmpeg_options)
-            ctx.voice_client.play(
-                discord.PCMVolumeTransformer(audio_source, volume=self.volume),
-                after=lambda e: asyncio.run_coroutine_threadsafe(
-                    self.song_finished(ctx.guild.id, e), self.bot.loop
-                ) if e else None
-            )
-
-            # Update start time to maintain progress
-            self.current_tracks[guild_id]['start_time'] = asyncio.get_event_loop().time() - current_position
+            player = self.get_player(guild_id)
+            previous_filter, player.filter = player.filter, effect
+            try:
+                await self._restart_at(guild_id, current_position)
+            except Exception:
+                player.filter = previous_filter
+                raise
 
             if effect:
                 await ctx.send(f"🎵 Applied {effect} effect!")
@@ -957,32 +1759,32 @@ class MusicCommands(commands.Cog):
                 'Accept': 'application/json'
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(test_url, params=params, headers=headers, timeout=10) as response:
-                    response_text = await response.text()
-                    self.logger.info(f"API Test Response: {response_text[:200]}...")  # Log first 200 chars
+            session = self.bot.http_session
+            async with session.get(test_url, params=params, headers=headers, timeout=10) as response:
+                response_text = await response.text()
+                self.logger.info(f"API Test Response: {response_text[:200]}...")  # Log first 200 chars
 
-                    if response.status != 200:
-                        self.logger.error(f"API test failed with status {response.status}")
-                        return False
+                if response.status != 200:
+                    self.logger.error(f"API test failed with status {response.status}")
+                    return False
 
-                    try:
-                        data = json.loads(response_text)
-                        status_code = data['message']['header']['status_code']
+                try:
+                    data = json.loads(response_text)
+                    status_code = data['message']['header']['status_code']
 
-                        if status_code != 200:
-                            self.logger.error(f"API test failed with code {status_code}")
-                            return False
+                    if status_code != 200:
+                        self.logger.error(f"API test failed with code {status_code}")
+                        return False
 
-                        self.logger.info("API test successful!")
-                        return True
+                    self.logger.info("API test successful!")
+                    return True
 
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"Failed to parse API response: {str(e)}")
-                        return False
-                    except KeyError as e:
-                        self.logger.error(f"Unexpected API response format: {str(e)}")
-                        return False
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Failed to parse API response: {str(e)}")
+                    return False
+                except KeyError as e:
+                    self.logger.error(f"Unexpected API response format: {str(e)}")
+                    return False
 
         except aiohttp.ClientError as e:
             self.logger.error(f"Network error during API test: {str(e)}")
@@ -1102,93 +1904,52 @@ class MusicCommands(commands.Cog):
         loading_msg = await ctx.send(f"{emoji} Finding the perfect **{mood}** song for you...")
 
         try:
-            # Join voice channel if not already joined
-            if ctx.guild.id not in self.voice_clients:
-                try:
-                    voice_client = await ctx.author.voice.channel.connect()
-                    self.voice_clients[ctx.guild.id] = voice_client
-                except Exception as e:
-                    self.logger.error(f"Error joining voice channel: {e}")
-                    await loading_msg.edit(content="❌ Could not join the voice channel.")
-                    return
+            # Join voice channel, replacing a stale connection if needed
+            try:
+                await self.voice_sessions.connect(ctx.author.voice.channel)
+            except Exception as e:
+                self.logger.error(f"Error joining voice channel: {e}")
+                await loading_msg.edit(content="❌ Could not join the voice channel.")
+                return
 
-            # Select and get random song
-            playlist = self.mood_playlists[mood]
-            song_choice = random.choice(playlist)
+            # Play the mood list in a random order: one song now, the rest queued.
+            # Queued titles are only searched and resolved when they come up
+            order = random.sample(range(len(self.mood_playlists[mood])), len(self.mood_playlists[mood]))
+            if self.is_busy(ctx.guild.id):
+                queued = self.enqueue_mood(ctx, mood, order)
+                if not queued:
+                    await loading_msg.edit(content="❌ The queue is full!")
+                    return
+                await loading_msg.edit(content=f"{emoji} Queued {queued} **{mood}** songs")
+                return
 
-            # Get song results
-            results = await self.get_song_results(song_choice)
-            if not results:
-                await loading_msg.edit(content=f"❌ Could not find song: {song_choice}")
+            first = await self.get_mood_song(mood, order[0])
+            if not first:
+                await loading_msg.edit(content=f"❌ Could not find song: {self.mood_playlists[mood][order[0]]}")
                 return
 
-            # Get first result
-            song_info = results[0]
+            song_info = await self.resolve_stream(first)
+            if not song_info:
+                await loading_msg.edit(content=f"❌ Could not load song: {first['title']}")
+                return
 
             # Play the song
             try:
-                ffmpeg_options = {
-                    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-                    'options': '-vn'
-                }
-                audio_source = discord.FFmpegPCMAudio(song_info['url'], **ffmpeg_options)
-                self.voice_clients[ctx.guild.id].play(
-                    discord.PCMVolumeTransformer(audio_source, volume=self.volume),
-                    after=lambda e: asyncio.run_coroutine_threadsafe(
-                        self.song_finished(ctx.guild.id, e), self.bot.loop
-                    ) if e else None
+                await self.start_track(
+                    ctx,
+                    song_info,
+                    title=f"{emoji} Now Playing ({mood.title()} Mood)"
                 )
             except Exception as e:
                 self.logger.error(f"Error playing song: {e}")
                 await loading_msg.edit(content="❌ Error playing the song. Please try again.")
                 return
 
-            # Update current track info
-            self.current_tracks[ctx.guild.id] = {
-                'title': song_info['title'],
-                'duration': song_info['duration'],
-                'thumbnail': song_info['thumbnail'],
-                'uploader': song_info['uploader'],
-                'requester': ctx.author,
-                'start_time': asyncio.get_event_loop().time(),
-                'url': song_info['url']
-            }
-
-            # Create and send Now Playing embed
-            playing_embed = discord.Embed(
-                title=f"{emoji} Now Playing ({mood.title()} Mood)",
-                description=f"**{song_info['title']}**\nArtist: **{song_info['uploader']}**",
-                color=discord.Color.blue()
-            )
-
-            if song_info['thumbnail']:
-                playing_embed.set_thumbnail(url=song_info['thumbnail'])
-
-            # Add progress information
-            progress_bar = self.create_progress_bar(0, song_info['duration'])
-            playing_embed.add_field(
-                name="Progress",
-                value=f"{progress_bar}\nTime: `00:00 / {song_info['duration_string']}`\nDuration: `{song_info['duration_string']}`",
-                inline=False
-            )
-
-            playing_embed.add_field(
-                name="Requested by",
-                value=ctx.author.mention,
-                inline=False
-            )
-
-            # Send embed and start progress updates
-            now_playing_msg = await ctx.send(embed=playing_embed)
-            await loading_msg.edit(content=f"{emoji} Playing a **{mood}** song: `{song_info['title']}`")
-
-            # Update progress
-            if ctx.guild.id in self.progress_update_tasks:
-                self.progress_update_tasks[ctx.guild.id].cancel()
-
-            self.progress_update_tasks[ctx.guild.id] = asyncio.create_task(
-                self.update_progress(ctx, now_playing_msg.id, self.current_tracks[ctx.guild.id])
-            )
+            queued = self.enqueue_mood(ctx, mood, order[1:])
+            message = f"{emoji} Playing a **{mood}** song: `{song_info['title']}`"
+            if queued:
+                message += f" ({queued} more queued)"
+            await loading_msg.edit(content=message)
 
         except Exception as e:
             self.logger.error(f"Error in moodplay command: {str(e)}")
@@ -1220,87 +1981,46 @@ class MusicCommands(commands.Cog):
                 return
 
             # Randomly select a song from the results
-            song_info = random.choice(results)
+            song_choice = random.choice(results)
 
-            # Join voice channel if not already joined
-            if ctx.guild.id not in self.voice_clients:
-                try:
-                    voice_client = await ctx.author.voice.channel.connect()
-                    self.voice_clients[ctx.guild.id] = voice_client
-                except Exception as e:
-                    self.logger.error(f"Error joining voice channel: {e}")
-                    await loading_msg.edit(content="❌ Could not join the voice channel.")
+            # Join voice channel, replacing a stale connection if needed
+            try:
+                await self.voice_sessions.connect(ctx.author.voice.channel)
+            except Exception as e:
+                self.logger.error(f"Error joining voice channel: {e}")
+                await loading_msg.edit(content="❌ Could not join the voice channel.")
+                return
+
+            # Queue behind the current song if something is already playing
+            if self.is_busy(ctx.guild.id):
+                position = self.enqueue(ctx, song_choice)
+                if not position:
+                    await loading_msg.edit(content="❌ The queue is full!")
                     return
+                await loading_msg.edit(content=f"🎤 Queued `{song_choice['title']}` by **{singer_name}** at position {position}")
+                return
 
-            # Setup FFmpeg options
-            ffmpeg_options = {
-                'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-                'options': '-vn'
-            }
+            song_info = await self.resolve_stream(song_choice)
+            if not song_info:
+                await loading_msg.edit(content=f"❌ Could not load a song by **{singer_name}**!")
+                return
 
             # Create and play audio
             try:
-                audio_source = discord.FFmpegPCMAudio(song_info['url'], **ffmpeg_options)
-                self.voice_clients[ctx.guild.id].play(
-                    discord.PCMVolumeTransformer(audio_source, volume=self.volume),
-                    after=lambda e: asyncio.run_coroutine_threadsafe(
-                        self.song_finished(ctx.guild.id, e), self.bot.loop
-                    ) if e else None
+                await self.start_track(
+                    ctx,
+                    song_info,
+                    title="🎤 Now Playing",
+                    description=f"**{song_info['title']}**\nBy: **{singer_name}**"
                 )
             except Exception as e:
                 self.logger.error(f"Error playing song: {e}")
                 await loading_msg.edit(content="❌ Error playing the song. Please try again.")
                 return
 
-            # Update current track info
-            self.current_tracks[ctx.guild.id] = {
-                'title': song_info['title'],
-                'duration': song_info['duration'],
-                'thumbnail': song_info['thumbnail'],
-                'uploader': song_info['uploader'],
-                'requester': ctx.author,
-                'start_time': asyncio.get_event_loop().time(),
-                'url': song_info['url']
-            }
-
-            # Create Now Playing embed
-            playing_embed = discord.Embed(
-                title="🎤 Now Playing",
-                description=f"**{song_info['title']}**\nBy: **{singer_name}**",
-                color=discord.Color.blue()
-            )
-
-            if song_info['thumbnail']:
-                playing_embed.set_thumbnail(url=song_info['thumbnail'])
-
-            # Add progress information
-            progress_bar = self.create_progress_bar(0, song_info['duration'])
-            playing_embed.add_field(
-                name="Progress",
-                value=f"{progress_bar}\nTime: `00:00 / {song_info['duration_string']}`\nDuration: `{song_info['duration_string']}`",
-                inline=False
-            )
-
-            playing_embed.add_field(
-                name="Requested by",
-                value=ctx.author.mention,
-                inline=False
-            )
-
-            # Send Now Playing embed and update loading message
-            now_playing_msg = await ctx.send(embed=playing_embed)
-
             # Delete the loading message instead of updating it
             await loading_msg.delete()
 
-            # Update progress
-            if ctx.guild.id in self.progress_update_tasks:
-                self.progress_update_tasks[ctx.guild.id].cancel()
-
-            self.progress_update_tasks[ctx.guild.id] = asyncio.create_task(
-                self.update_progress(ctx, now_playing_msg.id, self.current_tracks[ctx.guild.id])
-            )
-
         except Exception as e:
             self.logger.error(f"Error in singer command: {str(e)}")
             await loading_msg.edit(content=f"❌ An error occurred while playing songs by **{singer_name}**")
@@ -1411,23 +2131,23 @@ class MusicCommands(commands.Cog):
             search_url = f"https://api.genius.com/search?q={current_song}"
             headers = {"Authorization": f"Bearer {self.genius.auth.access_token}"}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data["response"]["hits"]:
-                            song_url = data["response"]["hits"][0]["result"]["url"]
-                            embed = discord.Embed(
-                                title="📜 Lyrics Found!",
-                                description=f"[Click here to view lyrics]({song_url})",
-                                color=discord.Color.green()
-                            )
-                            embed.set_footer(text=f"Requested by {ctx.author.name}")
-                            await ctx.send(embed=embed)
-                        else:
-                            await ctx.send("❌ No lyrics found for this song.")
+            session = self.bot.http_session
+            async with session.get(search_url, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data["response"]["hits"]:
+                        song_url = data["response"]["hits"][0]["result"]["url"]
+                        embed = discord.Embed(
+                            title="📜 Lyrics Found!",
+                            description=f"[Click here to view lyrics]({song_url})",
+                            color=discord.Color.green()
+                        )
+                        embed.set_footer(text=f"Requested by {ctx.author.name}")
+                        await ctx.send(embed=embed)
                     else:
-                        await ctx.send("❌ Failed to fetch lyrics.")
+                        await ctx.send("❌ No lyrics found for this song.")
+                else:
+                    await ctx.send("❌ Failed to fetch lyrics.")
         except Exception as e:
             self.logger.error(f"Error getting lyrics: {str(e)}")
             await ctx.send("❌ Could not fetch lyrics at this time.")
@@ -1449,32 +2169,32 @@ class MusicCommands(commands.Cog):
                 'Accept': 'application/json'
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(test_url, params=params, headers=headers, timeout=10) as response:
-                    response_text = await response.text()
-                    self.logger.info(f"API Test Response: {response_text[:200]}...")  # Log first 200 chars
+            session = self.bot.http_session
+            async with session.get(test_url, params=params, headers=headers, timeout=10) as response:
+                response_text = await response.text()
+                self.logger.info(f"API Test Response: {response_text[:200]}...")  # Log first 200 chars
 
-                    if response.status != 200:
-                        self.logger.error(f"API test failed with status {response.status}")
-                        return False
+                if response.status != 200:
+                    self.logger.error(f"API test failed with status {response.status}")
+                    return False
 
-                    try:
-                        data = json.loads(response_text)
-                        status_code = data['message']['header']['status_code']
+                try:
+                    data = json.loads(response_text)
+                    status_code = data['message']['header']['status_code']
 
-                        if status_code != 200:
-                            self.logger.error(f"API test failed with code {status_code}")
-                            return False
+                    if status_code != 200:
+                        self.logger.error(f"API test failed with code {status_code}")
+                        return False
 
-                        self.logger.info("API test successful!")
-                        return True
+                    self.logger.info("API test successful!")
+                    return True
 
-                    except json.JSONDecodeError as e:
-                        self.logger.error(f"Failed to parse API response: {str(e)}")
-                        return False
-                    except KeyError as e:
-                        self.logger.error(f"Unexpected API response format: {str(e)}")
-                        return False
+                except json.JSONDecodeError as e:
+                    self.logger.error(f"Failed to parse API response: {str(e)}")
+                    return False
+                except KeyError as e:
+                    self.logger.error(f"Unexpected API response format: {str(e)}")
+                    return False
 
         except aiohttp.ClientError as e:
             self.logger.error(f"Network error during API test: {str(e)}")
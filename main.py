@@ -4,7 +4,11 @@ from discord.ext import commands, tasks
 from dotenv import load_dotenv
 import logging
 from utils.logger import setup_logger
+from utils.http_session import create_http_session
+from utils.database import Database
+from utils.llm_cache import get_llm_cache
 import asyncio
+import signal
 from keep_alive import keep_alive  # Using keep_alive instead of server
 
 # Load environment variables with override to ensure Glitch env vars take precedence
@@ -46,6 +50,8 @@ class EducationalBot(commands.Bot):
             'cogs.learning_assistant',  # New AI-powered learning assistant
         ]
         self.logger = logger
+        self.http_session = None  # Shared aiohttp session, created in setup_hook
+        self.user_db = None  # Shared data/user_data.db access, created in setup_hook
         self.welcome_channel_id = 1337410430699569232
         self.help_channel_id = 1337414736802742393
         self.roles_channel_id = 1337427674347339786
@@ -53,6 +59,11 @@ class EducationalBot(commands.Bot):
     async def setup_hook(self):
         """Initial setup and load extensions"""
         logger.info("Starting bot initialization...")
+        self.http_session = create_http_session()
+        logger.info("Created shared HTTP session")
+        self.user_db = Database()
+        logger.info("Opened shared user database")
+
         logger.info("Loading extensions...")
 
         for extension in self.initial_extensions:
@@ -64,6 +75,19 @@ class EducationalBot(commands.Bot):
                 logger.error(f"Failed to load extension {extension}: {str(e)}")
                 logger.exception(e)
 
+    async def close(self):
+        """Close the shared HTTP session and databases after the cogs unload"""
+        await super().close()
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+            logger.info("Closed shared HTTP session")
+        if self.user_db:
+            self.user_db.close()
+            logger.info("Closed shared user database")
+        # Persists the LLM cache's batched access times
+        get_llm_cache().close()
+        logger.info("Closed LLM response cache")
+
     async def on_ready(self):
         """Called when the bot is ready and connected"""
         logger.info(f'Bot is ready! Logged in as {self.user.name}')
@@ -147,7 +171,18 @@ async def main():
         logger.info("Starting bot...")
         # Add debug logging for token presence
         logger.info("Token exists and attempting to connect...")
-        await bot.start(token)
+        # The context manager closes the bot on any exit, which unloads cogs
+        # so they can persist buffered state (e.g. unsaved XP)
+        async with bot:
+            # Hosts stop the process with SIGTERM; close the bot the same way
+            # as on Ctrl+C so the cogs still unload and flush
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                try:
+                    loop.add_signal_handler(sig, lambda: asyncio.create_task(bot.close()))
+                except NotImplementedError:
+                    pass  # Not supported on Windows event loops
+            await bot.start(token)
 
     except discord.LoginFailure as e:
         logger.error(f"Failed to log in: Invalid token. Please check your DISCORD_TOKEN in .env")
@@ -102,27 +102,9 @@ This represents the ideal Carnot cycle, which gives the maximum possible efficie
     }
 }
 
-def get_stored_question(subject: str, topic: str = None) -> dict:
+def get_stored_question(subject: str, topic: str = None, class_level: int = 11, user_id: str = None) -> dict:
     """
-    Retrieve a pre-stored question from the question bank
+    Retrieve a random pre-stored question using the shared question index
     """
-    subject = subject.lower()
-    if subject not in QUESTION_BANK:
-        return None
-
-    if topic:
-        if topic not in QUESTION_BANK[subject]:
-            return None
-        questions = QUESTION_BANK[subject][topic]
-    else:
-        # If no topic specified, get questions from all topics
-        questions = []
-        for topic_questions in QUESTION_BANK[subject].values():
-            questions.extend(topic_questions)
-
-    if not questions:
-        return None
-
-    # For now, return the first question. In a real implementation,
-    # you might want to randomize this or implement some selection logic
-    return questions[0]
\ No newline at end of file
+    from question_index import get_stored_question as sample_stored_question
+    return sample_stored_question(subject, topic, class_level, user_id)
@@ -529,25 +529,9 @@ What does this description reveal about the grandmother's character?''',
     }
 }
 
-import random
-
-def get_stored_question_11(subject: str, topic: str | None = None) -> dict | None:
+def get_stored_question_11(subject: str, topic: str | None = None, user_id: str | None = None) -> dict | None:
     """
     Retrieve a random pre-stored question from the class 11 question bank
     """
-    subject = subject.lower() if subject else ""
-    if not subject or subject not in QUESTION_BANK_11:
-        return None
-
-    if isinstance(QUESTION_BANK_11[subject], dict):
-        if topic:
-            topic_questions = QUESTION_BANK_11[subject].get(topic, [])
-            return random.choice(topic_questions) if topic_questions else None
-        else:
-            # Get all questions from all topics
-            all_questions = []
-            for questions in QUESTION_BANK_11[subject].values():
-                all_questions.extend(questions)
-            return random.choice(all_questions) if all_questions else None
-
-    return None
\ No newline at end of file
+    from question_index import get_stored_question
+    return get_stored_question(subject, topic, 11, user_id)
@@ -1,5 +1,3 @@
-import random
-
 # Dictionary to store pre-defined questions for class 12
 QUESTION_BANK_12 = {
     'physics': {
@@ -240,20 +238,9 @@ Therefore, Foreign Direct Investment (FDI) is recorded in the Capital Account as
     }
 }
 
-def get_stored_question_12(subject: str, topic: str | None = None) -> dict | None:
+def get_stored_question_12(subject: str, topic: str | None = None, user_id: str | None = None) -> dict | None:
     """
-    Retrieve a pre-stored question from the class 12 question bank
+    Retrieve a random pre-stored question from the class 12 question bank
     """
-    subject = subject.lower() if subject else ""
-    if not subject or subject not in QUESTION_BANK_12:
-        return None
-
-    if topic:
-        topic_questions = QUESTION_BANK_12[subject].get(topic, [])
-    else:
-        # If no topic specified, get questions from all topics
-        topic_questions = []
-        for questions in QUESTION_BANK_12[subject].values():
-            topic_questions.extend(questions)
-
-    return random.choice(topic_questions) if topic_questions else None
\ No newline at end of file
+    from question_index import get_stored_question
+    return get_stored_question(subject, topic, 12, user_id)
@@ -2,15 +2,57 @@ import os
 import json
 import logging
 import random
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 import google.generativeai as genai
-from question_bank import get_stored_question
+from question_index import get_stored_question
+from utils.llm_cache import get_llm_cache
+
+# Gemini worker pool limits (overridable from the environment)
+GEMINI_MAX_WORKERS = int(os.getenv('GEMINI_MAX_WORKERS', '4'))
+GEMINI_MAX_PENDING = int(os.getenv('GEMINI_MAX_PENDING', '16'))
+GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', '20'))
 
 class QuestionGenerator:
     def __init__(self):
         self.logger = logging.getLogger('discord_bot')
         genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-        self.model = genai.GenerativeModel('gemini-pro')
+        self.model_name = 'gemini-pro'
+        self.model = genai.GenerativeModel(self.model_name)
+        self.llm_cache = get_llm_cache()
+
+        # Blocking Gemini calls run on a dedicated, size-bounded pool so they
+        # never stall the event loop or starve the default executor
+        self.executor = ThreadPoolExecutor(
+            max_workers=GEMINI_MAX_WORKERS,
+            thread_name_prefix='gemini'
+        )
+        self.max_pending = GEMINI_MAX_PENDING
+        self.request_timeout = GEMINI_TIMEOUT
+        self.pending_requests = 0
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'errors': 0
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return worker pool usage counters"""
+        return {
+            **self.stats,
+            'pending': self.pending_requests,
+            'running': min(self.pending_requests, GEMINI_MAX_WORKERS),
+            'queued': max(self.pending_requests - GEMINI_MAX_WORKERS, 0),
+            'max_workers': GEMINI_MAX_WORKERS,
+            'max_pending': self.max_pending
+        }
+
+    def close(self):
+        """Shut down the Gemini worker pool"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
 
     async def generate_question(
         self,
@@ -24,7 +66,7 @@ class QuestionGenerator:
         """
         try:
             # First try to generate using Gemini
-            question = await self._generate_with_gemini(subject, topic, class_level)
+            question = await self.generate_with_gemini(subject, topic, class_level)
             if question:
                 self.logger.info("Successfully generated question using Gemini")
                 return question
@@ -34,7 +76,7 @@ class QuestionGenerator:
 
         # Fallback to stored questions
         self.logger.info(f"Falling back to stored questions for {subject} {topic if topic else ''}")
-        stored_question = get_stored_question(subject, topic)
+        stored_question = get_stored_question(subject, topic, class_level, user_id)
 
         if not stored_question:
             self.logger.error(f"No stored questions found for {subject} {topic if topic else ''}")
@@ -53,13 +95,17 @@ class QuestionGenerator:
 
         return stored_question
 
-    async def _generate_with_gemini(
+    async def generate_with_gemini(
         self,
         subject: str,
         topic: Optional[str],
         class_level: int
     ) -> Optional[Dict[str, Any]]:
-        """Generate a question using Gemini API"""
+        """Generate a question using Gemini API only, or None on failure
+
+        Unlike generate_question there is no stored-question fallback, which
+        suits callers such as the question pool that just retry later.
+        """
         try:
             prompt = self._create_prompt(subject, topic, class_level)
             self.logger.debug(f"Sending prompt to Gemini: {prompt}")
@@ -124,11 +170,57 @@ class QuestionGenerator:
         return base_prompt
 
     async def _get_gemini_response(self, prompt: str) -> Optional[str]:
-        """Get response from Gemini API"""
+        """Get response from Gemini API, bypassing the response cache"""
+        # Practice questions must differ between requests, so never reuse one
+        return await self.llm_cache.get_or_fetch(
+            model=self.model_name,
+            prompt=prompt,
+            fetch=lambda: self._request_gemini(prompt),
+            fresh=True
+        )
+
+    async def _request_gemini(self, prompt: str) -> Optional[str]:
+        """Call Gemini via the bounded worker pool"""
+        # Back-pressure: when the pool is saturated, fail fast so the caller
+        # falls back to stored questions instead of piling up behind the API
+        if self.pending_requests >= self.max_pending:
+            self.stats['rejected'] += 1
+            self.logger.warning(
+                f"Gemini pool saturated ({self.pending_requests} pending), skipping generation"
+            )
+            return None
+
+        self.pending_requests += 1
+        self.stats['submitted'] += 1
+        self.logger.debug(f"Gemini pool depth: {self.pending_requests}/{self.max_pending}")
+        loop = asyncio.get_running_loop()
+        future = self.executor.submit(
+            self.model.generate_content,
+            prompt,
+            request_options={'timeout': self.request_timeout}
+        )
+        # A timed-out call keeps its worker busy until Gemini answers, so the
+        # slot is only released once the worker itself is done
+        future.add_done_callback(lambda _: self._release_slot(loop))
         try:
-            response = self.model.generate_content(prompt)
+            response = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.request_timeout)
+            self.stats['completed'] += 1
             return response.text
 
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            self.logger.error(f"Gemini request timed out after {self.request_timeout}s")
+            return None
         except Exception as e:
+            self.stats['errors'] += 1
             self.logger.error(f"Gemini API error: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop):
+        """Free a pool slot from a worker thread's done-callback"""
+        def release():
+            self.pending_requests -= 1
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            pass  # The event loop is already closed
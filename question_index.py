@@ -0,0 +1,108 @@
+import random
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+from question_store import QuestionStore, normalize_topic
+
+# Per-user sampling state is kept for this many (user, key) pairs
+MAX_USER_ORDERS = 4096
+
+IndexKey = Tuple[int, str, str]
+
+class QuestionIndex:
+    """Precomputed lookup over the compiled question bank
+
+    Only question ids are held in memory; question bodies are read from the
+    compiled store when a question is actually served.
+    """
+
+    def __init__(self, store: QuestionStore):
+        self.logger = logging.getLogger('discord_bot')
+        self.store = store
+        # (class, subject, topic) -> question ids; topic '' holds the whole subject
+        self.questions: Dict[IndexKey, List[int]] = {}
+        # (class, subject, word) -> normalized topic, for partial topic names
+        self.topic_words: Dict[IndexKey, str] = {}
+        # (user, key) -> remaining shuffled positions in self.questions[key]
+        self.user_orders: "OrderedDict[Tuple[str, IndexKey], List[int]]" = OrderedDict()
+
+    @classmethod
+    def build(cls, store: Optional[QuestionStore] = None) -> 'QuestionIndex':
+        """Index every question in the compiled bank"""
+        index = cls(store or QuestionStore())
+        for question_id, class_level, subject, topic in index.store.keys():
+            index.add_question(class_level, subject, topic, question_id)
+        index.logger.info(f"Question index built with {len(index.questions)} keys")
+        return index
+
+    def add_question(self, class_level: int, subject: str, topic: str, question_id: int):
+        """Index a single question id under its topic and its subject"""
+        topic_key = normalize_topic(topic)
+        self.questions.setdefault((class_level, subject, topic_key), []).append(question_id)
+        self.questions.setdefault((class_level, subject, ''), []).append(question_id)
+
+        for word in topic_key.split():
+            self.topic_words.setdefault((class_level, subject, word), topic_key)
+
+    def resolve(self, subject: str, topic: Optional[str], class_level: int) -> Optional[IndexKey]:
+        """Map a request onto an indexed key, or None if nothing matches"""
+        subject = (subject or '').lower().strip()
+        topic_key = normalize_topic(topic)
+        key = (class_level, subject, topic_key)
+        if key in self.questions:
+            return key
+
+        # Fall back to any topic containing one of the requested words
+        for word in topic_key.split():
+            match = self.topic_words.get((class_level, subject, word))
+            if match is not None:
+                return (class_level, subject, match)
+        return None
+
+    def sample(
+        self,
+        subject: str,
+        topic: Optional[str] = None,
+        class_level: int = 11,
+        user_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Pick a question, not repeating one for a user until the key is exhausted"""
+        key = self.resolve(subject, topic, class_level)
+        if key is None:
+            return None
+
+        question_ids = self.questions[key]
+        if user_id is None:
+            return self.store.fetch(random.choice(question_ids))
+
+        order_key = (user_id, key)
+        order = self.user_orders.get(order_key)
+        if not order:
+            order = list(range(len(question_ids)))
+            random.shuffle(order)
+            self.user_orders[order_key] = order
+            while len(self.user_orders) > MAX_USER_ORDERS:
+                self.user_orders.popitem(last=False)
+        else:
+            self.user_orders.move_to_end(order_key)
+
+        return self.store.fetch(question_ids[order.pop()])
+
+_index: Optional[QuestionIndex] = None
+
+def get_question_index() -> QuestionIndex:
+    """Return the shared question index, building it on first use"""
+    global _index
+    if _index is None:
+        _index = QuestionIndex.build()
+    return _index
+
+def get_stored_question(
+    subject: str,
+    topic: Optional[str] = None,
+    class_level: int = 11,
+    user_id: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Retrieve a random stored question for a class, subject and optional topic"""
+    return get_question_index().sample(subject, topic, class_level, user_id)
@@ -0,0 +1,122 @@
+import logging
+from collections import deque, OrderedDict
+from typing import Optional, Dict, Any, Tuple, Deque
+
+# Warm pool sizing (questions kept ready per key, and how many keys we track)
+POOL_TARGET_DEPTH = 3
+POOL_MAX_KEYS = 64
+POOL_REFILL_BATCH = 4
+
+PoolKey = Tuple[str, str, int]
+
+class QuestionPool:
+    """Keeps a small stock of pre-generated questions per (subject, topic, class)"""
+
+    def __init__(self, generator, target_depth: int = POOL_TARGET_DEPTH, max_keys: int = POOL_MAX_KEYS):
+        self.logger = logging.getLogger('discord_bot')
+        self.generator = generator
+        self.target_depth = target_depth
+        self.max_keys = max_keys
+        # Most recently requested keys last; only these are kept warm
+        self.pools: "OrderedDict[PoolKey, Deque[Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(subject: str, topic: Optional[str], class_level: int) -> PoolKey:
+        """Normalize a request into a pool key"""
+        return (subject.lower().strip(), (topic or '').lower().strip(), int(class_level))
+
+    @staticmethod
+    def validate_question(question: Optional[Dict[str, Any]]) -> bool:
+        """Check that a generated question is complete enough to serve"""
+        if not isinstance(question, dict):
+            return False
+        if not question.get('question') or not isinstance(question.get('options'), list):
+            return False
+        if len(question['options']) != 4:
+            return False
+        return str(question.get('correct_answer', '')).strip().upper()[:1] in ('A', 'B', 'C', 'D')
+
+    def _track(self, key: PoolKey) -> Deque[Dict[str, Any]]:
+        """Mark a key as recently requested, evicting the coldest key if needed"""
+        if key in self.pools:
+            self.pools.move_to_end(key)
+        else:
+            self.pools[key] = deque()
+            while len(self.pools) > self.max_keys:
+                evicted, _ = self.pools.popitem(last=False)
+                self.logger.debug(f"Question pool evicted key {evicted}")
+        return self.pools[key]
+
+    def take(self, subject: str, topic: Optional[str], class_level: int) -> Optional[Dict[str, Any]]:
+        """Pop a ready question, registering the key for background refill"""
+        pool = self._track(self.make_key(subject, topic, class_level))
+        if pool:
+            self.hits += 1
+            return pool.popleft()
+        self.misses += 1
+        return None
+
+    async def get_question(
+        self,
+        subject: str,
+        topic: Optional[str] = None,
+        class_level: int = 11,
+        user_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Serve from the pool, generating on a miss"""
+        question = self.take(subject, topic, class_level)
+        if question:
+            self.logger.debug(f"Question pool hit for {subject} {topic or ''} (class {class_level})")
+            return question
+
+        self.logger.debug(f"Question pool miss for {subject} {topic or ''} (class {class_level})")
+        return await self.generator.generate_question(
+            subject=subject,
+            topic=topic,
+            class_level=class_level,
+            user_id=user_id
+        )
+
+    async def refill(self, batch: int = POOL_REFILL_BATCH) -> int:
+        """Top up the emptiest pools, generating at most `batch` questions"""
+        generated = 0
+        for key in sorted(self.pools, key=lambda k: len(self.pools[k])):
+            if generated >= batch:
+                break
+
+            # Leave headroom in the worker pool for live command requests
+            metrics = self.generator.get_metrics()
+            if metrics['pending'] >= metrics['max_workers']:
+                break
+
+            pool = self.pools.get(key)
+            if pool is None or len(pool) >= self.target_depth:
+                continue
+
+            subject, topic, class_level = key
+            try:
+                question = await self.generator.generate_with_gemini(subject, topic or None, class_level)
+            except Exception as e:
+                self.logger.error(f"Error refilling question pool for {key}: {str(e)}")
+                continue
+
+            generated += 1
+            if self.validate_question(question):
+                # The key may have been evicted while we were waiting
+                if key in self.pools:
+                    self.pools[key].append(question)
+            else:
+                self.logger.debug(f"Discarded invalid pooled question for {key}")
+
+        return generated
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool size and hit-rate counters"""
+        return {
+            'keys': len(self.pools),
+            'ready': sum(len(pool) for pool in self.pools.values()),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,161 @@
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import logging
+import importlib
+from typing import Optional, Dict, Any, List, Tuple
+
+# The dict literals in these modules remain the source of truth; the compiled
+# file is rebuilt from them whenever their contents change. Rebuilding imports
+# the large bank modules, so it happens ahead of time (ensure_question_bank at
+# startup, or `python question_store.py`), never on a lookup.
+# module -> (bank variable, classes it serves)
+BANK_SOURCES = {
+    'question_bank': ('QUESTION_BANK', (11, 12)),
+    'question_bank_11': ('QUESTION_BANK_11', (11,)),
+    'question_bank_12': ('QUESTION_BANK_12', (12,)),
+}
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, 'data', 'question_bank.db')
+
+# Topic used for banks whose subject entry is a bare list of questions
+DEFAULT_TOPIC = 'general'
+
+logger = logging.getLogger('discord_bot')
+
+def source_hash() -> str:
+    """Hash the bank source files without importing them"""
+    digest = hashlib.sha256()
+    for module_name in sorted(BANK_SOURCES):
+        with open(os.path.join(BASE_DIR, f"{module_name}.py"), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def normalize_topic(topic: Optional[str]) -> str:
+    """Normalize a topic name for lookups ('Hornbill - Prose' -> 'hornbill prose')"""
+    if not topic:
+        return ''
+    return re.sub(r'[\s_\-]+', ' ', topic.lower()).strip()
+
+def iter_bank(bank: Dict[str, Any]):
+    """Yield (subject, topic, question) from a bank, whatever its subject shape"""
+    for subject, entry in bank.items():
+        if isinstance(entry, dict):
+            for topic, questions in entry.items():
+                for question in questions:
+                    yield subject.lower(), topic, question
+        elif isinstance(entry, list):
+            for question in entry:
+                yield subject.lower(), DEFAULT_TOPIC, question
+
+def compile_question_bank(db_path: str = DEFAULT_DB_PATH) -> int:
+    """Compile the dict banks into an indexed SQLite file, returning the row count"""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    db = sqlite3.connect(tmp_path)
+    try:
+        cursor = db.cursor()
+        cursor.execute('''
+            CREATE TABLE questions (
+                id INTEGER PRIMARY KEY,
+                class_level INTEGER NOT NULL,
+                subject TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                body TEXT NOT NULL,
+                UNIQUE(class_level, subject, topic, body)
+            )
+        ''')
+        cursor.execute('CREATE INDEX idx_questions_lookup ON questions (class_level, subject, topic)')
+        cursor.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+        count = 0
+        for module_name, (bank_name, class_levels) in BANK_SOURCES.items():
+            bank = getattr(importlib.import_module(module_name), bank_name)
+            for subject, topic, question in iter_bank(bank):
+                body = json.dumps(question, ensure_ascii=False, sort_keys=True)
+                for class_level in class_levels:
+                    # Banks overlap (the general bank repeats class 11 questions)
+                    cursor.execute('''
+                        INSERT OR IGNORE INTO questions (class_level, subject, topic, body)
+                        VALUES (?, ?, ?, ?)
+                    ''', (class_level, subject, normalize_topic(topic), body))
+                    count += cursor.rowcount
+
+        cursor.execute('INSERT INTO meta (key, value) VALUES (?, ?)', ('source_hash', source_hash()))
+        db.commit()
+    finally:
+        db.close()
+
+    os.replace(tmp_path, db_path)
+    logger.info(f"Compiled {count} questions into {db_path}")
+    return count
+
+def is_compiled(db_path: str = DEFAULT_DB_PATH) -> bool:
+    """Check that the compiled file exists and matches the bank sources"""
+    if not os.path.exists(db_path):
+        return False
+    try:
+        db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = db.execute("SELECT value FROM meta WHERE key = 'source_hash'").fetchone()
+        finally:
+            db.close()
+        return bool(row) and row[0] == source_hash()
+    except sqlite3.Error:
+        return False
+
+def ensure_question_bank(db_path: str = DEFAULT_DB_PATH) -> bool:
+    """Rebuild the compiled bank if it is missing or stale; returns True if rebuilt
+
+    This is blocking work; call it from a worker thread when on the event loop.
+    """
+    if is_compiled(db_path):
+        return False
+    logger.info("Compiled question bank missing or stale, rebuilding")
+    compile_question_bank(db_path)
+    return True
+
+class QuestionStore:
+    """Read-only, lazily opened view of the compiled question bank
+
+    The bank must already be compiled (see ensure_question_bank).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.db: Optional[sqlite3.Connection] = None
+
+    def open(self) -> sqlite3.Connection:
+        """Open the compiled bank"""
+        if self.db is None:
+            # Read-only, so it may be opened in a worker thread and used on the loop
+            self.db = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+        return self.db
+
+    def keys(self) -> List[Tuple[int, int, str, str]]:
+        """Return (id, class_level, subject, topic) for every stored question"""
+        return self.open().execute(
+            'SELECT id, class_level, subject, topic FROM questions ORDER BY id'
+        ).fetchall()
+
+    def fetch(self, question_id: int) -> Optional[Dict[str, Any]]:
+        """Load a single question by id"""
+        row = self.open().execute('SELECT body FROM questions WHERE id = ?', (question_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def close(self):
+        """Close the underlying connection"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    total = compile_question_bank()
+    print(f"Compiled {total} questions into {DEFAULT_DB_PATH}")
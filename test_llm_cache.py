@@ -0,0 +1,85 @@
+import asyncio
+import sqlite3
+import utils.llm_cache as llm_cache
+from utils.llm_cache import LLMCache
+
+def make_cache(monkeypatch, tmp_path, **kwargs):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: now[0])
+    return LLMCache(str(tmp_path / 'llm_cache.db'), **kwargs), now
+
+def test_round_trip_and_key_parameters(monkeypatch, tmp_path):
+    cache, _ = make_cache(monkeypatch, tmp_path)
+
+    async def run():
+        await cache.set('model', 'prompt', 'answer', system_prompt='sys', temperature=0.7)
+        assert await cache.get('model', 'prompt', 'sys', 0.7) == 'answer'
+        assert await cache.get('model', 'prompt', 'sys', 0.2) is None
+        assert await cache.get('other', 'prompt', 'sys', 0.7) is None
+        return await cache.get_stats()
+
+    stats = asyncio.run(run())
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 1)
+    cache.close()
+
+def test_expired_entries_are_misses(monkeypatch, tmp_path):
+    cache, now = make_cache(monkeypatch, tmp_path)
+
+    async def run():
+        await cache.set('model', 'prompt', 'answer', ttl=60)
+        now[0] += 61
+        return await cache.get('model', 'prompt')
+
+    assert asyncio.run(run()) is None
+    cache.close()
+
+def test_batched_hits_protect_from_lru_eviction(monkeypatch, tmp_path):
+    cache, now = make_cache(monkeypatch, tmp_path, max_entries=2)
+
+    async def run():
+        await cache.set('model', 'a', 'A')
+        now[0] += 1
+        await cache.set('model', 'b', 'B')
+        now[0] += 1
+        assert await cache.get('model', 'a') == 'A'  # 'b' is now least recently used
+        now[0] += 1
+        await cache.set('model', 'c', 'C')
+        return [await cache.get('model', key) for key in 'abc']
+
+    assert asyncio.run(run()) == ['A', None, 'C']
+    assert cache.stats['evictions'] == 1
+    cache.close()
+
+def test_close_persists_access_times(monkeypatch, tmp_path):
+    cache, now = make_cache(monkeypatch, tmp_path)
+
+    async def run():
+        await cache.set('model', 'a', 'A')
+        now[0] += 50
+        await cache.get('model', 'a')
+
+    asyncio.run(run())
+    cache.close()
+    cache.close()  # closing twice is harmless
+
+    db = sqlite3.connect(str(tmp_path / 'llm_cache.db'))
+    assert db.execute('SELECT last_access FROM llm_cache').fetchone()[0] == 1050.0
+    db.close()
+
+def test_get_or_fetch(monkeypatch, tmp_path):
+    cache, _ = make_cache(monkeypatch, tmp_path)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return 'fresh answer'
+
+    async def run():
+        first = await cache.get_or_fetch('model', 'prompt', fetch)
+        second = await cache.get_or_fetch('model', 'prompt', fetch)
+        bypassed = await cache.get_or_fetch('model', 'prompt', fetch, fresh=True)
+        return first, second, bypassed
+
+    assert asyncio.run(run()) == ('fresh answer',) * 3
+    assert len(calls) == 2
+    cache.close()
@@ -0,0 +1,42 @@
+import asyncio
+import utils.lyrics_cache as lyrics_cache
+from utils.lyrics_cache import LyricsCache, normalize_song_key, FOUND_TTL, NOT_FOUND_TTL
+
+def make_cache(monkeypatch, tmp_path):
+    now = [1000.0]
+    monkeypatch.setattr(lyrics_cache.time, 'time', lambda: now[0])
+    return LyricsCache(str(tmp_path / 'lyrics_cache.db')), now
+
+def test_song_key_ignores_decorations():
+    assert normalize_song_key('Lock (Official Video)', 'Sidhu Moose Wala') == \
+        normalize_song_key('lock [Lyrics]', 'sidhu moose-wala ')
+
+def test_found_and_not_found(monkeypatch, tmp_path):
+    cache, _ = make_cache(monkeypatch, tmp_path)
+
+    async def run():
+        assert await cache.get('Song', 'Artist') is None
+        await cache.set_found('Song', 'Artist', {'lyrics': 'la la'})
+        await cache.set_not_found('Missing', 'Artist')
+        return await cache.get('song', 'artist'), await cache.get('Missing', 'Artist')
+
+    found, missing = asyncio.run(run())
+    assert found.result == {'lyrics': 'la la'} and found.fresh
+    assert missing.result is None and missing.fresh
+    assert cache.stats == {'hits': 1, 'negative_hits': 1, 'stale': 0, 'misses': 1}
+
+def test_expired_entries_are_served_stale(monkeypatch, tmp_path):
+    cache, now = make_cache(monkeypatch, tmp_path)
+
+    async def run():
+        await cache.set_found('Song', 'Artist', {'lyrics': 'la la'})
+        await cache.set_not_found('Missing', 'Artist')
+        now[0] += NOT_FOUND_TTL + 1
+        missing = await cache.get('Missing', 'Artist')
+        now[0] += FOUND_TTL
+        return missing, await cache.get('Song', 'Artist')
+
+    missing, found = asyncio.run(run())
+    assert not missing.fresh
+    assert found.result == {'lyrics': 'la la'} and not found.fresh
+    assert cache.stats['stale'] == 2
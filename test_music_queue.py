@@ -0,0 +1,39 @@
+from utils.music_queue import GuildQueue
+
+def track(name):
+    return {'song': {'title': name}}
+
+def titles(queue):
+    return [entry['song']['title'] for entry in queue]
+
+def test_add_returns_position_until_full():
+    queue = GuildQueue(max_length=2)
+    assert queue.add(track('a')) == 1
+    assert queue.add(track('b')) == 2
+    assert queue.add(track('c')) == 0
+    assert titles(queue) == ['a', 'b']
+
+def test_extend_stops_when_full():
+    queue = GuildQueue(max_length=3)
+    queue.add(track('a'))
+    assert queue.extend(track(name) for name in 'bcde') == 2
+    assert titles(queue) == ['a', 'b', 'c']
+
+def test_push_front_and_pop_next():
+    queue = GuildQueue()
+    queue.add(track('a'))
+    queue.push_front(track('b'))
+    assert queue.peek()['song']['title'] == 'b'
+    assert queue.pop_next()['song']['title'] == 'b'
+    assert queue.pop_next()['song']['title'] == 'a'
+    assert queue.pop_next() is None
+
+def test_remove_and_move_use_one_based_positions():
+    queue = GuildQueue()
+    queue.extend(track(name) for name in 'abcd')
+    assert queue.remove(2)['song']['title'] == 'b'
+    assert queue.remove(0) is None
+    assert queue.remove(4) is None
+    assert queue.move(3, 1)['song']['title'] == 'd'
+    assert titles(queue) == ['d', 'a', 'c']
+    assert queue.move(1, 5) is None
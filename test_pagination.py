@@ -0,0 +1,31 @@
+import signal
+from utils.pagination import paginate_text
+
+def _paginate(text, limit):
+    """Run paginate_text with a hard timeout so a regression fails instead of hanging"""
+    def timeout(signum, frame):
+        raise TimeoutError("paginate_text did not terminate")
+    previous = signal.signal(signal.SIGALRM, timeout)
+    signal.alarm(5)
+    try:
+        return paginate_text(text, limit)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+def test_prose_mentioning_a_fence_terminates():
+    text = "Use the ``` fence " + "to mark code blocks in your answer " * 200
+    pages = _paginate(text, 500)
+    assert all(len(page) <= 500 for page in pages)
+    assert pages[1].startswith("```\n")
+
+def test_fence_without_newline_terminates():
+    text = "```" + "a" * 3000
+    pages = _paginate(text, 1000)
+    assert all(len(page) <= 1000 for page in pages)
+    assert "".join(page.replace("```", "").replace("\n", "") for page in pages) == "a" * 3000
+
+def test_language_is_reopened():
+    text = "```py\n" + "print(1)\n" * 300 + "```"
+    pages = _paginate(text, 400)
+    assert all(page.startswith("```py\n") for page in pages)
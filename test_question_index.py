@@ -0,0 +1,52 @@
+import question_index
+from question_index import QuestionIndex
+
+class FakeStore:
+    """In-memory stand-in for the compiled question bank"""
+
+    def __init__(self, rows):
+        self.rows = rows  # (id, class_level, subject, topic)
+
+    def keys(self):
+        return self.rows
+
+    def fetch(self, question_id):
+        return {'id': question_id}
+
+def build_index():
+    return QuestionIndex.build(FakeStore([
+        (1, 11, 'physics', 'mechanics'),
+        (2, 11, 'physics', 'mechanics'),
+        (3, 11, 'physics', 'mechanics'),
+        (4, 11, 'physics', 'wave optics'),
+        (5, 12, 'physics', 'mechanics'),
+    ]))
+
+def test_no_repeats_until_the_key_is_exhausted():
+    index = build_index()
+    served = [index.sample('physics', 'mechanics', 11, user_id='u')['id'] for _ in range(3)]
+    assert sorted(served) == [1, 2, 3]
+
+    # The next round starts a fresh shuffle
+    again = [index.sample('physics', 'mechanics', 11, user_id='u')['id'] for _ in range(3)]
+    assert sorted(again) == [1, 2, 3]
+
+def test_users_sample_independently():
+    index = build_index()
+    first = {index.sample('physics', 'mechanics', 11, user_id='a')['id'] for _ in range(3)}
+    second = {index.sample('physics', 'mechanics', 11, user_id='b')['id'] for _ in range(3)}
+    assert first == second == {1, 2, 3}
+
+def test_subject_topic_and_class_resolution():
+    index = build_index()
+    assert index.sample('Physics', 'Optics', 11)['id'] == 4  # partial topic name
+    assert index.sample('physics', None, 12)['id'] == 5  # whole subject
+    assert index.sample('physics', 'thermodynamics', 11) is None
+    assert index.sample('chemistry', None, 11) is None
+
+def test_user_orders_are_bounded(monkeypatch):
+    monkeypatch.setattr(question_index, 'MAX_USER_ORDERS', 2)
+    index = build_index()
+    for user_id in 'abc':
+        index.sample('physics', 'mechanics', 11, user_id=user_id)
+    assert [user for user, _ in index.user_orders] == ['b', 'c']
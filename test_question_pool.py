@@ -0,0 +1,56 @@
+import asyncio
+from question_pool import QuestionPool
+
+def question(text='What is 2 + 2?'):
+    return {'question': text, 'options': ['A) 3', 'B) 4', 'C) 5', 'D) 6'], 'correct_answer': 'B'}
+
+class FakeGenerator:
+    def __init__(self, pending=0):
+        self.pending = pending
+        self.generated = []
+
+    def get_metrics(self):
+        return {'pending': self.pending, 'max_workers': 4}
+
+    async def generate_with_gemini(self, subject, topic, class_level):
+        self.generated.append((subject, topic, class_level))
+        return question(f"{subject} {len(self.generated)}")
+
+    async def generate_question(self, subject, topic=None, class_level=11, user_id=None):
+        return question('generated on demand')
+
+def test_validate_question():
+    assert QuestionPool.validate_question(question())
+    assert not QuestionPool.validate_question(None)
+    assert not QuestionPool.validate_question({**question(), 'options': ['A', 'B']})
+    assert not QuestionPool.validate_question({**question(), 'correct_answer': 'E'})
+
+def test_refill_then_serve_from_pool():
+    pool = QuestionPool(FakeGenerator(), target_depth=2)
+    assert pool.take('Physics', None, 11) is None  # registers the key
+
+    # One question per key and pass, until the key reaches the target depth
+    assert asyncio.run(pool.refill()) == 1
+    assert asyncio.run(pool.refill()) == 1
+    assert asyncio.run(pool.refill()) == 0
+    served = asyncio.run(pool.get_question('physics', None, 11))
+    assert served['question'] == 'physics 1'
+    assert (pool.hits, pool.misses) == (1, 1)
+
+def test_miss_falls_back_to_the_generator():
+    pool = QuestionPool(FakeGenerator())
+    served = asyncio.run(pool.get_question('physics', 'optics', 12))
+    assert served['question'] == 'generated on demand'
+
+def test_refill_leaves_room_for_live_requests():
+    generator = FakeGenerator(pending=4)
+    pool = QuestionPool(generator)
+    pool.take('physics', None, 11)
+    assert asyncio.run(pool.refill()) == 0
+    assert generator.generated == []
+
+def test_coldest_key_is_evicted():
+    pool = QuestionPool(FakeGenerator(), max_keys=2)
+    for subject in ('physics', 'chemistry', 'physics', 'biology'):
+        pool.take(subject, None, 11)
+    assert list(pool.pools) == [('physics', '', 11), ('biology', '', 11)]
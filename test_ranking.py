@@ -0,0 +1,28 @@
+from utils.ranking import RankedScores
+
+def test_ties_share_a_rank():
+    ranking = RankedScores({'a': 50, 'b': 30, 'c': 30, 'd': 10})
+    assert [ranking.rank(key) for key in 'abcd'] == [1, 2, 2, 4]
+
+def test_update_moves_an_entry():
+    ranking = RankedScores({'a': 50, 'b': 30})
+    ranking.update('b', 70)
+    assert ranking.rank('b') == 1
+    assert ranking.rank('a') == 2
+    assert ranking.top(2) == [('b', 70), ('a', 50)]
+    assert len(ranking) == 2
+
+def test_update_inserts_new_entries():
+    ranking = RankedScores()
+    ranking.update('a', 10)
+    ranking.update('b', 20)
+    assert ranking.top(5) == [('b', 20), ('a', 10)]
+
+def test_remove_and_unknown_keys():
+    ranking = RankedScores({'a': 50, 'b': 30})
+    ranking.remove('a')
+    ranking.remove('missing')
+    assert 'a' not in ranking
+    assert ranking.rank('a') is None
+    assert ranking.rank('b') == 1
+    assert ranking.top(10) == [('b', 30)]
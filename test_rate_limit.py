@@ -0,0 +1,38 @@
+import utils.rate_limit as rate_limit
+from utils.rate_limit import TokenBucket
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_bucket(monkeypatch, rate, capacity):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, 'monotonic', clock)
+    return TokenBucket(rate=rate, capacity=capacity), clock
+
+def test_burst_then_refill(monkeypatch):
+    bucket, clock = make_bucket(monkeypatch, rate=2, capacity=3)
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+
+    clock.now += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+def test_refill_is_capped(monkeypatch):
+    bucket, clock = make_bucket(monkeypatch, rate=1, capacity=2)
+    clock.now += 60
+    assert bucket.available == 2
+
+def test_penalize_blocks_then_recovers(monkeypatch):
+    bucket, clock = make_bucket(monkeypatch, rate=1, capacity=5)
+    bucket.penalize(10)
+    clock.now += 9
+    assert bucket.available == 0
+    assert not bucket.try_acquire()
+
+    clock.now += 2
+    assert bucket.try_acquire()
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+import pytest
+
+# StudyStreak lives in the achievements cog, which needs discord.py
+achievements = pytest.importorskip('cogs.achievements', exc_type=ImportError)
+StudyStreak = achievements.StudyStreak
+
+MONDAY = date(2025, 3, 3)
+
+def test_consecutive_days_extend_the_streak():
+    streak = StudyStreak()
+    for offset in range(3):
+        assert streak.record(MONDAY + timedelta(days=offset))
+    assert (streak.current, streak.longest) == (3, 3)
+
+def test_same_or_earlier_day_is_not_counted_twice():
+    streak = StudyStreak()
+    assert streak.record(MONDAY)
+    assert not streak.record(MONDAY)
+    assert not streak.record(MONDAY - timedelta(days=1))
+    assert streak.current == 1
+
+def test_missed_day_resets_current_but_keeps_longest():
+    streak = StudyStreak()
+    streak.record(MONDAY)
+    streak.record(MONDAY + timedelta(days=1))
+    streak.record(MONDAY + timedelta(days=3))
+    assert (streak.current, streak.longest) == (1, 2)
+
+def test_streak_rolls_over_month_and_year_boundaries():
+    streak = StudyStreak()
+    for day in (date(2024, 12, 31), date(2025, 1, 1), date(2025, 1, 2)):
+        assert streak.record(day)
+    assert streak.current == 3
+
+def test_full_weekend_needs_both_days_of_the_same_weekend():
+    saturday = MONDAY + timedelta(days=5)
+    streak = StudyStreak()
+    streak.record(saturday)
+    assert not streak.full_weekend
+    streak.record(saturday + timedelta(days=1))
+    assert streak.full_weekend
+
+    # A Sunday of a later weekend starts that weekend afresh
+    streak.record(saturday + timedelta(days=8))
+    assert streak.weekend_of == saturday + timedelta(days=7)
+    assert not streak.full_weekend
@@ -0,0 +1,37 @@
+import utils.ttl_cache as ttl_cache
+from utils.ttl_cache import TTLCache
+
+def test_expired_entries_are_misses(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, 'time', lambda: now[0])
+    cache = TTLCache(default_ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=30)
+    cache.set('c', 3, expires_at=1005)
+
+    now[0] += 6
+    assert cache.get('c') is None
+    assert cache.get('a') == 1
+
+    now[0] += 5
+    assert 'a' not in cache
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+def test_pop():
+    cache = TTLCache()
+    cache.set('a', 1)
+    assert cache.pop('a') == 1
+    assert cache.pop('a') is None
+    assert len(cache) == 0
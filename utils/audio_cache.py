@@ -0,0 +1,163 @@
+import os
+import re
+import shlex
+import asyncio
+import logging
+import subprocess
+from collections import OrderedDict
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = 'data/audio_cache'
+AUDIO_CACHE_MAX_MB = int(os.getenv('AUDIO_CACHE_MAX_MB', '512'))  # 0 disables the cache
+AUDIO_CACHE_MAX_TRACK_SECONDS = 15 * 60  # long mixes would churn the whole cache
+AUDIO_CACHE_CONCURRENCY = 2
+AUDIO_CACHE_TIMEOUT = 300  # seconds allowed for one background download
+
+VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{6,20}$')
+
+class AudioCache:
+    """On-disk LRU cache of Opus audio keyed by YouTube video ID
+
+    Tracks are copied in the background after their first play (remuxed
+    when the source is already Opus, encoded once otherwise) and served
+    from disk afterwards. File modification times record recency, so the
+    LRU order survives restarts.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = AUDIO_CACHE_MAX_MB * 1024 * 1024):
+        self.logger = logging.getLogger('discord_bot')
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, int]" = OrderedDict()  # video_id -> size, oldest first
+        self.total_bytes = 0
+        self.pending: Dict[str, asyncio.Task] = {}
+        self.semaphore = asyncio.Semaphore(AUDIO_CACHE_CONCURRENCY)
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0, 'failed': 0}
+
+        if self.enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._scan()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _scan(self):
+        """Rebuild the index from disk, oldest first"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith('.part'):
+                os.remove(path)  # interrupted download
+            elif name.endswith('.ogg'):
+                stat = os.stat(path)
+                files.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        for _, video_id, size in sorted(files):
+            self.entries[video_id] = size
+            self.total_bytes += size
+        self._evict()
+
+    def path_for(self, video_id: str) -> str:
+        return os.path.join(self.cache_dir, f"{video_id}.ogg")
+
+    def get(self, video_id: Optional[str], count: bool = True) -> Optional[str]:
+        """Return the cached file for a video and mark it recently used
+
+        Speculative lookups (e.g. prefetching) pass count=False so only real
+        plays show up in the hit/miss stats.
+        """
+        if not self.enabled or not video_id or video_id not in self.entries:
+            if count:
+                self.stats['misses'] += 1
+            return None
+
+        path = self.path_for(video_id)
+        try:
+            os.utime(path)
+        except OSError:
+            self._drop(video_id)  # removed behind our back
+            if count:
+                self.stats['misses'] += 1
+            return None
+
+        self.entries.move_to_end(video_id)
+        if count:
+            self.stats['hits'] += 1
+        return path
+
+    def schedule(self, video_id: Optional[str], url: str, acodec: Optional[str], duration: int, before_options: str = ''):
+        """Copy a track into the cache in the background, if worth caching"""
+        if (not self.enabled or not video_id or not VIDEO_ID_PATTERN.match(video_id)
+                or video_id in self.entries or video_id in self.pending
+                or not 0 < duration <= AUDIO_CACHE_MAX_TRACK_SECONDS):
+            return
+
+        task = asyncio.create_task(self._populate(video_id, url, acodec, before_options))
+        self.pending[video_id] = task
+        task.add_done_callback(lambda _: self.pending.pop(video_id, None))
+
+    async def _populate(self, video_id: str, url: str, acodec: Optional[str], before_options: str):
+        path = self.path_for(video_id)
+        partial = f"{path}.part"
+        async with self.semaphore:
+            codec = ['-c:a', 'copy'] if acodec == 'opus' else ['-c:a', 'libopus', '-b:a', '128k']
+            process = await asyncio.create_subprocess_exec(
+                'ffmpeg', *shlex.split(before_options), '-i', url, '-vn', *codec,
+                '-f', 'ogg', '-loglevel', 'error', '-y', partial,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                returncode = await asyncio.wait_for(process.wait(), AUDIO_CACHE_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                returncode = None
+            except asyncio.CancelledError:
+                process.kill()
+                if os.path.exists(partial):
+                    os.remove(partial)
+                raise
+
+        if returncode != 0:
+            self.stats['failed'] += 1
+            self.logger.warning(f"Audio cache download failed for {video_id}")
+            if os.path.exists(partial):
+                os.remove(partial)
+            return
+
+        os.replace(partial, path)
+        size = os.path.getsize(path)
+        self.entries[video_id] = size
+        self.total_bytes += size
+        self.stats['stored'] += 1
+        self._evict()
+
+    def _drop(self, video_id: str):
+        size = self.entries.pop(video_id, 0)
+        self.total_bytes -= size
+
+    def _evict(self):
+        """Remove least recently used files until under the size cap"""
+        while self.total_bytes > self.max_bytes and self.entries:
+            video_id = next(iter(self.entries))
+            self._drop(video_id)
+            try:
+                os.remove(self.path_for(video_id))
+            except OSError:
+                pass
+            self.stats['evicted'] += 1
+
+    def close(self):
+        """Cancel background downloads"""
+        for task in list(self.pending.values()):
+            task.cancel()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            'entries': len(self.entries),
+            'size_mb': round(self.total_bytes / (1024 * 1024), 1),
+            'max_mb': round(self.max_bytes / (1024 * 1024), 1),
+            'downloading': len(self.pending)
+        }
@@ -0,0 +1,262 @@
+import os
+import shlex
+import logging
+import tempfile
+import threading
+import subprocess
+from typing import Optional
+
+import discord
+
+# Discord voice frames: 20ms of 48kHz 16-bit stereo PCM
+SAMPLE_RATE = 48000
+CHANNELS = 2
+FRAME_SIZE = discord.opus.Encoder.FRAME_SIZE
+FRAME_SECONDS = discord.opus.Encoder.FRAME_LENGTH / 1000
+BYTES_PER_SECOND = SAMPLE_RATE * CHANNELS * 2
+PCM_INPUT_OPTIONS = f'-f s16le -ar {SAMPLE_RATE} -ac {CHANNELS}'
+
+SPOOL_DIR = os.getenv('AUDIO_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'bot_audio_spool'))
+READ_TIMEOUT = 10  # seconds a reader waits for the decoder before giving up
+FOLLOW_FRAMES = 50  # frames between playhead updates to a followed spool (1s)
+
+class SpoolStalled(Exception):
+    """The decoder produced nothing for READ_TIMEOUT seconds; unlike EOF the track is not over"""
+
+class AudioSpool:
+    """Decoded PCM of one track, kept in an on-disk ring buffer
+
+    A background FFmpeg decodes the remote stream once, as fast as the
+    network allows, into a fixed-size ring file. The decoder is held back
+    so it never overwrites the last `rewind_seconds` before the playhead,
+    which keeps recent audio available for seeking back and for re-reading
+    through a different filter. Offsets are absolute byte positions in the
+    decoded track; a spool opened at `start` seconds holds nothing before it.
+    """
+
+    def __init__(self, url: str, before_options: str, capacity_seconds: int, rewind_seconds: int, start: float = 0.0):
+        self.logger = logging.getLogger('discord_bot')
+        self.capacity = capacity_seconds * BYTES_PER_SECOND
+        self.rewind = min(rewind_seconds, capacity_seconds // 2) * BYTES_PER_SECOND
+        self.base = int(start * BYTES_PER_SECOND) // FRAME_SIZE * FRAME_SIZE
+        self.written = self.base
+        self.read_offset = self.base
+        self.complete = False
+        self.closed = False
+        self.cond = threading.Condition()
+
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        self.fd, self.path = tempfile.mkstemp(dir=SPOOL_DIR, suffix='.pcm')
+        try:
+            os.unlink(self.path)  # the open descriptor keeps it alive; nothing leaks on a crash
+            self.path = None
+        except OSError:
+            pass
+
+        if self.base:
+            before_options = f"{before_options} -ss {self.base / BYTES_PER_SECOND:.2f}"
+        args = ['ffmpeg', *shlex.split(before_options), '-i', url, '-vn',
+                *shlex.split(PCM_INPUT_OPTIONS), '-loglevel', 'error', 'pipe:1']
+        self.process = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE)
+        self.thread = threading.Thread(target=self._pump, name='audio-spool', daemon=True)
+        self.thread.start()
+
+    @property
+    def earliest(self) -> int:
+        """Oldest offset still held in the ring"""
+        return max(self.base, self.written - self.capacity)
+
+    def _pump(self):
+        """Copy decoded audio into the ring, throttled by the playhead"""
+        try:
+            while True:
+                chunk = self.process.stdout.read(BYTES_PER_SECOND)
+                if not chunk:
+                    break
+
+                with self.cond:
+                    # Never overwrite audio within `rewind` of the playhead
+                    while (not self.closed and
+                           self.written + len(chunk) > self.read_offset - self.rewind + self.capacity):
+                        self.cond.wait()
+                    if self.closed:
+                        return
+                    start = self.written
+
+                self._write_at(start, chunk)
+
+                with self.cond:
+                    self.written += len(chunk)
+                    self.cond.notify_all()
+        except (OSError, ValueError) as e:
+            if not self.closed:
+                self.logger.error(f"Audio spool decoder failed: {str(e)}")
+        finally:
+            with self.cond:
+                self.complete = True
+                self.cond.notify_all()
+
+    def _write_at(self, offset: int, data: bytes):
+        position = offset % self.capacity
+        first = data[:self.capacity - position]
+        os.pwrite(self.fd, first, position)
+        if len(first) < len(data):
+            os.pwrite(self.fd, data[len(first):], 0)
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        position = offset % self.capacity
+        first = os.pread(self.fd, min(size, self.capacity - position), position)
+        if len(first) < size:
+            first += os.pread(self.fd, size - len(first), 0)
+        return first
+
+    def has(self, offset: int) -> bool:
+        """Whether an offset can be served locally right now"""
+        with self.cond:
+            return not self.closed and self.earliest <= offset <= self.written
+
+    def follow(self, offset: int):
+        """Move the playhead for a source that plays the track without reading the spool"""
+        with self.cond:
+            self.read_offset = offset
+            self.cond.notify_all()
+
+    def wait_for(self, offset: int, timeout: float = READ_TIMEOUT) -> bool:
+        """Block until `offset` has been decoded (or the track ended); False on timeout"""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.closed or self.complete or self.written >= offset, timeout)
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Read decoded audio at an offset, waiting for the decoder if needed
+
+        Returns b'' at the end of the track, or if the data was overwritten.
+        Raises SpoolStalled if nothing arrives within READ_TIMEOUT seconds.
+        """
+        with self.cond:
+            self.read_offset = offset
+            self.cond.notify_all()
+            ready = self.cond.wait_for(lambda: self.closed or self.complete or self.written >= offset + size, READ_TIMEOUT)
+            if self.closed or offset < self.earliest:
+                return b''
+            if not ready and self.written <= offset:
+                raise SpoolStalled(f"No audio decoded for {READ_TIMEOUT}s")
+            size = min(size, self.written - offset)
+        if size <= 0:
+            return b''
+        return self._read_at(offset, size)
+
+    def close(self):
+        """Stop the decoder and release the ring file"""
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify_all()
+
+        if self.process.poll() is None:
+            self.process.kill()
+        try:
+            self.process.stdout.close()
+        except OSError:
+            pass
+        self.thread.join(timeout=2)
+        os.close(self.fd)
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+class SpoolSource(discord.AudioSource):
+    """Play unfiltered PCM frames straight from a spool"""
+
+    def __init__(self, spool: AudioSpool, offset: int):
+        self.spool = spool
+        self.offset = offset - offset % FRAME_SIZE
+
+    def read(self) -> bytes:
+        data = self.spool.read(self.offset, FRAME_SIZE)
+        if len(data) < FRAME_SIZE:
+            return b''
+        self.offset += FRAME_SIZE
+        return data
+
+    def is_opus(self) -> bool:
+        return False
+
+class SpoolPipe:
+    """File-like view of a spool, used as FFmpeg's stdin when applying filters
+
+    FFmpeg's writer thread cannot pass an exception on, so a stall ends the
+    pipe and is remembered in `stalled` for FilteredSpoolSource to report.
+    """
+
+    def __init__(self, spool: AudioSpool, offset: int):
+        self.spool = spool
+        self.offset = offset - offset % FRAME_SIZE
+        self.stalled = False
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = BYTES_PER_SECOND
+        try:
+            data = self.spool.read(self.offset, size)
+        except SpoolStalled:
+            self.stalled = True
+            return b''
+        self.offset += len(data)
+        return data
+
+class FilteredSpoolSource(discord.FFmpegPCMAudio):
+    """Spooled audio played through an FFmpeg filter graph"""
+
+    def __init__(self, pipe: SpoolPipe, audio_filter: str):
+        self.pipe = pipe
+        super().__init__(pipe, pipe=True, before_options=PCM_INPUT_OPTIONS, options=f'-vn -af {audio_filter}')
+
+    def read(self) -> bytes:
+        data = super().read()
+        if not data and self.pipe.stalled:
+            raise SpoolStalled(f"No audio decoded for {READ_TIMEOUT}s")
+        return data
+
+class TrackedSource(discord.AudioSource):
+    """Count frames actually handed to the voice client to report the position
+
+    `speed` is how many seconds of the original track one second of output
+    covers (e.g. 1.25 for nightcore), so positions stay in track time. A
+    `follow` spool filled alongside a direct stream is told the playhead, so
+    it keeps the audio around it for later seeks and effect switches.
+    """
+
+    def __init__(self, original: discord.AudioSource, start: float = 0.0, speed: float = 1.0, follow: Optional[AudioSpool] = None):
+        self.original = original
+        self.start = start
+        self.speed = speed
+        self.follow = follow
+        self.frames = 0
+
+    @property
+    def position(self) -> float:
+        return self.start + self.frames * FRAME_SECONDS * self.speed
+
+    def read(self) -> bytes:
+        data = self.original.read()
+        if data:
+            self.frames += 1
+            if self.follow and self.frames % FOLLOW_FRAMES == 0:
+                self.follow.follow(int(self.position * BYTES_PER_SECOND))
+        return data
+
+    def is_opus(self) -> bool:
+        return self.original.is_opus()
+
+    def cleanup(self):
+        self.original.cleanup()
+
+def open_spool_source(spool: AudioSpool, position: float, audio_filter: Optional[str] = None) -> discord.AudioSource:
+    """Build a local source that plays `spool` from `position` seconds"""
+    offset = int(position * BYTES_PER_SECOND)
+    if not audio_filter:
+        return SpoolSource(spool, offset)
+    return FilteredSpoolSource(SpoolPipe(spool, offset), audio_filter)
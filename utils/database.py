@@ -0,0 +1,152 @@
+import os
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+USER_DB_PATH = 'data/user_data.db'
+DB_READERS = int(os.getenv('DB_READERS', '4'))
+DB_BUSY_TIMEOUT = 5.0  # seconds a statement waits on a locked database
+DB_STATEMENT_CACHE = 256  # prepared statements kept per connection
+DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '100'))
+
+class Database:
+    """Shared async access to one SQLite database
+
+    Writes are serialized on a single writer thread, reads run on a small
+    pool of read-only connections; WAL mode lets both proceed at the same
+    time. Every thread keeps its own long-lived connection, so sqlite3's
+    per-connection statement cache reuses prepared statements across calls.
+    Each query is timed and slow ones are logged.
+    """
+
+    def __init__(self, path: str = USER_DB_PATH, readers: int = DB_READERS):
+        self.logger = logging.getLogger('discord_bot')
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-writer')
+        self.readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='db-reader')
+        self.local = threading.local()
+        self.connections: List[sqlite3.Connection] = []
+        self.lock = threading.Lock()
+        self.query_stats: Dict[str, List[float]] = {}  # query -> [calls, total ms, max ms]
+        self.closed = False
+
+    def _connection(self, read_only: bool) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=DB_BUSY_TIMEOUT,
+                cached_statements=DB_STATEMENT_CACHE,
+                check_same_thread=False
+            )
+            conn.execute(f'PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT * 1000)}')
+            if read_only:
+                conn.execute('PRAGMA query_only=1')
+            else:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+            self.local.conn = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def _timed(self, label: str, read_only: bool, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = self._connection(read_only)
+        start = time.perf_counter()
+        try:
+            return func(conn)
+        except sqlite3.OperationalError as e:
+            if 'locked' in str(e):
+                self.logger.warning(f"Database busy for over {DB_BUSY_TIMEOUT}s: {label}")
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self.lock:
+                stats = self.query_stats.setdefault(label, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+            if elapsed >= DB_SLOW_QUERY_MS:
+                self.logger.warning(f"Slow query ({elapsed:.0f}ms): {label}")
+
+    async def _run(self, executor: ThreadPoolExecutor, label: str, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        if self.closed:
+            raise RuntimeError("Database is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._timed, label, executor is self.readers, func)
+
+    @staticmethod
+    def _label(sql: str) -> str:
+        return ' '.join(sql.split())[:120]
+
+    async def fetchone(self, sql: str, params: Iterable = ()) -> Optional[tuple]:
+        """Run a read query and return its first row"""
+        return await self._run(self.readers, self._label(sql), lambda conn: conn.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        """Run a read query and return all rows"""
+        return await self._run(self.readers, self._label(sql), lambda conn: conn.execute(sql, params).fetchall())
+
+    async def execute(self, sql: str, params: Iterable = ()) -> int:
+        """Run and commit one write statement, returning the affected row count"""
+        def run(conn):
+            with conn:
+                return conn.execute(sql, params).rowcount
+        return await self._run(self.writer, self._label(sql), run)
+
+    async def executemany(self, sql: str, rows: Iterable[Iterable]) -> int:
+        """Run one write statement for many rows in a single transaction"""
+        def run(conn):
+            with conn:
+                return conn.executemany(sql, rows).rowcount
+        return await self._run(self.writer, self._label(sql), run)
+
+    async def executescript(self, script: str):
+        """Run schema statements, e.g. CREATE TABLE IF NOT EXISTS"""
+        await self._run(self.writer, self._label(script), lambda conn: conn.executescript(script))
+
+    async def transaction(self, func: Callable[[sqlite3.Connection], Any], label: Optional[str] = None) -> Any:
+        """Run several statements atomically on the writer connection
+
+        `func` receives the connection and runs on the writer thread; it
+        must not await or touch the event loop.
+        """
+        def run(conn):
+            with conn:
+                return func(conn)
+        return await self._run(self.writer, label or getattr(func, '__name__', 'transaction'), run)
+
+    def get_stats(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Queries with the most total time spent"""
+        with self.lock:
+            items = [(label, list(stats)) for label, stats in self.query_stats.items()]
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        return [
+            {
+                'query': label,
+                'calls': int(calls),
+                'avg_ms': round(total / calls, 2),
+                'max_ms': round(worst, 2),
+                'total_ms': round(total, 1)
+            }
+            for label, (calls, total, worst) in items[:limit]
+        ]
+
+    def close(self):
+        """Wait for queued queries to finish and close every connection"""
+        if self.closed:
+            return
+        self.closed = True
+        self.writer.shutdown(wait=True)
+        self.readers.shutdown(wait=True)
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections.clear()
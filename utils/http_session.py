@@ -0,0 +1,31 @@
+import os
+import aiohttp
+
+# Connection pool and timeout defaults for the bot-wide HTTP session
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '10'))
+HTTP_DNS_CACHE_TTL = 300  # seconds
+HTTP_KEEPALIVE_TIMEOUT = 30  # seconds
+HTTP_TOTAL_TIMEOUT = 15  # seconds
+HTTP_CONNECT_TIMEOUT = 5  # seconds
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create the shared aiohttp session used for all outbound HTTP
+
+    Must be called from inside the running event loop (e.g. setup_hook).
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=HTTP_TOTAL_TIMEOUT,
+        connect=HTTP_CONNECT_TIMEOUT
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={'User-Agent': 'EducationalBot/1.0'}
+    )
@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+DEFAULT_DB_PATH = 'data/llm_cache.db'
+DEFAULT_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+DEFAULT_TTL = int(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))  # 7 days
+
+class LLMCache:
+    """Persistent, content-addressed cache for LLM responses
+
+    Entries are keyed by a hash of (model, system prompt, prompt, temperature),
+    expire after a TTL, and the least recently used entries are evicted once
+    the cache grows past max_entries. Hits only record their access time in
+    memory; it is written with the next store, just before eviction runs.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_entries: int = DEFAULT_MAX_ENTRIES, default_ttl: int = DEFAULT_TTL):
+        self.logger = logging.getLogger('discord_bot')
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bypassed': 0}
+        self.lock = threading.Lock()
+        self.accessed: Dict[str, float] = {}  # key -> last hit time not yet written
+        self.closed = False
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)')
+        self.db.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, system_prompt: Optional[str] = None, temperature: Optional[float] = None) -> str:
+        """Hash the request parameters that determine a response"""
+        payload = json.dumps([model, system_prompt or '', prompt, temperature], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                'SELECT response, expires_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if not row:
+                return None
+            response, expires_at = row
+            if expires_at <= now:
+                self.db.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                self.db.commit()
+                return None
+            self.accessed[key] = now
+            return response
+
+    def _write_access_times(self):
+        """Persist batched hit times; the caller holds the lock and commits"""
+        if self.accessed:
+            self.db.executemany(
+                'UPDATE llm_cache SET last_access = ? WHERE key = ?',
+                [(accessed_at, key) for key, accessed_at in self.accessed.items()]
+            )
+            self.accessed.clear()
+
+    def _set(self, key: str, model: str, response: str, ttl: int):
+        now = time.time()
+        with self.lock:
+            self.db.execute('''
+                INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (key, model, response, now, now + ttl, now))
+            self._write_access_times()  # so eviction sees recent hits
+
+            # Drop expired rows first, then the least recently used overflow
+            self.db.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (now,))
+            count = self.db.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self.db.execute('''
+                    DELETE FROM llm_cache WHERE key IN (
+                        SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?
+                    )
+                ''', (overflow,))
+                self.stats['evictions'] += overflow
+            self.db.commit()
+
+    async def get(self, model: str, prompt: str, system_prompt: Optional[str] = None, temperature: Optional[float] = None) -> Optional[str]:
+        """Look up a cached response, counting the hit or miss"""
+        key = self.make_key(model, prompt, system_prompt, temperature)
+        try:
+            response = await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            self.logger.error(f"LLM cache read failed: {str(e)}")
+            response = None
+
+        if response is None:
+            self.stats['misses'] += 1
+        else:
+            self.stats['hits'] += 1
+        return response
+
+    async def set(
+        self,
+        model: str,
+        prompt: str,
+        response: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        ttl: Optional[int] = None
+    ):
+        """Store a response"""
+        key = self.make_key(model, prompt, system_prompt, temperature)
+        try:
+            await asyncio.to_thread(self._set, key, model, response, ttl or self.default_ttl)
+            self.stats['stores'] += 1
+        except sqlite3.Error as e:
+            self.logger.error(f"LLM cache write failed: {str(e)}")
+
+    async def get_or_fetch(
+        self,
+        model: str,
+        prompt: str,
+        fetch: Callable[[], Awaitable[Optional[str]]],
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        ttl: Optional[int] = None,
+        fresh: bool = False
+    ) -> Optional[str]:
+        """Return a cached response or call `fetch` and cache its result
+
+        Pass fresh=True for prompts whose answers must vary between calls;
+        they bypass the cache entirely. Exceptions from `fetch` propagate and
+        empty responses are never cached.
+        """
+        if fresh:
+            self.stats['bypassed'] += 1
+            return await fetch()
+
+        cached = await self.get(model, prompt, system_prompt, temperature)
+        if cached is not None:
+            self.logger.debug(f"LLM cache hit for {model}")
+            return cached
+
+        response = await fetch()
+        if response:
+            await self.set(model, prompt, response, system_prompt, temperature, ttl)
+        return response
+
+    def _count(self) -> int:
+        with self.lock:
+            return self.db.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current entry count"""
+        try:
+            entries = await asyncio.to_thread(self._count)
+        except sqlite3.Error as e:
+            self.logger.error(f"LLM cache count failed: {str(e)}")
+            entries = 0
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': entries,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        """Write pending access times and close the cache database"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self._write_access_times()
+                self.db.commit()
+            except sqlite3.Error as e:
+                self.logger.error(f"LLM cache write failed: {str(e)}")
+            self.db.close()
+
+_cache: Optional[LLMCache] = None
+
+def get_llm_cache() -> LLMCache:
+    """Return the shared LLM response cache, opening it on first use"""
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
@@ -0,0 +1,101 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+from typing import Optional, Dict, Any, NamedTuple
+
+DEFAULT_DB_PATH = 'data/lyrics_cache.db'
+FOUND_TTL = 30 * 24 * 3600      # lyrics rarely change
+NOT_FOUND_TTL = 24 * 3600       # retry misses daily in case the catalogue grows
+MAX_STALE_AGE = 180 * 24 * 3600 # stale rows are kept this long to serve while rate-limited
+
+class CachedLyrics(NamedTuple):
+    result: Optional[Dict[str, Any]]  # None for a cached "not found"
+    fresh: bool
+
+def normalize_song_key(title: str, artist: str) -> str:
+    """Normalize (title, artist) so trivial spelling differences share an entry"""
+    def clean(value: str) -> str:
+        value = (value or '').lower()
+        value = re.sub(r'\(.*?\)|\[.*?\]', ' ', value)  # (Official Video), [Lyrics]...
+        value = re.sub(r'[^\w\s]', ' ', value)
+        return ' '.join(value.split())
+    return f"{clean(title)}|{clean(artist)}"
+
+class LyricsCache:
+    """Persistent lyrics cache that remembers both hits and misses"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.logger = logging.getLogger('discord_bot')
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'negative_hits': 0, 'stale': 0, 'misses': 0}
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS lyrics_cache (
+                song_key TEXT PRIMARY KEY,
+                result TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        self.db.commit()
+
+    def _get(self, song_key: str):
+        with self.lock:
+            return self.db.execute(
+                'SELECT result, expires_at FROM lyrics_cache WHERE song_key = ?', (song_key,)
+            ).fetchone()
+
+    def _set(self, song_key: str, result: Optional[str], ttl: int):
+        now = time.time()
+        with self.lock:
+            self.db.execute('''
+                INSERT OR REPLACE INTO lyrics_cache (song_key, result, fetched_at, expires_at)
+                VALUES (?, ?, ?, ?)
+            ''', (song_key, result, now, now + ttl))
+            self.db.execute('DELETE FROM lyrics_cache WHERE fetched_at < ?', (now - MAX_STALE_AGE,))
+            self.db.commit()
+
+    async def get(self, title: str, artist: str) -> Optional[CachedLyrics]:
+        """Return the cached entry (fresh or stale), or None if never fetched"""
+        try:
+            row = await asyncio.to_thread(self._get, normalize_song_key(title, artist))
+        except sqlite3.Error as e:
+            self.logger.error(f"Lyrics cache read failed: {str(e)}")
+            row = None
+
+        if not row:
+            self.stats['misses'] += 1
+            return None
+
+        result, expires_at = row
+        fresh = expires_at > time.time()
+        if not fresh:
+            self.stats['stale'] += 1
+        elif result:
+            self.stats['hits'] += 1
+        else:
+            self.stats['negative_hits'] += 1
+        return CachedLyrics(json.loads(result) if result else None, fresh)
+
+    async def set_found(self, title: str, artist: str, result: Dict[str, Any]):
+        """Cache lyrics that were found"""
+        await self._store(title, artist, json.dumps(result), FOUND_TTL)
+
+    async def set_not_found(self, title: str, artist: str):
+        """Cache a confirmed "no lyrics" answer"""
+        await self._store(title, artist, None, NOT_FOUND_TTL)
+
+    async def _store(self, title: str, artist: str, result: Optional[str], ttl: int):
+        try:
+            await asyncio.to_thread(self._set, normalize_song_key(title, artist), result, ttl)
+        except sqlite3.Error as e:
+            self.logger.error(f"Lyrics cache write failed: {str(e)}")
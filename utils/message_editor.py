@@ -0,0 +1,56 @@
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import discord
+
+# Discord allows roughly five edits per five seconds per channel
+DEFAULT_EDIT_INTERVAL = 1.0
+
+class CoalescedEditor:
+    """Edit a status message at most once per interval
+
+    `update` only records the latest content; a single background flush
+    applies it once the interval since the previous edit has passed, so a
+    burst of progress events costs one edit. `finish` applies the final
+    content as soon as the window allows and drops anything still pending.
+    """
+
+    def __init__(self, message: discord.Message, interval: float = DEFAULT_EDIT_INTERVAL):
+        self.logger = logging.getLogger('discord_bot')
+        self.message = message
+        self.interval = interval
+        self.pending: Optional[Dict[str, Any]] = None
+        self.last_edit = time.monotonic()  # sending the message counts as an edit
+        self.task: Optional[asyncio.Task] = None
+        self.edits = 0
+
+    def update(self, **kwargs):
+        """Queue new message content, replacing any not yet applied"""
+        self.pending = kwargs
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._flush())
+
+    async def finish(self, **kwargs):
+        """Apply the final content, waiting only for the current rate-limit window"""
+        if self.task and not self.task.done():
+            self.task.cancel()
+        self.pending = kwargs
+        await self._flush()
+
+    async def _flush(self):
+        while self.pending is not None:
+            delay = self.last_edit + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            kwargs, self.pending = self.pending, None
+            self.last_edit = time.monotonic()
+            try:
+                await self.message.edit(**kwargs)
+                self.edits += 1
+            except discord.NotFound:
+                self.pending = None  # message was deleted
+            except discord.HTTPException as e:
+                self.logger.error(f"Error editing status message: {str(e)}")
@@ -0,0 +1,80 @@
+from collections import deque
+from typing import Any, Dict, Iterator, Optional
+
+MAX_QUEUE_LENGTH = 100
+LOOP_MODES = ('off', 'track', 'queue')
+
+class PlayerState:
+    """Per-guild playback settings that outlive individual tracks"""
+
+    __slots__ = ('volume', 'filter', 'loop_mode')
+
+    def __init__(self):
+        self.volume = 1.0
+        self.filter: Optional[str] = None
+        self.loop_mode = 'off'
+
+class GuildQueue:
+    """Ordered queue of upcoming tracks for one guild
+
+    Positions used by `remove` and `move` are 1-based, matching what users
+    see in the queue listing.
+    """
+
+    def __init__(self, max_length: int = MAX_QUEUE_LENGTH):
+        self.max_length = max_length
+        self.tracks: deque = deque()
+
+    def add(self, track: Dict[str, Any]) -> int:
+        """Append a track and return its position, or 0 if the queue is full"""
+        if len(self.tracks) >= self.max_length:
+            return 0
+        self.tracks.append(track)
+        return len(self.tracks)
+
+    def extend(self, tracks) -> int:
+        """Append several tracks and return how many were added"""
+        added = 0
+        for track in tracks:
+            if not self.add(track):
+                break
+            added += 1
+        return added
+
+    def push_front(self, track: Dict[str, Any]):
+        """Put a track at the head of the queue, e.g. to repeat it"""
+        self.tracks.appendleft(track)
+
+    def pop_next(self) -> Optional[Dict[str, Any]]:
+        """Remove and return the next track"""
+        return self.tracks.popleft() if self.tracks else None
+
+    def peek(self) -> Optional[Dict[str, Any]]:
+        """Return the next track without removing it"""
+        return self.tracks[0] if self.tracks else None
+
+    def remove(self, position: int) -> Optional[Dict[str, Any]]:
+        """Remove the track at a 1-based position"""
+        if not 1 <= position <= len(self.tracks):
+            return None
+        track = self.tracks[position - 1]
+        del self.tracks[position - 1]
+        return track
+
+    def move(self, source: int, target: int) -> Optional[Dict[str, Any]]:
+        """Move a track from one 1-based position to another"""
+        if not (1 <= source <= len(self.tracks) and 1 <= target <= len(self.tracks)):
+            return None
+        track = self.tracks[source - 1]
+        del self.tracks[source - 1]
+        self.tracks.insert(target - 1, track)
+        return track
+
+    def clear(self):
+        self.tracks.clear()
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.tracks)
@@ -0,0 +1,117 @@
+import re
+import discord
+from typing import List, Callable, Optional
+
+CODE_FENCE = "```"
+# Boundaries we prefer to break on, best first
+BREAK_POINTS = ("\n\n", "\n", ". ", "! ", "? ", "; ", ", ", " ")
+# Only a short identifier right after a fence is a language tag (```py, ```c++)
+FENCE_LANGUAGE = re.compile(r'[\w+#.-]{1,20}')
+
+def _open_fence_language(text: str) -> Optional[str]:
+    """Return the language of an unclosed code block in text, or None if all are closed"""
+    if text.count(CODE_FENCE) % 2 == 0:
+        return None
+    after = text[text.rfind(CODE_FENCE) + len(CODE_FENCE):]
+    first_line = after.split("\n", 1)[0]
+    return first_line if FENCE_LANGUAGE.fullmatch(first_line) else ""
+
+def paginate_text(text: str, limit: int) -> List[str]:
+    """Split text into pages of at most `limit` characters
+
+    Pages break on paragraph, line, sentence or word boundaries where
+    possible. A code block cut by a page break is closed on that page and
+    reopened (with its language) on the next.
+    """
+    text = text.strip()
+    if not text:
+        return [""]
+
+    pages = []
+    remaining = text
+    # Leave room to close a code block cut by a page break
+    budget = max(limit - len(CODE_FENCE) - 1, 1)
+    while len(remaining) > limit:
+        before = len(remaining)
+        window = remaining[:budget]
+        cut = budget
+        for marker in BREAK_POINTS:
+            index = window.rfind(marker)
+            if index >= budget // 2:
+                cut = index + len(marker)
+                break
+
+        page = remaining[:cut].rstrip()
+        remaining = remaining[cut:].lstrip()
+
+        language = _open_fence_language(page)
+        if language is not None:
+            page += f"\n{CODE_FENCE}"
+            reopened = f"{CODE_FENCE}{language}\n{remaining}"
+            # Every page must consume text, or tiny limits would loop forever
+            if len(reopened) < before:
+                remaining = reopened
+
+        pages.append(page)
+
+    if remaining:
+        pages.append(remaining)
+    return pages
+
+class PaginatorView(discord.ui.View):
+    """Page through pre-rendered text with buttons
+
+    Pages are computed once, so navigating never regenerates content.
+    """
+
+    def __init__(
+        self,
+        pages: List[str],
+        render: Callable[[str], discord.Embed],
+        author_id: Optional[int] = None,
+        timeout: float = 300
+    ):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.render = render
+        self.author_id = author_id
+        self.current = 0
+        self.message: Optional[discord.Message] = None
+        self._update_buttons()
+
+    def build_embed(self) -> discord.Embed:
+        """Render the current page with a page counter"""
+        embed = self.render(self.pages[self.current])
+        embed.set_footer(text=f"Page {self.current + 1}/{len(self.pages)}")
+        return embed
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.current == 0
+        self.next_page.disabled = self.current >= len(self.pages) - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.author_id is not None and interaction.user.id != self.author_id:
+            await interaction.response.send_message("❌ Only the requester can turn pages!", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        self.current = max(0, min(page, len(self.pages) - 1))
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.current - 1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.current + 1)
+
+    async def on_timeout(self):
+        """Remove the buttons once the view expires"""
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
@@ -0,0 +1,48 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+class RankedScores:
+    """Scores kept in descending order for fast rank and top-N queries
+
+    Entries are stored as (-score, key) in a sorted list, so rank lookups
+    are a binary search and top-N is a slice. Ties share a rank (1, 2, 2, 4).
+    """
+
+    def __init__(self, scores: Optional[Dict[str, int]] = None):
+        self.scores: Dict[str, int] = {}
+        self.order: List[Tuple[int, str]] = []
+        if scores:
+            self.scores = dict(scores)
+            self.order = sorted((-score, key) for key, score in self.scores.items())
+
+    def update(self, key: str, score: int):
+        """Insert or move an entry to its new score"""
+        old = self.scores.get(key)
+        if old == score:
+            return
+        if old is not None:
+            del self.order[bisect_left(self.order, (-old, key))]
+        self.scores[key] = score
+        insort(self.order, (-score, key))
+
+    def remove(self, key: str):
+        score = self.scores.pop(key, None)
+        if score is not None:
+            del self.order[bisect_left(self.order, (-score, key))]
+
+    def rank(self, key: str) -> Optional[int]:
+        """1-based rank of an entry, or None if it is not ranked"""
+        score = self.scores.get(key)
+        if score is None:
+            return None
+        return bisect_left(self.order, (-score, '')) + 1
+
+    def top(self, count: int) -> List[Tuple[str, int]]:
+        """The highest `count` entries as (key, score)"""
+        return [(key, -negative) for negative, key in self.order[:count]]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.scores
+
+    def __len__(self) -> int:
+        return len(self.order)
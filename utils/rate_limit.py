@@ -0,0 +1,42 @@
+import time
+
+class TokenBucket:
+    """Simple token bucket for pacing calls to a rate-limited API
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    `penalize` empties the bucket and blocks it for a while, for use when
+    the remote side reports that we exceeded its quota anyway.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (0 while blocked)"""
+        if time.monotonic() < self.blocked_until:
+            return 0.0
+        self._refill()
+        return self.tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available, without waiting"""
+        if self.available < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+    def penalize(self, seconds: float):
+        """Drain the bucket and refuse calls for the given number of seconds"""
+        self._refill()
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
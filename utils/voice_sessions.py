@@ -0,0 +1,135 @@
+import os
+import time
+import logging
+from typing import Dict, Optional
+
+import discord
+
+VOICE_IDLE_TIMEOUT = int(os.getenv('VOICE_IDLE_TIMEOUT', '300'))  # seconds idle before leaving
+VOICE_CONNECT_TIMEOUT = 15
+VOICE_RECONNECT_GRACE = 10  # let discord.py's own reconnect try first
+
+class VoiceSessionManager:
+    """Track one voice connection per guild and its health
+
+    `clients` only ever holds connections believed to be usable; stale ones
+    (kicked, dropped websocket) are replaced on the next `connect` or by
+    `check_health`. A session is idle when nothing is playing (a paused
+    track still holds its FFmpeg process) or when only bots are left in
+    the channel.
+    """
+
+    def __init__(self, idle_timeout: int = VOICE_IDLE_TIMEOUT):
+        self.logger = logging.getLogger('discord_bot')
+        self.idle_timeout = idle_timeout
+        self.clients: Dict[int, discord.VoiceClient] = {}
+        self.idle_since: Dict[int, float] = {}
+        self.unhealthy_since: Dict[int, float] = {}
+        self.reconnecting = set()
+        self.stats = {'connects': 0, 'reconnects': 0, 'idle_disconnects': 0, 'dropped': 0}
+
+    async def connect(self, channel: discord.VoiceChannel) -> discord.VoiceClient:
+        """Return a healthy connection for the channel's guild, connecting if needed"""
+        guild_id = channel.guild.id
+        voice_client = self.clients.get(guild_id)
+        if voice_client and voice_client.is_connected():
+            return voice_client
+
+        # Stale entry or a connection made outside the manager
+        self.clients.pop(guild_id, None)
+        existing = channel.guild.voice_client
+        if existing and existing.is_connected():
+            self.clients[guild_id] = existing
+            return existing
+        if existing:
+            await existing.disconnect(force=True)
+
+        voice_client = await channel.connect(timeout=VOICE_CONNECT_TIMEOUT, reconnect=True)
+        self.clients[guild_id] = voice_client
+        self.idle_since.pop(guild_id, None)
+        self.unhealthy_since.pop(guild_id, None)
+        self.stats['connects'] += 1
+        return voice_client
+
+    async def reconnect(self, guild_id: int) -> Optional[discord.VoiceClient]:
+        """Replace a broken connection with a fresh one in the same channel"""
+        voice_client = self.clients.pop(guild_id, None)
+        channel = voice_client.channel if voice_client else None
+        self.reconnecting.add(guild_id)
+        try:
+            if voice_client:
+                try:
+                    await voice_client.disconnect(force=True)
+                except Exception as e:
+                    self.logger.error(f"Error dropping broken voice connection: {str(e)}")
+            if channel is None:
+                return None
+
+            voice_client = await self.connect(channel)
+            self.stats['reconnects'] += 1
+            return voice_client
+        except Exception as e:
+            self.logger.error(f"Voice reconnect failed for guild {guild_id}: {str(e)}")
+            return None
+        finally:
+            self.reconnecting.discard(guild_id)
+
+    async def disconnect(self, guild_id: int):
+        """Leave the voice channel and forget the session"""
+        voice_client = self.clients.pop(guild_id, None)
+        self.forget(guild_id)
+        if voice_client:
+            try:
+                await voice_client.disconnect(force=True)
+            except Exception as e:
+                self.logger.error(f"Error disconnecting voice client: {str(e)}")
+
+    def forget(self, guild_id: int):
+        """Drop bookkeeping for a session that has already ended"""
+        self.clients.pop(guild_id, None)
+        self.idle_since.pop(guild_id, None)
+        self.unhealthy_since.pop(guild_id, None)
+
+    @staticmethod
+    def is_active(voice_client: discord.VoiceClient) -> bool:
+        """Playing with at least one listener"""
+        if not voice_client.is_playing():
+            return False
+        channel = voice_client.channel
+        return bool(channel and any(not member.bot for member in channel.members))
+
+    def check_health(self):
+        """Update idle and health timers
+
+        Returns (idle guild ids past the timeout, broken guild ids past the
+        reconnect grace period) for the caller to act on.
+        """
+        now = time.monotonic()
+        idle, broken = [], []
+        for guild_id, voice_client in list(self.clients.items()):
+            if not voice_client.is_connected():
+                since = self.unhealthy_since.setdefault(guild_id, now)
+                if now - since >= VOICE_RECONNECT_GRACE:
+                    broken.append(guild_id)
+                continue
+            self.unhealthy_since.pop(guild_id, None)
+
+            if self.is_active(voice_client):
+                self.idle_since.pop(guild_id, None)
+                continue
+            since = self.idle_since.setdefault(guild_id, now)
+            if now - since >= self.idle_timeout:
+                idle.append(guild_id)
+        return idle, broken
+
+    def get_counts(self) -> Dict[str, int]:
+        """Live voice session counts"""
+        live = sum(1 for vc in self.clients.values() if vc.is_connected())
+        playing = sum(1 for vc in self.clients.values() if vc.is_connected() and vc.is_playing())
+        return {
+            'live': live,
+            'playing': playing,
+            'idle': len(self.idle_since),
+            'unhealthy': len(self.unhealthy_since),
+            **self.stats
+        }